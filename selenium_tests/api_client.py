@@ -0,0 +1,149 @@
+import json
+import os
+from urllib.parse import quote
+
+import urllib3
+
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
+API_PREFIX = "/api/v1"
+SELENIUM_TIMEOUT = int(os.getenv("SELENIUM_TIMEOUT", "15"))
+
+# One keep-alive connection pool shared by every client in the process
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=8, retries=False)
+
+
+class ApiError(Exception):
+    """Raised for non-2xx or non-JSON responses, or when the API can't be reached (status is None)."""
+
+    def __init__(self, method: str, path: str, status: int | None, body: str):
+        super().__init__(f"{method} {path} -> {status}: {body[:300]}")
+        self.status = status
+        self.body = body
+
+
+class SoundPuffApi:
+    """Thin REST client for the endpoints in ``api-docs.json``.
+
+    Used to build test preconditions (playlists, likes, comments) directly over HTTP
+    so that only the behaviour under test goes through the browser. Requests go
+    through the same ``/api`` proxy as the app unless ``base_url`` says otherwise.
+    """
+
+    def __init__(self, token: str | None = None, base_url: str = BASE_URL, timeout: float = SELENIUM_TIMEOUT):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body=None, params: dict | None = None):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        url = f"{self.base_url}{API_PREFIX}{path}"
+        try:
+            resp = _HTTP.request(
+                method,
+                url,
+                fields=params if method == "GET" else None,
+                body=json.dumps(body).encode("utf-8") if body is not None else None,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise ApiError(method, path, None, str(e)) from e
+        text = resp.data.decode("utf-8", errors="replace")
+        if resp.status >= 400:
+            raise ApiError(method, path, resp.status, text)
+        try:
+            return json.loads(text) if text else None
+        except ValueError:
+            # An HTML fallback page or a misconfigured proxy answered instead of the API
+            raise ApiError(method, path, resp.status, text) from None
+
+    # --- auth / users -------------------------------------------------------
+    def login(self, email: str, password: str) -> dict:
+        data = self.request("POST", "/auth/login", {"email": email, "password": password})
+        self.token = data["access_token"]
+        return data
+
+    def me(self) -> dict:
+        return self.request("GET", "/users/me")
+
+    def follow(self, username: str) -> None:
+        self.request("POST", f"/users/{quote(username)}/follow")
+
+    def unfollow(self, username: str) -> None:
+        self.request("DELETE", f"/users/{quote(username)}/follow")
+
+    # --- songs / search -----------------------------------------------------
+    def search_all(self, query: str, type: str = "all", limit: int = 10, offset: int = 0) -> dict:
+        return self.request("GET", "/songs/all", params={"query": query, "type": type, "limit": limit, "offset": offset})
+
+    def search_songs(self, query: str, limit: int = 50, offset: int = 0) -> list:
+        data = self.request("GET", "/songs/search", params={"query": query, "limit": limit, "offset": offset})
+        return [item["song"] for item in data.get("songs", [])]
+
+    def song_ids(self, count: int = 1, query: str | None = None) -> list:
+        """Return ids of ``count`` existing songs (fails if the backend has none)."""
+        query = query or os.getenv("TEST_SONG_QUERY", "a")
+        ids = []
+        while len(ids) < count:
+            page = min(count - len(ids), 50)
+            songs = self.search_all(query, type="songs", limit=page, offset=len(ids)).get("songs", [])
+            ids.extend(item["song"]["id"] for item in songs)
+            if len(songs) < page:
+                break
+        ids = ids[:count]
+        if not ids:
+            raise AssertionError(
+                f"No songs returned for query {query!r}. "
+                "Seed the backend with songs or set TEST_SONG_QUERY to a query that returns songs."
+            )
+        return ids
+
+    # --- playlists ----------------------------------------------------------
+    def playlists(self, skip: int = 0, limit: int = 20) -> list:
+        return self.request("GET", "/playlists/", params={"skip": skip, "limit": limit})
+
+    def feed(self, skip: int = 0, limit: int = 20) -> list:
+        return self.request("GET", "/playlists/feed", params={"skip": skip, "limit": limit})
+
+    def playlist(self, playlist_id: int) -> dict:
+        return self.request("GET", f"/playlists/{playlist_id}")
+
+    def create_playlist(
+        self,
+        title: str,
+        song_ids: list | None = None,
+        description: str | None = None,
+        privacy: str = "public",
+    ) -> dict:
+        if song_ids is None:
+            song_ids = self.song_ids(1)
+        payload = {"title": title, "description": description, "privacy": privacy, "song_ids": list(song_ids)}
+        return self.request("POST", "/playlists/", payload)
+
+    def delete_playlist(self, playlist_id: int) -> None:
+        self.request("DELETE", f"/playlists/{playlist_id}")
+
+    def add_song(self, playlist_id: int, song_id: int):
+        return self.request("POST", f"/playlists/{playlist_id}/songs", {"song_id": int(song_id)})
+
+    def like_playlist(self, playlist_id: int) -> dict:
+        return self.request("POST", f"/playlists/{playlist_id}/like")
+
+    def unlike_playlist(self, playlist_id: int) -> None:
+        self.request("DELETE", f"/playlists/{playlist_id}/like")
+
+    # --- comments -----------------------------------------------------------
+    def comments(self, playlist_id: int) -> list:
+        return self.request("GET", f"/playlists/{playlist_id}/comments")
+
+    def add_comment(self, playlist_id: int, body: str) -> dict:
+        return self.request("POST", f"/playlists/{playlist_id}/comments", {"body": body, "playlist_id": playlist_id})
+
+    def delete_comment(self, comment_id: int) -> None:
+        self.request("DELETE", f"/playlists/comments/{comment_id}")
+
+    def like_comment(self, comment_id: int) -> None:
+        self.request("POST", f"/playlists/comments/{comment_id}/like")
@@ -0,0 +1,187 @@
+"""Failure artifacts: what the browser looked like when a test failed.
+
+Only failing tests pay for this. The ``pytest_runtest_makereport`` hook in conftest calls
+``capture_failure`` while the driver still shows the failing page; it reads the page
+synchronously (one screenshot, the DOM, the console log and the network records the
+tracker already holds) and hands the encoding and file writes to a background thread, so
+the next test starts right away. Each test gets its own directory under
+``.artifacts/failures/<run id>/``:
+
+    screenshot.png  page.html  console.json  network.har  timing.json
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from selenium_tests.perf import RUN_ID
+from selenium_tests.ui_helpers import ARTIFACTS_DIR, network_tracker
+
+
+FAILURE_ARTIFACTS = os.getenv("FAILURE_ARTIFACTS", "1") in ("1", "true", "True")
+FAILURE_ARTIFACTS_DIR = os.path.join(ARTIFACTS_DIR, "failures", RUN_ID)
+# Header values that must not end up on disk
+_REDACTED_HEADERS = {"authorization", "cookie", "set-cookie"}
+
+_WRITER = ThreadPoolExecutor(max_workers=2, thread_name_prefix="failure-artifacts")
+_PENDING = []
+# Directories written in this session, for the terminal summary
+_WRITTEN = []
+
+
+def artifact_dir(nodeid: str, when: str, attempt: int = 1) -> str:
+    name = re.sub(r"[^\w.-]+", "_", nodeid.replace(".py::", "-")).strip("_")
+    if when != "call":
+        name = f"{name}-{when}"
+    if attempt > 1:
+        name = f"{name}-attempt{attempt}"
+    return os.path.join(FAILURE_ARTIFACTS_DIR, name[-150:])
+
+
+def capture_failure(item, report, browser, attempt: int = 1) -> str | None:
+    """Grab the page state of a failed test and queue it for writing; returns the directory."""
+    if not FAILURE_ARTIFACTS:
+        return None
+    path = artifact_dir(item.nodeid, report.when, attempt)
+    snapshot = {"url": None, "screenshot": None, "html": None, "console": [], "visits": []}
+
+    def read(key, fn):
+        try:
+            snapshot[key] = fn()
+        except WebDriverException as e:
+            snapshot.setdefault("errors", []).append(f"{key}: {e.msg or e.__class__.__name__}")
+
+    read("url", lambda: browser.current_url)
+    read("screenshot", browser.get_screenshot_as_png)
+    read("html", lambda: browser.page_source)
+    started_ms = (getattr(browser, "test_started", None) or 0) * 1000
+    # The browser log is never drained on passing tests; keep only this test's entries
+    read("console", lambda: [e for e in browser.get_log("browser") if e.get("timestamp", 0) >= started_ms])
+    tracker = network_tracker(browser)
+    tracker.poll()
+    records = list(tracker.records)
+    metrics = getattr(browser, "page_metrics", None)
+    if metrics is not None:
+        read("visits", lambda: (metrics.collect(browser), metrics.visits)[1])
+
+    timing = {
+        "nodeid": item.nodeid,
+        "when": report.when,
+        "duration_s": report.duration,
+        "url": snapshot["url"],
+        "page_visits": snapshot["visits"],
+        "requests": [
+            {
+                "method": r.method,
+                "url": r.url,
+                "status": r.status,
+                "total_ms": r.duration_ms,
+                "backend_ms": r.backend_ms,
+                "failed": r.failed,
+            }
+            for r in records
+        ],
+        "capture_errors": snapshot.get("errors", []),
+    }
+    _PENDING.append(_WRITER.submit(_write, path, snapshot, records, timing))
+    _WRITTEN.append(path)
+    return path
+
+
+def _write(path: str, snapshot: dict, records: list, timing: dict) -> None:
+    os.makedirs(path, exist_ok=True)
+    if snapshot["screenshot"]:
+        with open(os.path.join(path, "screenshot.png"), "wb") as f:
+            f.write(snapshot["screenshot"])
+    if snapshot["html"] is not None:
+        with open(os.path.join(path, "page.html"), "w", encoding="utf-8") as f:
+            f.write(snapshot["html"])
+    _write_json(os.path.join(path, "console.json"), snapshot["console"])
+    _write_json(os.path.join(path, "network.har"), to_har(records))
+    _write_json(os.path.join(path, "timing.json"), timing)
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def _headers(headers: dict) -> list:
+    return [
+        {"name": k, "value": "[redacted]" if k.lower() in _REDACTED_HEADERS else str(v)}
+        for k, v in headers.items()
+    ]
+
+
+def _har_timings(r) -> dict:
+    t = r.timing
+
+    def span(start, end):
+        if t.get(start, -1) < 0 or t.get(end, -1) < 0:
+            return -1
+        return max(0.0, t[end] - t[start])
+
+    total = r.duration_ms or 0.0
+    headers_end = t.get("receiveHeadersEnd", 0.0)
+    return {
+        "blocked": -1,
+        "dns": span("dnsStart", "dnsEnd"),
+        "connect": span("connectStart", "connectEnd"),
+        "ssl": span("sslStart", "sslEnd"),
+        "send": max(0.0, span("sendStart", "sendEnd")),
+        "wait": max(0.0, headers_end - t.get("sendEnd", 0.0)) if t else 0.0,
+        "receive": max(0.0, total - headers_end) if t else total,
+    }
+
+
+def to_har(records: list) -> dict:
+    """HAR 1.2 log built from the tracker's ``NetworkRequest`` records (no bodies)."""
+    entries = []
+    for r in records:
+        entries.append(
+            {
+                "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(r.wall_time))
+                + f".{int((r.wall_time % 1) * 1000):03d}Z",
+                "time": r.duration_ms or 0.0,
+                "request": {
+                    "method": r.method,
+                    "url": r.url,
+                    "httpVersion": "",
+                    "headers": _headers(r.request_headers),
+                    "queryString": [],
+                    "cookies": [],
+                    "headersSize": -1,
+                    "bodySize": -1,
+                },
+                "response": {
+                    "status": r.status or 0,
+                    "statusText": r.error or r.blocked_reason,
+                    "httpVersion": "",
+                    "headers": _headers(r.response_headers),
+                    "cookies": [],
+                    "content": {"size": r.encoded_bytes, "mimeType": r.mime_type},
+                    "redirectURL": "",
+                    "headersSize": -1,
+                    "bodySize": r.encoded_bytes,
+                },
+                "cache": {},
+                "timings": _har_timings(r),
+                "_resourceType": r.resource_type,
+                "_fromCache": r.from_cache,
+            }
+        )
+    return {"log": {"version": "1.2", "creator": {"name": "selenium_tests", "version": "1"}, "entries": entries}}
+
+
+def wait_for_artifacts() -> list:
+    """Block until queued artifacts are on disk; returns the directories written this session."""
+    for future in _PENDING:
+        try:
+            future.result()
+        except OSError as e:
+            print(f"Could not write failure artifacts: {e}")
+    _PENDING.clear()
+    return list(_WRITTEN)
@@ -0,0 +1,237 @@
+"""Per-scenario performance baseline with a significance test for regressions.
+
+Every benchmark result is stored in a small JSON history (one entry per run and
+scenario). The baseline for a scenario is the pooled samples of its most recent
+accepted runs; a new run is a regression when a one-sided Mann-Whitney U test says its
+samples are larger than the baseline's (p < PERF_BASELINE_ALPHA) *and* its median is
+at least PERF_BASELINE_MIN_SLOWDOWN times the baseline median. Regressed runs are kept
+in the history for the trend report but never become part of the baseline.
+Runs against the production build (PROD_BUILD=1) are kept as ``<scenario>@prod``, apart
+from the dev-server runs.
+
+Print the trend of every stored scenario with:
+
+    python -m selenium_tests.baseline [--last 10] [scenario ...]
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+from selenium_tests.perf import BUILD_MODE, RUN_ID, BenchmarkResult, _git_rev
+
+BASELINE_FILE = os.getenv(
+    "PERF_BASELINE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".perf_baseline.json"),
+)
+# check: compare, store and fail on regressions; record: compare and store only; off: neither
+BASELINE_MODE = os.getenv("PERF_BASELINE", "check")
+BASELINE_ALPHA = float(os.getenv("PERF_BASELINE_ALPHA", "0.01"))
+BASELINE_MIN_SLOWDOWN = float(os.getenv("PERF_BASELINE_MIN_SLOWDOWN", "1.10"))
+# Accepted runs pooled into the baseline, and runs kept per scenario overall
+BASELINE_WINDOW = int(os.getenv("PERF_BASELINE_WINDOW", "5"))
+BASELINE_HISTORY = 50
+# Fewer samples than this on either side can't reach significance; such runs are only stored
+BASELINE_MIN_SAMPLES = 3
+
+# Comparisons made in this session, for the terminal summary
+_SESSION_COMPARISONS = []
+
+
+@dataclass
+class Comparison:
+    scenario: str
+    n: int
+    baseline_n: int
+    p50: float
+    baseline_p50: float | None
+    p_value: float | None
+    regressed: bool
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_p50:
+            return None
+        return self.p50 / self.baseline_p50
+
+    def summary(self) -> str:
+        if self.p_value is None:
+            reason = "no baseline yet" if not self.baseline_n else "too few samples to compare"
+            return f"{self.scenario}: p50={self.p50:.3f}s n={self.n} ({reason})"
+        verdict = "REGRESSION" if self.regressed else "ok"
+        return (
+            f"{self.scenario}: p50={self.p50:.3f}s vs baseline {self.baseline_p50:.3f}s "
+            f"(x{self.ratio:.2f}, p={self.p_value:.4f}, n={self.n}/{self.baseline_n}) {verdict}"
+        )
+
+
+def mann_whitney_u(current: list, baseline: list) -> tuple:
+    """One-sided Mann-Whitney U test that ``current`` tends to be larger than ``baseline``.
+
+    Returns ``(U, p)`` using the normal approximation with tie and continuity
+    correction, which is adequate from a handful of samples per side upwards.
+    """
+    nx, ny = len(current), len(baseline)
+    if not nx or not ny:
+        return 0.0, 1.0
+    pooled = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2.0 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    rank_sum = sum(r for r, (_v, side) in zip(ranks, pooled) if side == 0)
+    u = rank_sum - nx * (nx + 1) / 2.0
+
+    n = nx + ny
+    mean = nx * ny / 2.0
+    var = nx * ny / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = (u - mean - 0.5) / math.sqrt(var)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def load_history(path: str = BASELINE_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_history(history: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def merge_history(new: dict, path: str = BASELINE_FILE) -> None:
+    """Append ``new`` runs (scenario -> runs) to the history at ``path``."""
+    if not new:
+        return
+    history = load_history(path)
+    for scenario, runs in new.items():
+        merged = history.setdefault(scenario, [])
+        merged.extend(runs)
+        del merged[:-BASELINE_HISTORY]
+    _save_history(history, path)
+
+
+def baseline_samples(runs: list) -> list:
+    """Pooled samples of the most recent accepted runs."""
+    accepted = [r for r in runs if not r.get("regressed")]
+    samples = []
+    for run in accepted[-BASELINE_WINDOW:]:
+        samples.extend(run["samples"])
+    return samples
+
+
+def history_key(result: BenchmarkResult) -> str:
+    return result.scenario if BUILD_MODE == "dev" else f"{result.scenario}@{BUILD_MODE}"
+
+
+def compare(result: BenchmarkResult, history: dict) -> Comparison:
+    baseline = baseline_samples(history.get(history_key(result), []))
+    p50 = statistics.median(result.samples)
+    comparison = Comparison(
+        scenario=history_key(result),
+        n=len(result.samples),
+        baseline_n=len(baseline),
+        p50=p50,
+        baseline_p50=statistics.median(baseline) if baseline else None,
+        p_value=None,
+        regressed=False,
+    )
+    if len(result.samples) < BASELINE_MIN_SAMPLES or len(baseline) < BASELINE_MIN_SAMPLES:
+        return comparison
+    _u, comparison.p_value = mann_whitney_u(result.samples, baseline)
+    comparison.regressed = comparison.p_value < BASELINE_ALPHA and comparison.ratio >= BASELINE_MIN_SLOWDOWN
+    return comparison
+
+
+def check_baseline(result: BenchmarkResult, path: str = BASELINE_FILE) -> Comparison | None:
+    """Compare ``result`` with the stored baseline, store it, and fail on a significant regression."""
+    if BASELINE_MODE == "off":
+        return None
+    comparison = compare(result, load_history(path))
+    run = {
+        "run_id": RUN_ID,
+        "git_rev": _git_rev(),
+        "timestamp": time.time(),
+        "samples": [round(s, 6) for s in result.samples],
+        "p50": comparison.p50,
+        "p_value": comparison.p_value,
+        "regressed": comparison.regressed,
+    }
+    # Parallel workers only read the shared file and keep their runs in <path>.<worker> for parallel.py to merge
+    worker = os.getenv("SELENIUM_WORKER")
+    merge_history({history_key(result): [run]}, f"{path}.{worker}" if worker else path)
+    _SESSION_COMPARISONS.append(comparison)
+
+    if BASELINE_MODE == "check":
+        assert not comparison.regressed, f"Performance regression: {comparison.summary()}"
+    return comparison
+
+
+def check_baselines(results: list, path: str = BASELINE_FILE) -> list:
+    """``check_baseline`` for every result, then fail once with all the regressions found."""
+    comparisons, failures = [], []
+    for result in results:
+        try:
+            comparisons.append(check_baseline(result, path))
+        except AssertionError as e:
+            failures.append(str(e))
+    assert not failures, "\n".join(failures)
+    return comparisons
+
+
+def session_summary() -> list:
+    """Comparisons made in this session followed by their trends, as printable lines."""
+    lines = [c.summary() for c in _SESSION_COMPARISONS]
+    scenarios = sorted({c.scenario for c in _SESSION_COMPARISONS})
+    if scenarios:
+        lines.extend(trend_report(scenarios=scenarios))
+    return lines
+
+
+def trend_report(scenarios: list | None = None, last: int = 10, path: str = BASELINE_FILE) -> list:
+    """One line per scenario: the p50 of each recent run, oldest first (``!`` marks regressions)."""
+    history = load_history(path)
+    lines = []
+    for scenario in scenarios or sorted(history):
+        runs = history.get(scenario, [])[-last:]
+        if not runs:
+            continue
+        points = " ".join(f"{r['p50']:.2f}{'!' if r.get('regressed') else ''}" for r in runs)
+        baseline = baseline_samples(history[scenario])
+        base = f"{statistics.median(baseline):.2f}s" if baseline else "-"
+        lines.append(f"{scenario:<20} baseline={base:<7} p50 trend: {points}")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help="scenarios to show (default: all)")
+    parser.add_argument("--last", type=int, default=10, help="runs per scenario (default 10)")
+    args = parser.parse_args(argv)
+    lines = trend_report(scenarios=args.scenarios or None, last=args.last)
+    print("\n".join(lines) if lines else f"No runs stored in {BASELINE_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
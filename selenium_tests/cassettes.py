@@ -0,0 +1,395 @@
+"""Record and replay ``/api/v1`` traffic per test.
+
+A small HTTP proxy sits between the Vite dev server and the backend (start Vite with
+``API_PROXY_TARGET=http://127.0.0.1:<CASSETTE_PORT>``). Everything that goes through
+``/api`` passes it: the app's own calls and the ``api`` fixture's REST client.
+
+- ``API_CASSETTES=record`` forwards every request to ``CASSETTE_UPSTREAM`` and writes
+  the exchanges of each test to ``cassettes/<test>.json``.
+- ``API_CASSETTES=replay`` never touches the network. Requests are answered from the
+  running test's cassette, with the recorded latency (``CASSETTE_LATENCY=original``) or
+  none (``zero``).
+
+Tests embed per-run values in what they send (``selenium-src-<timestamp>`` titles, comment
+texts). On replay, a string that differs between the recorded and the live request body is
+rewritten in every later response, so the UI shows what this run created. Requests are
+matched by method, path and query, in order. If a request is not in the test's cassette,
+the proxy borrows an exchange for the same endpoint from another cassette (a login cached
+by an earlier test) and otherwise answers 599. Misses and recorded exchanges that were never
+replayed are reported as drift: the cassette no longer matches what the app does.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import urllib3
+
+
+API_CASSETTES = os.getenv("API_CASSETTES", "").lower()
+CASSETTE_PORT = int(os.getenv("CASSETTE_PORT", "8766"))
+CASSETTE_DIR = os.getenv(
+    "CASSETTE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes"),
+)
+CASSETTE_UPSTREAM = os.getenv("CASSETTE_UPSTREAM", "https://soundpuff-api.ozten.app")
+# "original" replays the recorded server time, "zero" answers immediately
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "zero")
+# Only record what the app talks to; anything else is forwarded untouched
+_RECORDED_PREFIX = "/api/v1"
+# Never forwarded: hop-by-hop headers and Accept-Encoding, so bodies are stored as plain text
+_SKIP_REQUEST_HEADERS = {"host", "connection", "keep-alive", "accept-encoding", "content-length", "transfer-encoding"}
+_KEPT_RESPONSE_HEADERS = {"content-type", "cache-control", "www-authenticate"}
+# Never written to disk: credentials in request bodies, tokens in responses. Replay matching
+# doesn't look at them and the app accepts any token string.
+_SECRET_REQUEST_FIELDS = {"password", "current_password", "new_password"}
+_SECRET_RESPONSE_FIELDS = {"access_token", "refresh_token"}
+_REDACTED = "<redacted>"
+# Shorter strings are too likely to appear by accident in unrelated responses
+_MIN_SUBSTITUTION = 4
+
+
+@dataclass
+class Interaction:
+    method: str
+    path: str
+    query: str
+    request_body: str
+    status: int
+    headers: dict
+    body: str
+    duration_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}?{self.query}" if self.query else f"{self.method} {self.path}"
+
+
+@dataclass
+class Cassette:
+    nodeid: str
+    path: str
+    interactions: list = field(default_factory=list)
+    # Replay bookkeeping
+    used: set = field(default_factory=set)
+    misses: list = field(default_factory=list)
+    borrowed: list = field(default_factory=list)
+    # recorded string -> the value this run sent instead
+    substitutions: dict = field(default_factory=dict)
+    served_ms: float = 0.0
+
+    def drift(self) -> list:
+        """Ways in which this run's traffic differed from the recording."""
+        lines = [f"unmatched {key}" for key in self.misses]
+        lines += [f"unused    {self.interactions[i].key}" for i in range(len(self.interactions)) if i not in self.used]
+        return lines
+
+
+def cassette_path(nodeid: str, directory: str = CASSETTE_DIR) -> str:
+    name = re.sub(r"[^\w.-]+", "_", nodeid.replace(".py::", "-")).strip("_")
+    return os.path.join(directory, f"{name[-150:]}.json")
+
+
+def _read(path: str) -> list:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [Interaction(**i) for i in json.load(f).get("interactions", [])]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def load_cassette(nodeid: str, directory: str = CASSETTE_DIR) -> Cassette:
+    path = cassette_path(nodeid, directory)
+    return Cassette(nodeid, path, interactions=_read(path))
+
+
+def _redact(text: str, fields: set) -> str:
+    """``text`` with the values of ``fields`` replaced, wherever they occur in the JSON document."""
+
+    def walk(value):
+        if isinstance(value, dict):
+            return {k: _REDACTED if k in fields and isinstance(v, str) else walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(v) for v in value]
+        return value
+
+    try:
+        return json.dumps(walk(json.loads(text)))
+    except ValueError:
+        return text
+
+
+def save_cassette(cassette: Cassette) -> None:
+    os.makedirs(os.path.dirname(cassette.path), exist_ok=True)
+    tmp = f"{cassette.path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "nodeid": cassette.nodeid,
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "upstream": CASSETTE_UPSTREAM,
+                "interactions": [
+                    {
+                        **asdict(i),
+                        "request_body": _redact(i.request_body, _SECRET_REQUEST_FIELDS),
+                        "body": _redact(i.body, _SECRET_RESPONSE_FIELDS),
+                    }
+                    for i in cassette.interactions
+                ],
+            },
+            f,
+            indent=2,
+        )
+    os.replace(tmp, cassette.path)
+
+
+def _normalize_query(query: str) -> str:
+    return urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+def _string_changes(recorded, live, out: dict) -> None:
+    """Collect recorded -> live pairs for strings that differ at the same place in two JSON bodies."""
+    if isinstance(recorded, str) and isinstance(live, str):
+        if recorded != live and recorded != _REDACTED and len(recorded) >= _MIN_SUBSTITUTION:
+            out[recorded] = live
+    elif isinstance(recorded, dict) and isinstance(live, dict):
+        for key in recorded.keys() & live.keys():
+            _string_changes(recorded[key], live[key], out)
+    elif isinstance(recorded, list) and isinstance(live, list):
+        for a, b in zip(recorded, live):
+            _string_changes(a, b, out)
+
+
+def _replace_all(text: str, pairs: dict, as_json: bool = False) -> str:
+    for old in sorted(pairs, key=len, reverse=True):
+        new = pairs[old]
+        if as_json:
+            # Strings inside a JSON document are escaped
+            old, new = json.dumps(old)[1:-1], json.dumps(new)[1:-1]
+        text = text.replace(old, new)
+    return text
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SoundPuffCassettes/1.0"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        proxy = self.server.proxy
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if proxy.mode == "replay":
+            status, headers, body, delay_ms = proxy.replay(
+                method, unquote(parts.path), parts.query, raw.decode("utf-8", errors="replace")
+            )
+            if delay_ms:
+                time.sleep(delay_ms / 1000.0)
+            self._send(status, headers, body.encode("utf-8"))
+            return
+        status, headers, data = proxy.forward(method, self.path, self.headers, raw)
+        self._send(status, headers, data)
+
+    def _send(self, status: int, headers: dict, data: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+
+class CassetteProxy:
+    """Threaded record/replay proxy for the API; ``use(nodeid)`` selects the active cassette."""
+
+    def __init__(
+        self,
+        mode: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        upstream: str = CASSETTE_UPSTREAM,
+        directory: str = CASSETTE_DIR,
+        latency: str = CASSETTE_LATENCY,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"API_CASSETTES must be 'record' or 'replay', not {mode!r}")
+        self.mode = mode
+        self.upstream = upstream.rstrip("/")
+        self.directory = directory
+        self.latency = latency
+        self.cassette = None
+        # Replay: every recorded exchange by endpoint, for requests missing from the test's cassette
+        self._library = None
+        # nodeid -> (drift lines, recorded ms, served ms)
+        self.results = {}
+        self._lock = threading.Lock()
+        self._http = urllib3.PoolManager(num_pools=2, maxsize=8, retries=False, cert_reqs="CERT_NONE")
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.proxy = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CassetteProxy":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cassette-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def use(self, nodeid: str) -> None:
+        with self._lock:
+            if self.mode == "record":
+                self.cassette = Cassette(nodeid, cassette_path(nodeid, self.directory))
+            else:
+                self.cassette = load_cassette(nodeid, self.directory)
+
+    def eject(self) -> list:
+        """Close the active cassette: save it (record) or return its drift (replay)."""
+        with self._lock:
+            cassette, self.cassette = self.cassette, None
+        if cassette is None:
+            return []
+        recorded_ms = sum(i.duration_ms for i in cassette.interactions)
+        if self.mode == "record":
+            if cassette.interactions:
+                save_cassette(cassette)
+            self.results[cassette.nodeid] = ([], recorded_ms, recorded_ms)
+            return []
+        drift = cassette.drift()
+        if not cassette.interactions and (cassette.misses or cassette.borrowed):
+            drift.insert(0, f"no cassette at {cassette.path}, {len(cassette.borrowed)} responses borrowed")
+        self.results[cassette.nodeid] = (drift, recorded_ms, cassette.served_ms)
+        return drift
+
+    # --- record -------------------------------------------------------------
+    def forward(self, method: str, path: str, headers, raw: bytes):
+        forwarded = {k: v for k, v in headers.items() if k.lower() not in _SKIP_REQUEST_HEADERS}
+        start = time.perf_counter()
+        try:
+            resp = self._http.request(
+                method,
+                f"{self.upstream}{path}",
+                body=raw or None,
+                headers=forwarded,
+                redirect=False,
+                preload_content=True,
+                decode_content=True,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            return 502, {"Content-Type": "application/json"}, json.dumps({"detail": str(e)}).encode("utf-8")
+        duration_ms = (time.perf_counter() - start) * 1000.0
+        kept = {k: v for k, v in resp.headers.items() if k.lower() in _KEPT_RESPONSE_HEADERS}
+        parts = urlsplit(path)
+        with self._lock:
+            cassette = self.cassette
+            if self.mode == "record" and cassette is not None and parts.path.startswith(_RECORDED_PREFIX):
+                cassette.interactions.append(
+                    Interaction(
+                        method=method,
+                        path=unquote(parts.path),
+                        query=_normalize_query(parts.query),
+                        request_body=raw.decode("utf-8", errors="replace"),
+                        status=resp.status,
+                        headers=kept,
+                        body=resp.data.decode("utf-8", errors="replace"),
+                        duration_ms=round(duration_ms, 2),
+                    )
+                )
+        return resp.status, kept, resp.data
+
+    # --- replay -------------------------------------------------------------
+    def _borrow(self, method: str, path: str, query: str):
+        if self._library is None:
+            self._library = defaultdict(list)
+            names = sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []
+            for name in names:
+                if name.endswith(".json"):
+                    for i in _read(os.path.join(self.directory, name)):
+                        self._library[(i.method, i.path)].append(i)
+        candidates = self._library.get((method, path), [])
+        exact = [i for i in candidates if i.query == query and i.status < 400]
+        ok = exact or [i for i in candidates if i.status < 400]
+        return ok[-1] if ok else None
+
+    def replay(self, method: str, path: str, query: str, request_body: str):
+        """Status, headers, body and delay for one request, from the active cassette."""
+        with self._lock:
+            cassette = self.cassette or Cassette("(no test)", "")
+            reverse = {new: old for old, new in cassette.substitutions.items()}
+            # Map this run's values back onto the recorded ones before matching
+            lookup_path = _replace_all(path, reverse)
+            lookup_query = _normalize_query(_replace_all(unquote(query), reverse))
+            match = None
+            for fallback in (False, True):
+                for index, interaction in enumerate(cassette.interactions):
+                    if index in cassette.used or interaction.method != method or interaction.path != lookup_path:
+                        continue
+                    if fallback or interaction.query == lookup_query:
+                        match = interaction
+                        cassette.used.add(index)
+                        break
+                if match is not None:
+                    break
+            if match is None:
+                match = self._borrow(method, lookup_path, lookup_query)
+                key = f"{method} {path}?{query}" if query else f"{method} {path}"
+                if match is None:
+                    cassette.misses.append(key)
+                    body = json.dumps({"detail": f"no recorded response for {key}"})
+                    return 599, {"Content-Type": "application/json"}, body, 0.0
+                cassette.borrowed.append(key)
+            try:
+                _string_changes(json.loads(match.request_body), json.loads(request_body), cassette.substitutions)
+            except ValueError:
+                pass
+            body = _replace_all(match.body, cassette.substitutions, as_json=True)
+            delay_ms = match.duration_ms if self.latency == "original" else 0.0
+            cassette.served_ms += delay_ms
+            return match.status, dict(match.headers), body, delay_ms
+
+    def summary_lines(self) -> list:
+        if not self.results:
+            return []
+        recorded = sum(r[1] for r in self.results.values())
+        served = sum(r[2] for r in self.results.values())
+        lines = [
+            f"cassettes ({self.mode}): {len(self.results)} tests, "
+            f"{recorded / 1000:.1f}s of backend time recorded, {served / 1000:.1f}s spent serving it"
+        ]
+        for nodeid, (drift, _recorded, _served) in sorted(self.results.items()):
+            for line in drift:
+                lines.append(f"drift {nodeid}: {line}")
+        return lines
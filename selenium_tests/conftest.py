@@ -1,8 +1,36 @@
 import os
+import time
+from urllib.parse import urlsplit
+
 import pytest
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
+from selenium_tests import lean_profile
+from selenium_tests.api_client import ApiError
+from selenium_tests.artifacts import capture_failure, wait_for_artifacts
+from selenium_tests.baseline import session_summary
+from selenium_tests.cassettes import API_CASSETTES, CASSETTE_PORT, CASSETTE_UPSTREAM, CassetteProxy
+from selenium_tests.driver_pool import DriverPool
+from selenium_tests.flaky import plan, run_test, save_history, summary_lines
+from selenium_tests.impact import apply_selection, record_coverage, save_map
+from selenium_tests.impact import summary_lines as impact_summary
+from selenium_tests.page_metrics import (
+    PAGE_METRICS,
+    InstrumentedChrome,
+    PageMetricsRecorder,
+    install_page_metrics,
+    record_page_metrics,
+    route_medians,
+    route_summary,
+)
+from selenium_tests.parallel import DURATIONS_FILE, parse_accounts, save_durations
+from selenium_tests.perf import PROD_BUILD, RUN_ID
+from selenium_tests.player_metrics import install_media_probe
+from selenium_tests.prod_server import API_PROXY_TARGET, ProdServer, mode_comparison, save_route_medians
+from selenium_tests.resources import RESOURCE_CLEANUP, SWEEP_LEFTOVERS, ResourceTracker, sweep
+from selenium_tests.stub_backend import StubBackend, parse_dataset
+from selenium_tests.ui_helpers import api_for_env, install_page_bridge, network_tracker
+
 
 def _load_env_file(path: str) -> None:
     """Tiny .env loader (KEY=VALUE lines) so pytest can reuse app credentials.
@@ -36,14 +64,130 @@ _load_env_file(os.path.join(os.getcwd(), "selenium_tests", ".env"))
 BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
 
 
-@pytest.fixture
-def browser():
+# Reuse warm Chrome instances across tests (set BROWSER_POOL=0 for a fresh Chrome per test)
+BROWSER_POOL = os.getenv("BROWSER_POOL", "1") in ("1", "true", "True")
+BROWSER_POOL_MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "25"))
+
+# Serve /api from an in-memory stub instead of the remote backend (Vite must proxy to it)
+STUB_BACKEND = os.getenv("STUB_BACKEND", "0") in ("1", "true", "True")
+STUB_PORT = int(os.getenv("STUB_PORT", "8765"))
+
+_POOL = None
+_CASSETTES = None
+_PROD = None
+# Per-test wall time of this run (setup + call + teardown), used to shard parallel runs
+_DURATIONS = {}
+_LEAN_PATTERNS = lean_profile.block_patterns()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_backend():
+    """In-memory SoundPuff API for offline, deterministic runs (STUB_BACKEND=1).
+
+    Start Vite with API_PROXY_TARGET=http://127.0.0.1:<STUB_PORT> so the app talks to it.
+    """
+    if not STUB_BACKEND:
+        yield None
+        return
+    backend = StubBackend(
+        port=STUB_PORT,
+        latency_ms=float(os.getenv("STUB_LATENCY_MS", "0")),
+        jitter_ms=float(os.getenv("STUB_JITTER_MS", "0")),
+        media_seconds=float(os.getenv("STUB_MEDIA_SECONDS", "30")),
+        media_latency_ms=float(os.getenv("STUB_MEDIA_LATENCY_MS", "0")),
+    )
+    backend.state.seed(**parse_dataset(os.getenv("STUB_DATASET")))
+    os.environ.setdefault("TEST_EMAIL", "selenium@stub.soundpuff.test")
+    os.environ.setdefault("TEST_PASSWORD", "selenium-password")
+    accounts = parse_accounts(os.getenv("TEST_ACCOUNTS"))
+    accounts.append((os.environ["TEST_EMAIL"], os.environ["TEST_PASSWORD"]))
+    for email, password in accounts:
+        user = backend.state.add_user(email.split("@")[0], email, password)
+        backend.state.follow_owners(user)
+    backend.start()
+    yield backend
+    backend.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_cassettes(stub_backend):
+    """Record or replay /api/v1 traffic per test (API_CASSETTES=record|replay).
+
+    Start Vite with API_PROXY_TARGET=http://127.0.0.1:<CASSETTE_PORT>; when recording with
+    STUB_BACKEND=1 the proxy forwards to the stub.
+    """
+    global _CASSETTES
+    if not API_CASSETTES:
+        yield None
+        return
+    upstream = stub_backend.url if stub_backend is not None else CASSETTE_UPSTREAM
+    _CASSETTES = CassetteProxy(API_CASSETTES, port=CASSETTE_PORT, upstream=upstream).start()
+    yield _CASSETTES
+    _CASSETTES.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prod_build(stub_backend, api_cassettes):
+    """Serve build/ with compression and caching on BASE_URL's port instead of `npm run dev` (PROD_BUILD=1).
+
+    /api goes to the cassette proxy, the stub, or API_PROXY_TARGET, in that order.
+    """
+    global _PROD
+    if not PROD_BUILD:
+        yield None
+        return
+    if api_cassettes is not None:
+        upstream = api_cassettes.url
+    elif stub_backend is not None:
+        upstream = stub_backend.url
+    else:
+        upstream = API_PROXY_TARGET
+    base = urlsplit(BASE_URL)
+    try:
+        _PROD = ProdServer(host=base.hostname, port=base.port or 80, upstream=upstream).start()
+    except (FileNotFoundError, OSError) as e:
+        pytest.exit(f"PROD_BUILD=1: {e} (stop `npm run dev` and run `npm run build`)", returncode=4)
+    yield _PROD
+    _PROD.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sweep_leftovers(prod_build, api_cassettes):
+    """Delete selenium-* playlists left behind by crashed runs (SWEEP_LEFTOVERS=1)."""
+    if not SWEEP_LEFTOVERS:
+        return
+    try:
+        stale = sweep(api_for_env())
+    except (ApiError, AssertionError) as e:
+        print(f"Could not sweep leftover test data: {e}")
+        return
+    if stale:
+        print(f"Swept {len(stale)} leftover test playlists")
+
+
+@pytest.fixture(autouse=True)
+def api_cassette(api_cassettes, request):
+    """Point the cassette proxy at the running test's cassette."""
+    if api_cassettes is None:
+        yield None
+        return
+    api_cassettes.use(request.node.nodeid)
+    yield api_cassettes
+    api_cassettes.eject()
+
+
+def _new_chrome():
     opts = Options()
     headless = os.getenv("HEADLESS", "1") in ("1", "true", "True")
     if headless:
         opts.add_argument("--headless=new")
         opts.add_argument("--disable-gpu")
-    drv = webdriver.Chrome(options=opts)
+    # Let the player start tracks that aren't a direct result of a click (next on ended)
+    opts.add_argument("--autoplay-policy=no-user-gesture-required")
+    # CDP Network.* events for ui_helpers.network_tracker; console messages for failure artifacts
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+    opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    drv = InstrumentedChrome(options=opts)
     drv.set_window_size(1280, 800)
     # Avoid flakiness on slower page loads
     try:
@@ -51,11 +195,176 @@ def browser():
         drv.set_script_timeout(30)
     except Exception:
         pass
+    # DOM-mutation / network bridge behind the event-driven waits in ui_helpers
+    install_page_bridge(drv)
+    install_page_metrics(drv)
+    install_media_probe(drv)
+    return drv
+
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    global _POOL
+    _POOL = DriverPool(
+        _new_chrome,
+        BASE_URL,
+        max_uses=BROWSER_POOL_MAX_USES if BROWSER_POOL else 1,
+    )
+    yield _POOL
+    _POOL.close()
+
+
+@pytest.fixture
+def browser(browser_pool, request):
+    # A retried flaky test gets a newly launched Chrome rather than a pooled one
+    drv = browser_pool.acquire(fresh=getattr(request.node, "flaky_attempt", 1) > 1)
+    # Drop network events left over from the previous test on this driver
+    network_tracker(drv).reset()
+    lean = lean_profile.wants_lean(request.node)
+    if lean:
+        lean_profile.apply(drv, _LEAN_PATTERNS)
+    metrics = PageMetricsRecorder() if PAGE_METRICS else None
+    drv.page_metrics = metrics
+    drv.test_started = time.time()
     yield drv
+    # Whatever fails below, the driver goes back to the pool (or is quit)
     try:
-        drv.quit()
-    except Exception:
-        pass
+        if metrics is not None:
+            drv.page_metrics = None
+            try:
+                metrics.collect(drv)
+            except Exception:
+                pass
+            record_page_metrics(request.node, metrics)
+        # Routes and API calls of this test, for impact selection
+        try:
+            routes = [v["route"] for v in metrics.visits] if metrics is not None else []
+            routes.append(drv.current_url)
+            record_coverage(request.node.nodeid, routes, [r.url for r in network_tracker(drv).requests("/api/v1")])
+        except Exception:
+            pass
+        lean_profile.account(request.node.nodeid, network_tracker(drv).requests(), lean, _LEAN_PATTERNS)
+    finally:
+        poisoned = False
+        if lean:
+            # The next test on this pooled driver may want the full profile
+            try:
+                lean_profile.clear(drv)
+            except Exception:
+                poisoned = True
+        browser_pool.release(drv, poisoned=poisoned)
+
+
+@pytest.fixture
+def api():
+    """REST client logged in as TEST_EMAIL, for seeding test data without the UI."""
+    return api_for_env()
+
+
+@pytest.fixture
+def resources(api):
+    """Collision-free names for test data; what the test creates through it is deleted afterwards."""
+    tracker = ResourceTracker(api)
+    yield tracker
+    if RESOURCE_CLEANUP:
+        try:
+            tracker.cleanup()
+        except ApiError as e:
+            print(f"Could not clean up test data: {e}")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "lean: block images, fonts and third-party calls (see lean_profile.py)")
+    config.addinivalue_line("markers", "full_profile: never use the lean profile (timed tests)")
+
+
+def pytest_collection_modifyitems(config, items):
+    apply_selection(config, items)
+    plan(items)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    return run_test(item, nextitem)
+
+
+def pytest_report_teststatus(report, config):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    # The browser fixture is torn down after this hook, so the failing page is still loaded
+    if report.failed and report.when in ("setup", "call"):
+        drv = getattr(item, "funcargs", {}).get("browser")
+        if drv is not None:
+            path = capture_failure(item, report, drv, attempt=getattr(item, "flaky_attempt", 1))
+            if path:
+                report.sections.append(("failure artifacts", path))
+
+
+def pytest_runtest_logreport(report):
+    _DURATIONS[report.nodeid] = _DURATIONS.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    wait_for_artifacts()
+    if _DURATIONS and not session.config.option.collectonly:
+        save_durations(_DURATIONS, DURATIONS_FILE)
+        save_history()
+        save_map()
+        save_route_medians(route_medians(), run_id=RUN_ID)
+        lean_profile.save_sizes()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _POOL is not None:
+        stats = _POOL.stats
+        terminalreporter.write_line(
+            f"Chrome pool: {stats.launches} launches for {stats.acquisitions} tests "
+            f"({stats.launches_saved} launches saved, {stats.replaced} replaced, {stats.retired} recycled)"
+        )
+    routes = route_summary()
+    if routes:
+        terminalreporter.write_sep("-", "page metrics per route (medians)")
+        for line in routes:
+            terminalreporter.write_line(line)
+    if _PROD is not None:
+        for line in _PROD.summary_lines():
+            terminalreporter.write_line(line)
+    modes = mode_comparison()
+    if modes and routes:
+        terminalreporter.write_sep("-", "dev server vs production build per route (medians)")
+        for line in modes:
+            terminalreporter.write_line(line)
+    failures = wait_for_artifacts()
+    if failures:
+        terminalreporter.write_sep("-", "failure artifacts")
+        for path in failures:
+            terminalreporter.write_line(path)
+    for line in impact_summary():
+        terminalreporter.write_line(line)
+    if _CASSETTES is not None:
+        for line in _CASSETTES.summary_lines():
+            terminalreporter.write_line(line)
+    lean = lean_profile.summary_lines()
+    if lean:
+        terminalreporter.write_sep("-", "lean profile savings")
+        for line in lean:
+            terminalreporter.write_line(line)
+    flakes = summary_lines()
+    if flakes:
+        terminalreporter.write_sep("-", "fallbacks, retries and quarantine")
+        for line in flakes:
+            terminalreporter.write_line(line)
+    baseline = session_summary()
+    if baseline:
+        terminalreporter.write_sep("-", "performance baseline")
+        for line in baseline:
+            terminalreporter.write_line(line)
 
 
 def get_base_url():
@@ -0,0 +1,260 @@
+"""Many simulated users in a few Chrome processes, one browser context each.
+
+A browser context (CDP ``Target.createBrowserContext``) is an incognito-like profile:
+own cookies, localStorage and cache, but the same Chrome process. It costs a renderer,
+not a whole browser. For every simulated user the host Chrome gets a new context with one
+tab. A second WebDriver session is then attached to that Chrome (``debuggerAddress``,
+served by the host's chromedriver) and switched to the user's tab, so the user is driven by
+the same ``ui_helpers`` calls as the regular tests. Each user runs on its own thread:
+
+    feed -> open the shared playlist -> like/unlike it -> search
+
+Every action is timed from the user's side (navigation or click until the UI shows the
+result). The same journey is first run by a single user to get uncontended numbers.
+"""
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+
+import websocket
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from selenium_tests.locators import Home, Playlist, Search
+from selenium_tests.page_metrics import InstrumentedChrome
+from selenium_tests.perf import percentile
+from selenium_tests.ui_helpers import (
+    BASE_URL,
+    SELENIUM_TIMEOUT,
+    install_page_bridge,
+    login_cached,
+    open_playlist,
+    spa_navigate,
+    wait_for_js,
+)
+
+ACTIONS = ("feed", "playlist", "like", "search")
+# The header heart is filled while the viewer likes the playlist
+_LIKED_JS = "const h = document.querySelector(\"[data-testid='playlist-like'] svg\"); return !!h && h.classList.contains('fill-pink');"
+_LIKE_FLIPPED_JS = (
+    "const h = document.querySelector(\"[data-testid='playlist-like'] svg\");"
+    " return !!h && h.classList.contains('fill-pink') !== args[0];"
+)
+
+
+class BrowserCdp:
+    """Browser-level DevTools connection (contexts and targets live above any one tab)."""
+
+    def __init__(self, debugger_address: str, timeout: float = SELENIUM_TIMEOUT):
+        with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=timeout) as resp:
+            url = json.load(resp)["webSocketDebuggerUrl"]
+        self._ws = websocket.create_connection(url, timeout=timeout, suppress_origin=True)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def send(self, method: str, params: dict | None = None) -> dict:
+        with self._lock:
+            msg_id = next(self._ids)
+            self._ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+            while True:
+                msg = json.loads(self._ws.recv())
+                # Events and replies to other calls are skipped
+                if msg.get("id") != msg_id:
+                    continue
+                if "error" in msg:
+                    raise WebDriverException(f"{method}: {msg['error'].get('message')}")
+                return msg.get("result", {})
+
+    def close(self) -> None:
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+class AttachedChrome(InstrumentedChrome):
+    """An extra WebDriver session on a running Chrome, sharing the host's chromedriver.
+
+    ``quit`` ends only this session: the host driver owns chromedriver and the browser.
+    """
+
+    def __init__(self, host, options: Options):
+        # Set so the session isn't treated as a Grid session; never started or stopped here
+        self.service = host.service
+        self.options = options
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=host.service.service_url,
+            browser_name="chrome",
+            vendor_prefix="goog",
+            keep_alive=True,
+            ignore_proxy=options._ignore_local_proxy,
+        )
+        RemoteWebDriver.__init__(self, command_executor=executor, options=options)
+        self._is_remote = False
+
+    def quit(self) -> None:
+        try:
+            RemoteWebDriver.quit(self)
+        except Exception:
+            pass
+
+
+@dataclass
+class SimUser:
+    uid: int
+    host: object
+    context_id: str
+    target_id: str
+    driver: object = None
+    account: tuple = ()
+    # action -> seconds per sample
+    timings: dict = field(default_factory=lambda: {a: [] for a in ACTIONS})
+    errors: list = field(default_factory=list)
+
+    def p50(self, action: str) -> float:
+        return percentile(self.timings[action], 50)
+
+
+class BrowserHost:
+    """One Chrome process hosting several user contexts."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        self.cdp = BrowserCdp(self.address)
+        self.users = []
+
+    def add_user(self, uid: int, account: tuple) -> SimUser:
+        context_id = self.cdp.send("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        target_id = self.cdp.send(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+        )["targetId"]
+        user = SimUser(uid, self, context_id, target_id, account=account)
+        opts = Options()
+        opts.debugger_address = self.address
+        user.driver = AttachedChrome(self.driver, opts)
+        _switch_to_target(user.driver, target_id)
+        install_page_bridge(user.driver)
+        self.users.append(user)
+        return user
+
+    def close(self) -> None:
+        for user in self.users:
+            if user.driver is not None:
+                user.driver.quit()
+            try:
+                self.cdp.send("Target.disposeBrowserContext", {"browserContextId": user.context_id})
+            except (WebDriverException, OSError, websocket.WebSocketException):
+                pass
+        self.users = []
+        self.cdp.close()
+
+
+def _switch_to_target(driver, target_id: str) -> None:
+    handles = driver.window_handles
+    if target_id in handles:
+        driver.switch_to.window(target_id)
+        return
+    for handle in handles:
+        driver.switch_to.window(handle)
+        if driver.execute_cdp_cmd("Target.getTargetInfo", {})["targetInfo"]["targetId"] == target_id:
+            return
+    raise WebDriverException(f"tab {target_id} of the user's browser context is not visible to the attached session")
+
+
+def _timed(user: SimUser, action: str, fn) -> None:
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        user.errors.append(f"{action}: {e.__class__.__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+        return
+    user.timings[action].append(time.perf_counter() - start)
+
+
+def run_journey(user: SimUser, playlist_id: int, like: bool = True, query: str = "Pop") -> None:
+    """One pass of feed -> shared playlist -> like toggle -> search, timing each step.
+
+    ``like`` needs one account per user: contexts sharing an account would undo each other's likes.
+    """
+    drv = user.driver
+    wait = WebDriverWait(drv, SELENIUM_TIMEOUT)
+
+    def feed():
+        drv.get(f"{BASE_URL}/app/home")
+        wait.until(EC.presence_of_element_located(Home.FEED_CARD_TITLE))
+
+    def toggle_like():
+        before = drv.execute_script(_LIKED_JS)
+        drv.find_element(*Playlist.LIKE).click()
+        wait_for_js(drv, _LIKE_FLIPPED_JS, before, message="like state did not change")
+
+    def search():
+        spa_navigate(drv, "/app/search")
+        box = wait.until(EC.visibility_of_element_located(Search.INPUT))
+        box.clear()
+        box.send_keys(query)
+        wait.until(EC.presence_of_element_located(Search.SONGS_HEADING))
+
+    _timed(user, "feed", feed)
+    _timed(user, "playlist", lambda: open_playlist(drv, playlist_id))
+    if like:
+        _timed(user, "like", toggle_like)
+    _timed(user, "search", search)
+
+
+def run_users(
+    users: list, playlist_id: int, duration_s: float, think_s: float = 1.0, like: bool = True, seed: int = 0
+) -> float:
+    """Run every user's journey in a loop on its own thread for ``duration_s``; returns wall time."""
+    deadline = time.perf_counter() + duration_s
+    rng = random.Random(seed)
+
+    def loop(user: SimUser, delay: float):
+        time.sleep(delay)
+        login_cached(user.driver, *user.account)
+        local = random.Random(rng.random())
+        while time.perf_counter() < deadline:
+            run_journey(user, playlist_id, like=like)
+            time.sleep(local.uniform(0, think_s))
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=loop, args=(u, think_s * i / max(1, len(users))), name=f"sim-user-{u.uid}", daemon=True)
+        for i, u in enumerate(users)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def summary_lines(users: list, solo: SimUser | None = None) -> list:
+    """Per action p50/p90 over all users, the slowest user's p50 and the slowdown against ``solo``."""
+    lines = []
+    for action in ACTIONS:
+        samples = [s for u in users for s in u.timings[action]]
+        if not samples:
+            lines.append(f"{action:<9} no samples")
+            continue
+        worst = max((u for u in users if u.timings[action]), key=lambda u: u.p50(action))
+        line = (
+            f"{action:<9} n={len(samples):>4} p50={percentile(samples, 50):.3f}s "
+            f"p90={percentile(samples, 90):.3f}s slowest user p50={worst.p50(action):.3f}s (user {worst.uid})"
+        )
+        if solo is not None and solo.timings[action]:
+            line += f"  x{percentile(samples, 50) / solo.p50(action):.1f} vs one user"
+        lines.append(line)
+    errors = [e for u in users for e in u.errors]
+    if errors:
+        lines.append(f"{len(errors)} failed actions, e.g. {errors[0]}")
+    return lines
@@ -0,0 +1,128 @@
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoAlertPresentException
+
+
+@dataclass
+class PoolStats:
+    launches: int = 0
+    acquisitions: int = 0
+    replaced: int = 0
+    retired: int = 0
+
+    @property
+    def launches_saved(self) -> int:
+        return max(0, self.acquisitions - self.launches)
+
+
+class DriverPool:
+    """Keeps warm Chrome instances alive for the whole pytest session.
+
+    Drivers are handed out by ``acquire`` and returned with ``release``, which
+    resets cookies, storage and extra tabs so the next test starts clean. A
+    driver that fails the reset or the liveness check (crashed renderer, dead
+    chromedriver, stuck alert) is quit and replaced by a fresh launch.
+    """
+
+    def __init__(self, factory, base_url: str, max_uses: int = 25):
+        self._factory = factory
+        self._origin = _origin_of(base_url)
+        self._max_uses = max(1, max_uses)
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self.stats = PoolStats()
+
+    def acquire(self, fresh: bool = False):
+        """A pooled driver, or a newly launched one when ``fresh`` (used for retries)."""
+        with self._lock:
+            self.stats.acquisitions += 1
+        while not fresh:
+            # Liveness checks and quits are WebDriver round-trips: never hold the lock for them
+            with self._lock:
+                if not self._idle:
+                    break
+                drv = self._idle.pop()
+            if _is_alive(drv):
+                return drv
+            with self._lock:
+                self.stats.replaced += 1
+            self._forget(drv)
+        drv = self._factory()
+        with self._lock:
+            self.stats.launches += 1
+            self._uses[id(drv)] = 0
+        return drv
+
+    def release(self, drv, poisoned: bool = False) -> None:
+        """Return a driver to the pool, or quit it if it can't be reused."""
+        with self._lock:
+            uses = self._uses.get(id(drv), 0) + 1
+            self._uses[id(drv)] = uses
+        if poisoned or not self._reset(drv):
+            with self._lock:
+                self.stats.replaced += 1
+            self._forget(drv)
+            return
+        if uses >= self._max_uses:
+            # Recycle long-lived instances so renderer memory doesn't pile up.
+            with self._lock:
+                self.stats.retired += 1
+            self._forget(drv)
+            return
+        with self._lock:
+            self._idle.append(drv)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for drv in idle:
+            self._forget(drv)
+
+    def _reset(self, drv) -> bool:
+        try:
+            try:
+                drv.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+
+            handles = drv.window_handles
+            for handle in handles[1:]:
+                drv.switch_to.window(handle)
+                drv.close()
+            drv.switch_to.window(handles[0])
+
+            # sessionStorage is per-tab and can only be cleared from the page itself.
+            if drv.current_url.startswith(self._origin):
+                drv.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            drv.get("about:blank")
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            drv.execute_cdp_cmd(
+                "Storage.clearDataForOrigin",
+                {"origin": self._origin, "storageTypes": "all"},
+            )
+            return _is_alive(drv)
+        except Exception:
+            return False
+
+    def _forget(self, drv) -> None:
+        with self._lock:
+            self._uses.pop(id(drv), None)
+        try:
+            drv.quit()
+        except Exception:
+            pass
+
+
+def _is_alive(drv) -> bool:
+    try:
+        return drv.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+def _origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
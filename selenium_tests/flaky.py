@@ -0,0 +1,209 @@
+"""Fallback accounting, flake history, targeted retries and quarantine.
+
+Helpers in ``ui_helpers`` call ``record_fallback`` whenever they leave their primary path
+(JS click instead of a native click, a refresh-and-retry, a form login after a rejected
+token), with the wall time that detour cost. Per test the harness keeps:
+
+- the fallbacks taken and their cost,
+- how many attempts the test needed.
+
+Each run is appended to ``.flake_history.json``. From the last ``FLAKY_WINDOW`` runs a
+flake rate is computed: runs that failed or only passed on a retry, out of all runs, for
+tests that also pass (a test that always fails is broken, not flaky). Fallbacks are
+reported with their cost but don't count: a test whose primary path always falls back is
+slow, not flaky, and quarantining it would hide its real failures. Known-flaky tests are re-run up to ``FLAKY_RETRIES`` times in a fresh Chrome when
+they fail; everything else fails on the first attempt. Tests above
+``FLAKY_QUARANTINE_RATE`` still run but are marked xfail, so they are reported without
+failing the build until they stabilise.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+FLAKE_HISTORY_FILE = os.getenv(
+    "FLAKE_HISTORY_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".flake_history.json"),
+)
+FLAKY_WINDOW = int(os.getenv("FLAKY_WINDOW", "20"))
+FLAKY_MIN_RUNS = int(os.getenv("FLAKY_MIN_RUNS", "3"))
+# Known-flaky tests (rate >= this) get FLAKY_RETRIES extra attempts in a fresh driver
+FLAKY_RETRY_RATE = float(os.getenv("FLAKY_RETRY_RATE", "0.1"))
+FLAKY_RETRIES = int(os.getenv("FLAKY_RETRIES", "1"))
+FLAKY_QUARANTINE = os.getenv("FLAKY_QUARANTINE", "1") in ("1", "true", "True")
+FLAKY_QUARANTINE_RATE = float(os.getenv("FLAKY_QUARANTINE_RATE", "0.3"))
+
+
+@dataclass
+class RunStats:
+    nodeid: str
+    attempts: int = 0
+    outcome: str = "passed"
+    # Wall time of the failed attempts that were retried
+    retry_s: float = 0.0
+    # name -> [count, seconds]
+    fallbacks: dict = field(default_factory=dict)
+
+    @property
+    def fallback_s(self) -> float:
+        return sum(seconds for _count, seconds in self.fallbacks.values())
+
+
+_RUNS = {}
+_CURRENT = None
+# nodeid -> flake rate, decided at collection time
+_RETRY = {}
+_QUARANTINED = {}
+
+
+def record_fallback(name: str, seconds: float) -> None:
+    """Count one use of fallback ``name`` by the running test, which cost ``seconds``."""
+    if _CURRENT is None:
+        return
+    entry = _CURRENT.fallbacks.setdefault(name, [0, 0.0])
+    entry[0] += 1
+    entry[1] += seconds
+
+
+def load_history(path: str = FLAKE_HISTORY_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def flake_rate(runs: list) -> float | None:
+    """Share of recent runs that failed or needed a retry, or None if there is too little history."""
+    runs = runs[-FLAKY_WINDOW:]
+    if len(runs) < FLAKY_MIN_RUNS:
+        return None
+    if not any(r["outcome"] == "passed" for r in runs):
+        return 0.0
+    unstable = sum(1 for r in runs if r["outcome"] == "failed" or r["attempts"] > 1)
+    return unstable / len(runs)
+
+
+def plan(items: list, path: str = FLAKE_HISTORY_FILE) -> None:
+    """Pick the tests that may be retried and quarantine the worst ones (collection time)."""
+    history = load_history(path)
+    for item in items:
+        rate = flake_rate(history.get(item.nodeid, []))
+        if rate is None:
+            continue
+        if rate >= FLAKY_RETRY_RATE and FLAKY_RETRIES > 0:
+            _RETRY[item.nodeid] = rate
+        if FLAKY_QUARANTINE and rate >= FLAKY_QUARANTINE_RATE:
+            _QUARANTINED[item.nodeid] = rate
+            item.add_marker(pytest.mark.xfail(reason=f"quarantined: flake rate {rate:.0%}", strict=False))
+
+
+def _outcome(reports: list) -> str:
+    if any(r.failed or (r.skipped and hasattr(r, "wasxfail")) for r in reports):
+        return "failed"
+    if any(r.skipped for r in reports):
+        return "skipped"
+    return "passed"
+
+
+def run_test(item, nextitem) -> bool:
+    """``pytest_runtest_protocol`` with retries for known-flaky tests."""
+    global _CURRENT
+    run = _CURRENT = _RUNS[item.nodeid] = RunStats(item.nodeid)
+    retries = FLAKY_RETRIES if item.nodeid in _RETRY else 0
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    try:
+        for attempt in range(1, retries + 2):
+            # Read by the browser fixture: retries get a newly launched Chrome
+            item.flaky_attempt = attempt
+            run.attempts = attempt
+            start = time.perf_counter()
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            if attempt > retries or not any(r.failed for r in reports):
+                break
+            run.retry_s += time.perf_counter() - start
+            for report in reports:
+                if report.failed:
+                    report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+    finally:
+        _CURRENT = None
+    run.outcome = _outcome(reports)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def save_history(path: str = FLAKE_HISTORY_FILE) -> None:
+    """Append this session's runs; parallel workers write ``<path>.<worker>`` for parallel.py to merge."""
+    new = {}
+    for run in _RUNS.values():
+        if run.outcome == "skipped":
+            continue
+        new[run.nodeid] = [
+            {
+                "timestamp": time.time(),
+                "outcome": run.outcome,
+                "attempts": run.attempts,
+                "fallbacks": {name: count for name, (count, _s) in run.fallbacks.items()},
+                "fallback_s": round(run.fallback_s, 3),
+                "retry_s": round(run.retry_s, 3),
+            }
+        ]
+    if not new:
+        return
+    worker = os.getenv("SELENIUM_WORKER")
+    if worker:
+        _write_history(new, f"{path}.{worker}")
+    else:
+        merge_history(new, path)
+
+
+def merge_history(new: dict, path: str = FLAKE_HISTORY_FILE) -> None:
+    if not new:
+        return
+    history = load_history(path)
+    for nodeid, runs in new.items():
+        merged = history.setdefault(nodeid, [])
+        merged.extend(runs)
+        del merged[:-FLAKY_WINDOW]
+    _write_history(history, path)
+
+
+def _write_history(history: dict, path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def summary_lines() -> list:
+    """Fallback and retry cost of this session, plus quarantined tests, as printable lines."""
+    lines = []
+    totals = {}
+    for run in _RUNS.values():
+        for name, (count, seconds) in run.fallbacks.items():
+            total = totals.setdefault(name, [0, 0.0, 0])
+            total[0] += count
+            total[1] += seconds
+            total[2] += 1
+    for name, (count, seconds, tests) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"fallback {name:<28} {count:>4}x in {tests:>3} tests  {seconds:>7.1f}s")
+    for run in sorted(_RUNS.values(), key=lambda r: -r.retry_s):
+        if run.attempts > 1:
+            lines.append(
+                f"retry    {run.nodeid}: {run.outcome} after {run.attempts} attempts "
+                f"({run.retry_s:.1f}s spent on failed attempts)"
+            )
+    for nodeid, rate in sorted(_QUARANTINED.items(), key=lambda kv: -kv[1]):
+        outcome = _RUNS[nodeid].outcome if nodeid in _RUNS else "not run"
+        lines.append(f"quarantined {nodeid}: flake rate {rate:.0%}, {outcome} this run")
+    if totals or any(run.attempts > 1 for run in _RUNS.values()):
+        fallback_s = sum(t[1] for t in totals.values())
+        retry_s = sum(run.retry_s for run in _RUNS.values())
+        lines.append(f"total cost: {fallback_s:.1f}s in fallbacks, {retry_s:.1f}s in retries")
+    return lines
@@ -0,0 +1,316 @@
+"""Test impact selection: run only the UI tests a change can affect.
+
+Every run records, per test, the routes it visited (page metrics visits, normalised with
+``route_key``) and the ``/api/v1`` endpoints the page called (network tracker). The
+union over runs is kept in ``.impact_map.json``.
+
+Changed files are mapped onto the same vocabulary from the source:
+
+- ``src/pages/*`` -> the routes ``App.tsx`` renders them on
+- ``src/services/*.ts`` -> the endpoint paths in their string literals
+- any other file under ``src/`` -> whatever pages/services import it (transitively); a
+  file that reaches ``App.tsx`` without going through a page (layout, contexts, player)
+  is used on every route and selects everything
+- ``selenium_tests/test_*.py`` -> the tests in that file; other harness files and files
+  outside ``src/`` (package.json, vite config, ...) select everything
+
+Tests with no recorded coverage yet always run. Enable with ``IMPACT_BASE=<git ref>``
+(e.g. ``origin/main``); the diff is ``<ref>...HEAD`` plus uncommitted changes. Preview a
+selection without running it:
+
+    python -m selenium_tests.impact --base origin/main
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import warnings
+from urllib.parse import urlsplit
+
+from selenium_tests.page_metrics import route_key
+
+
+IMPACT_BASE = os.getenv("IMPACT_BASE", "")
+IMPACT_MAP_FILE = os.getenv(
+    "IMPACT_MAP_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".impact_map.json"),
+)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_PREFIX = "/api/v1"
+
+# Changes that can't affect what the browser runs
+_IGNORED = (
+    re.compile(r"\.md$"),
+    re.compile(r"(^|/)__tests__/"),
+    re.compile(r"\.test\.tsx?$"),
+    re.compile(r"(^|/)\.gitignore$"),
+    re.compile(r"^selenium_tests/(README|env\.example)"),
+)
+_IMPORT = re.compile(r"""(?:\bfrom|\bimport)\s*\(?\s*['"](\.{1,2}/[^'"]+)['"]""")
+_ENDPOINT = re.compile(r"""['"`](/(?!api/)[a-z][^'"`\s?]*)""")
+_ROUTE_PATH = re.compile(r'\bpath="([^"]+)"')
+_COMPONENT = re.compile(r"<([A-Z]\w*)")
+_ROUTE_WRAPPERS = {"GuestRoute", "ProtectedRoute", "Layout", "Routes", "Navigate"}
+_SOURCE_EXTENSIONS = (".tsx", ".ts", ".jsx", ".js")
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f-]{27,})$")
+
+# nodeid -> {"routes": set, "endpoints": set}, recorded this session
+_COVERAGE = {}
+_SELECTION = {}
+
+
+# --- recording --------------------------------------------------------------
+def endpoint_key(url: str) -> str:
+    """``/api/v1/playlists/42/songs?x=1`` -> ``/api/v1/playlists/*/songs``."""
+    parts = urlsplit(url).path.rstrip("/").split("/")
+    return "/".join("*" if _ID_SEGMENT.match(p) else p for p in parts)
+
+
+def record_coverage(nodeid: str, routes, urls) -> None:
+    entry = _COVERAGE.setdefault(nodeid, {"routes": set(), "endpoints": set()})
+    entry["routes"].update(route_key(urlsplit(r).path or r) for r in routes if r)
+    entry["endpoints"].update(endpoint_key(u) for u in urls if API_PREFIX in u)
+
+
+def load_map(path: str = IMPACT_MAP_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_map(path: str = IMPACT_MAP_FILE) -> None:
+    """Merge this session's coverage; parallel workers write ``<path>.<worker>`` for parallel.py."""
+    new = {
+        nodeid: {"routes": sorted(cov["routes"]), "endpoints": sorted(cov["endpoints"])}
+        for nodeid, cov in _COVERAGE.items()
+    }
+    worker = os.getenv("SELENIUM_WORKER")
+    if worker and new:
+        _write_map(new, f"{path}.{worker}")
+    else:
+        merge_map(new, path)
+
+
+def merge_map(new: dict, path: str = IMPACT_MAP_FILE) -> None:
+    if not new:
+        return
+    data = load_map(path)
+    for nodeid, cov in new.items():
+        entry = data.setdefault(nodeid, {"routes": [], "endpoints": []})
+        entry["routes"] = sorted(set(entry["routes"]) | set(cov["routes"]))
+        entry["endpoints"] = sorted(set(entry["endpoints"]) | set(cov["endpoints"]))
+    _write_map(data, path)
+
+
+def _write_map(data: dict, path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# --- source analysis --------------------------------------------------------
+def _read(rel: str) -> str:
+    try:
+        with open(os.path.join(REPO_ROOT, rel), "r", encoding="utf-8") as f:
+            return f.read()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return ""
+
+
+def _resolve(importer: str, spec: str) -> str | None:
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, "/")
+    candidates = [base] + [base + ext for ext in _SOURCE_EXTENSIONS] + [f"{base}/index{ext}" for ext in _SOURCE_EXTENSIONS]
+    for candidate in candidates:
+        if os.path.isfile(os.path.join(REPO_ROOT, candidate)):
+            return candidate
+    return None
+
+
+def import_graph() -> dict:
+    """file -> set of files that import it, for everything under src/."""
+    importers = {}
+    for dirpath, _dirs, files in os.walk(os.path.join(REPO_ROOT, "src")):
+        for name in files:
+            if not name.endswith(_SOURCE_EXTENSIONS):
+                continue
+            rel = os.path.relpath(os.path.join(dirpath, name), REPO_ROOT).replace(os.sep, "/")
+            if any(p.search(rel) for p in _IGNORED):
+                continue
+            for spec in _IMPORT.findall(_read(rel)):
+                target = _resolve(rel, spec)
+                if target:
+                    importers.setdefault(target, set()).add(rel)
+    return importers
+
+
+def page_routes(app: str = "src/App.tsx") -> dict:
+    """page file -> route keys it is rendered on, read from the <Route> tree in App.tsx."""
+    source = _read(app)
+    components = {}
+    for match in re.finditer(r"import\s*\{?\s*(\w+)\s*\}?\s*from\s*['\"](\.{1,2}/[^'\"]+)['\"]", source):
+        target = _resolve(app, match.group(2))
+        if target:
+            components[match.group(1)] = target
+    routes = {}
+    for chunk in source.split("<Route")[1:]:
+        path = _ROUTE_PATH.search(chunk)
+        names = [n for n in _COMPONENT.findall(chunk) if n not in _ROUTE_WRAPPERS]
+        if not path or not names or names[0] not in components or path.group(1).endswith("*"):
+            continue
+        full = path.group(1) if path.group(1).startswith("/") else f"/app/{path.group(1)}"
+        full = re.sub(r":\w+", "*", full)
+        routes.setdefault(components[names[0]], set()).add(route_key(full))
+    return routes
+
+
+def service_endpoints(service: str) -> set:
+    return {
+        API_PREFIX + re.sub(r"\$\{[^}]*\}", "*", m).rstrip("/")
+        for m in _ENDPOINT.findall(_read(service))
+    }
+
+
+def _endpoint_matches(pattern: str, endpoint: str) -> bool:
+    want, got = pattern.split("/"), endpoint.split("/")
+    return len(want) == len(got) and all(w in ("*", g) or g == "*" for w, g in zip(want, got))
+
+
+def affected(changed: list) -> dict:
+    """What ``changed`` files touch: {"all": reason|None, "routes", "endpoints", "test_files"}."""
+    result = {"all": None, "routes": set(), "endpoints": set(), "test_files": set()}
+    pages = page_routes()
+    importers = None
+    for path in changed:
+        if any(p.search(path) for p in _IGNORED):
+            continue
+        if path.startswith("selenium_tests/"):
+            if re.match(r"selenium_tests/test_\w+\.py$", path):
+                result["test_files"].add(path)
+            else:
+                result["all"] = result["all"] or f"harness file {path}"
+            continue
+        if not path.startswith("src/"):
+            result["all"] = result["all"] or f"build/config file {path}"
+            continue
+        if importers is None:
+            importers = import_graph()
+        # Walk up the importers until reaching pages and services
+        seen, stack = set(), [path]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current in pages:
+                result["routes"].update(pages[current])
+                continue
+            if current.startswith("src/services/"):
+                endpoints = service_endpoints(current)
+                if endpoints:
+                    result["endpoints"].update(endpoints)
+                    continue
+            if current in ("src/App.tsx", "src/main.tsx"):
+                result["all"] = result["all"] or f"{path} is used on every page (reaches {current})"
+                break
+            stack.extend(importers.get(current, ()))
+    return result
+
+
+def select(nodeids: list, changed: list, coverage: dict | None = None) -> tuple:
+    """Split ``nodeids`` into (selected, reasons) for the ``changed`` files."""
+    if coverage is None:
+        coverage = load_map()
+    impact = affected(changed)
+    reasons = {}
+    for nodeid in nodeids:
+        test_file = nodeid.split("::", 1)[0]
+        cov = coverage.get(nodeid)
+        if impact["all"]:
+            reasons[nodeid] = impact["all"]
+        elif test_file in impact["test_files"]:
+            reasons[nodeid] = "test file changed"
+        elif cov is None:
+            reasons[nodeid] = "no recorded coverage"
+        else:
+            routes = impact["routes"] & set(cov["routes"])
+            endpoints = {e for e in cov["endpoints"] if any(_endpoint_matches(p, e) for p in impact["endpoints"])}
+            if routes or endpoints:
+                reasons[nodeid] = "uses " + ", ".join(sorted(routes | endpoints)[:4])
+    return [n for n in nodeids if n in reasons], reasons
+
+
+def changed_files(base: str) -> list:
+    """Files changed between ``base`` and HEAD, plus uncommitted and untracked changes."""
+    commands = (
+        ["git", "diff", "--name-only", f"{base}...HEAD"],
+        ["git", "diff", "--name-only", "HEAD"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    )
+    files = set()
+    for cmd in commands:
+        out = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        files.update(line.strip() for line in out.splitlines() if line.strip())
+    return sorted(files)
+
+
+# --- pytest integration -----------------------------------------------------
+def apply_selection(config, items: list) -> None:
+    """Deselect the tests the diff against IMPACT_BASE can't affect (collection time)."""
+    if not IMPACT_BASE:
+        return
+    try:
+        changed = changed_files(IMPACT_BASE)
+    except (subprocess.CalledProcessError, OSError) as e:
+        # Shallow CI clones often have no origin/main: run everything rather than nothing
+        detail = ((getattr(e, "stderr", None) or str(e)).strip().splitlines() or [""])[0]
+        warnings.warn(f"IMPACT_BASE={IMPACT_BASE}: git diff failed ({detail}); running the full suite")
+        _SELECTION.update({"base": IMPACT_BASE, "failed": detail})
+        return
+    selected, reasons = select([item.nodeid for item in items], changed)
+    keep = set(selected)
+    deselected = [item for item in items if item.nodeid not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in keep]
+    _SELECTION.update(
+        {"base": IMPACT_BASE, "changed": len(changed), "selected": len(selected), "total": len(selected) + len(deselected)}
+    )
+
+
+def summary_lines() -> list:
+    if not _SELECTION:
+        return []
+    s = _SELECTION
+    if "failed" in s:
+        return [f"impact selection vs {s['base']} failed, ran the full suite: {s['failed']}"]
+    share = s["selected"] / s["total"] if s["total"] else 0.0
+    return [f"impact selection vs {s['base']}: {s['selected']} of {s['total']} tests ({share:.0%}) for {s['changed']} changed files"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default=IMPACT_BASE or "origin/main", help="git ref to diff against")
+    parser.add_argument("files", nargs="*", help="changed files (default: git diff against --base)")
+    args = parser.parse_args(argv)
+
+    changed = args.files or changed_files(args.base)
+    coverage = load_map()
+    if not coverage:
+        print(f"No coverage recorded yet in {IMPACT_MAP_FILE}; run the suite once first.")
+    selected, reasons = select(sorted(coverage), changed, coverage)
+    impact = affected(changed)
+    print(f"{len(changed)} changed files, {len(selected)} of {len(coverage)} recorded tests affected")
+    if impact["all"]:
+        print(f"  everything: {impact['all']}")
+    for nodeid in selected:
+        print(f"  {nodeid}  ({reasons[nodeid]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
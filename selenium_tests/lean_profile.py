@@ -0,0 +1,155 @@
+"""Lean browser profile: functional tests skip downloads they never look at.
+
+Tests marked ``@pytest.mark.lean`` (or every test without ``@pytest.mark.full_profile``
+when ``LEAN_BROWSER=all``) get CDP ``Network.setBlockedURLs`` for the resource classes in
+``LEAN_BLOCK``:
+
+- ``images``: cover art from images.unsplash.com, album art, the GIF logo
+- ``fonts``: web fonts
+- ``third_party``: the ChatBot's openrouter.ai call
+
+Patterns match the end of the URL, so Vite's ``logo.gif?import`` module requests, app
+JS/CSS and ``/api/v1`` pass untouched. Timed tests are marked ``full_profile`` and keep
+everything, so their numbers stay comparable.
+
+Blocked requests show up in the network tracker with ``blocked_reason="inspector"``.
+Full-profile tests record the size and download time of every URL a lean test would have
+blocked (``.artifacts/lean_sizes.json``), and lean tests add those up as bytes and time saved.
+"""
+import json
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+from selenium.common.exceptions import WebDriverException
+
+from selenium_tests.ui_helpers import ARTIFACTS_DIR
+
+
+# "0": never; "1": tests marked lean; "all": every test not marked full_profile
+LEAN_BROWSER = os.getenv("LEAN_BROWSER", "1").lower()
+LEAN_BLOCK = os.getenv("LEAN_BLOCK", "images,fonts,third_party")
+# Extra comma-separated CDP URL patterns to block
+LEAN_EXTRA_PATTERNS = os.getenv("LEAN_EXTRA_PATTERNS", "")
+LEAN_SIZES_FILE = os.getenv("LEAN_SIZES_FILE", os.path.join(ARTIFACTS_DIR, "lean_sizes.json"))
+
+BLOCK_CLASSES = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif",
+        "*://images.unsplash.com/*",
+    ],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*://fonts.googleapis.com/*", "*://fonts.gstatic.com/*"],
+    "third_party": ["*://openrouter.ai/*"],
+    # Not blocked by default: the player tests need audio
+    "media": ["*.mp3", "*.wav", "*.ogg", "*.m4a"],
+}
+
+
+@dataclass
+class LeanStats:
+    nodeid: str
+    blocked: int = 0
+    # Sizes/times learned from full-profile runs; URLs never seen unblocked count as 0
+    bytes_saved: int = 0
+    ms_saved: float = 0.0
+    unknown: int = 0
+
+
+_STATS = []
+_SIZES = None
+
+
+def block_patterns(classes: str = LEAN_BLOCK, extra: str = LEAN_EXTRA_PATTERNS) -> list:
+    patterns = []
+    for name in (c.strip() for c in classes.split(",")):
+        if not name:
+            continue
+        if name not in BLOCK_CLASSES:
+            raise ValueError(f"unknown LEAN_BLOCK class {name!r}; known: {', '.join(BLOCK_CLASSES)}")
+        patterns.extend(BLOCK_CLASSES[name])
+    patterns.extend(p.strip() for p in extra.split(",") if p.strip())
+    return patterns
+
+
+def wants_lean(item) -> bool:
+    if LEAN_BROWSER in ("0", "false", "False") or item.get_closest_marker("full_profile"):
+        return False
+    return LEAN_BROWSER == "all" or item.get_closest_marker("lean") is not None
+
+
+def apply(browser, patterns: list) -> None:
+    """Block ``patterns`` in the driver's current tab (kept across navigations)."""
+    browser.execute_cdp_cmd("Network.enable", {})
+    browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def clear(browser) -> None:
+    try:
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+    except WebDriverException:
+        pass
+
+
+def is_blockable(url: str, patterns: list) -> bool:
+    return any(fnmatchcase(url, p) for p in patterns)
+
+
+def _sizes() -> dict:
+    global _SIZES
+    if _SIZES is None:
+        try:
+            with open(LEAN_SIZES_FILE, "r", encoding="utf-8") as f:
+                _SIZES = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _SIZES = {}
+    return _SIZES
+
+
+def account(nodeid: str, records: list, lean: bool, patterns: list) -> LeanStats | None:
+    """Lean test: add up what its blocked requests would have cost. Full test: learn those costs."""
+    sizes = _sizes()
+    if not lean:
+        for r in records:
+            if r.done and not r.failed and not r.from_cache and r.encoded_bytes and is_blockable(r.url, patterns):
+                sizes[r.url] = [r.encoded_bytes, round(r.duration_ms or 0.0, 1)]
+        return None
+    stats = LeanStats(nodeid)
+    for r in records:
+        if r.blocked_reason != "inspector":
+            continue
+        stats.blocked += 1
+        known = sizes.get(r.url)
+        if known is None:
+            stats.unknown += 1
+            continue
+        stats.bytes_saved += known[0]
+        stats.ms_saved += known[1]
+    _STATS.append(stats)
+    return stats
+
+
+def save_sizes(path: str = LEAN_SIZES_FILE) -> None:
+    if not _SIZES:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_SIZES, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def summary_lines() -> list:
+    lines = []
+    for s in sorted(_STATS, key=lambda s: -s.bytes_saved):
+        if not s.blocked:
+            continue
+        unknown = f", {s.unknown} never seen unblocked" if s.unknown else ""
+        lines.append(
+            f"{s.nodeid}: {s.blocked} requests blocked, {s.bytes_saved / 1024:.0f} KB "
+            f"and {s.ms_saved / 1000:.1f}s of download time saved{unknown}"
+        )
+    if lines:
+        total_kb = sum(s.bytes_saved for s in _STATS) / 1024
+        total_s = sum(s.ms_saved for s in _STATS) / 1000
+        lines.append(f"lean profile total: {total_kb:.0f} KB, {total_s:.1f}s of downloads over {len(_STATS)} tests")
+    return lines
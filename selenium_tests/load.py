@@ -0,0 +1,526 @@
+"""API load generator: the UI tests' journeys as plain HTTP, for many concurrent users.
+
+Each virtual user logs in and then loops over weighted journeys taken from the browser
+tests:
+
+- ``browse``  : me, feed (two pages), a playlist and its comments (test_feed_performance)
+- ``search``  : /songs/all, then songs/users/playlists search, two pages each
+  (test_search_functionality)
+- ``curate``  : create a playlist, like, comment, read it back, unlike, delete the comment
+  and the playlist (test_playlist_actions)
+- ``social``  : find a user, open the profile, follow, list followers, unfollow
+  (test_follow_unfollow_flow)
+
+Every endpoint a journey calls is looked up in ``api-docs.json``. Its query parameters and
+their defaults come from there, and so does its pagination style: ``skip``/``limit`` for
+playlists and ``limit``/``offset`` for search. A journey that calls an undocumented
+endpoint fails at once.
+
+Requests go out over a pool of keep-alive connections (asyncio streams, no extra
+dependency) shared by all users. The load steps up through ``LOAD_STEPS`` concurrent users.
+Each step prints requests per second and latency percentiles per endpoint and appends them
+to ``.artifacts/load.jsonl``.
+
+    python -m selenium_tests.load --steps 10,100,1000 --step-s 30 --base-url http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import quote, urlencode, urlsplit
+
+from selenium_tests.api_client import API_PREFIX, BASE_URL
+from selenium_tests.parallel import parse_accounts
+from selenium_tests.perf import RUN_ID, percentile
+from selenium_tests.resources import unique_name
+from selenium_tests.ui_helpers import ARTIFACTS_DIR
+
+
+API_DOCS = os.getenv(
+    "API_DOCS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api-docs.json"),
+)
+LOAD_BASE_URL = os.getenv("LOAD_BASE_URL", BASE_URL)
+LOAD_STEPS = os.getenv("LOAD_STEPS", "10,50,100,500,1000")
+LOAD_STEP_S = float(os.getenv("LOAD_STEP_S", "30"))
+# Users start spread over this many seconds instead of all logging in at once
+LOAD_RAMP_S = float(os.getenv("LOAD_RAMP_S", "5"))
+LOAD_CONNECTIONS = int(os.getenv("LOAD_CONNECTIONS", "200"))
+LOAD_MIX = os.getenv("LOAD_MIX", "browse=4,search=3,curate=2,social=1")
+# Journeys per login; afterwards the user logs in again like a new session
+LOAD_SESSION_JOURNEYS = int(os.getenv("LOAD_SESSION_JOURNEYS", "5"))
+# Pause between journeys, seconds (uniform 0..N)
+LOAD_THINK_S = float(os.getenv("LOAD_THINK_S", "0.5"))
+LOAD_TIMEOUT_S = float(os.getenv("LOAD_TIMEOUT_S", "30"))
+LOAD_SEARCH_TERMS = os.getenv("LOAD_SEARCH_TERMS", "Pop,Rock,a,lo")
+LOAD_FOLLOW_QUERY = os.getenv("LOAD_FOLLOW_QUERY", "lura")
+LOAD_OUTPUT = os.getenv("LOAD_OUTPUT", os.path.join(ARTIFACTS_DIR, "load.jsonl"))
+
+
+class LoadError(Exception):
+    """A journey step got a non-2xx response or no response at all."""
+
+
+# --- api-docs.json -------------------------------------------------------------
+@dataclass
+class Operation:
+    method: str
+    path: str
+    # query parameter -> documented default (None if required / no default)
+    query: dict = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+    @property
+    def pagination(self) -> str | None:
+        """Name of the offset parameter: "skip" (with limit) or "offset" (with limit)."""
+        for key in ("skip", "offset"):
+            if key in self.query and "limit" in self.query:
+                return key
+        return None
+
+
+class ApiSpec:
+    """The documented operations, used to build request URLs."""
+
+    def __init__(self, path: str = API_DOCS):
+        with open(path, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        self.operations = {}
+        for route, ops in docs["paths"].items():
+            for method, op in ops.items():
+                query = {
+                    p["name"]: p.get("schema", {}).get("default")
+                    for p in op.get("parameters", [])
+                    if p.get("in") == "query"
+                }
+                self.operations[(method.upper(), route)] = Operation(method.upper(), route, query)
+
+    def operation(self, method: str, route: str) -> Operation:
+        try:
+            return self.operations[(method, f"{API_PREFIX}{route}")]
+        except KeyError:
+            raise ValueError(f"{method} {API_PREFIX}{route} is not in api-docs.json") from None
+
+    def url(self, method: str, route: str, page: int = 0, **params) -> tuple:
+        """(operation, request path) for ``route`` with path/query params; ``page`` paginates."""
+        op = self.operation(method, route)
+        path_params = {k: quote(str(v), safe="") for k, v in params.items() if "{" + k + "}" in route}
+        query = {k: v for k, v in op.query.items() if v is not None}
+        query.update({k: v for k, v in params.items() if k not in path_params})
+        unknown = set(query) - set(op.query)
+        if unknown:
+            raise ValueError(f"{op.name} has no query parameters {sorted(unknown)}")
+        if op.pagination:
+            query[op.pagination] = page * int(query["limit"])
+        path = op.path.format(**path_params)
+        return op, f"{path}?{urlencode(query)}" if query else path
+
+
+# --- HTTP over asyncio streams -------------------------------------------------
+class _StaleConnection(ConnectionResetError):
+    """The connection was closed before a single byte of the response arrived."""
+
+
+class HttpPool:
+    """Keep-alive HTTP/1.1 connections to one origin, at most ``size`` open at a time."""
+
+    def __init__(self, base_url: str, size: int = LOAD_CONNECTIONS, timeout: float = LOAD_TIMEOUT_S):
+        parts = urlsplit(base_url)
+        self.secure = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.secure else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context() if self.secure else None
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def request(self, method: str, path: str, body=None, token: str | None = None) -> tuple:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        head = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(data)}",
+        ]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        if token:
+            head.append(f"Authorization: Bearer {token}")
+        raw = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                conn = self._idle.pop() if reused else await self._open()
+                try:
+                    status, payload, keep = await asyncio.wait_for(self._roundtrip(conn, raw, method), self.timeout)
+                except _StaleConnection:
+                    conn[1].close()
+                    # The server closed an idle connection before reading the request: try the next one
+                    if reused:
+                        continue
+                    raise
+                except (OSError, asyncio.IncompleteReadError, ValueError, asyncio.TimeoutError):
+                    # The request may have reached the server: sending it again could repeat a POST
+                    conn[1].close()
+                    raise
+                if keep:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                return status, payload
+
+    @staticmethod
+    async def _roundtrip(conn, raw: bytes, method: str) -> tuple:
+        reader, writer = conn
+        try:
+            writer.write(raw)
+            await writer.drain()
+            status_line = await reader.readuntil(b"\r\n")
+        except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+            if isinstance(e, asyncio.IncompleteReadError) and e.partial:
+                raise
+            raise _StaleConnection(str(e)) from e
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep = headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            payload = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            payload = b"".join(chunks)
+        elif "content-length" in headers:
+            payload = await reader.readexactly(int(headers["content-length"]))
+        else:
+            payload = await reader.read()
+            keep = False
+        return status, payload, keep
+
+    async def close(self) -> None:
+        for _reader, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+# --- virtual users -------------------------------------------------------------
+@dataclass
+class EndpointStats:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class StepResult:
+    users: int
+    elapsed_s: float = 0.0
+    endpoints: dict = field(default_factory=dict)
+    journeys: Counter = field(default_factory=Counter)
+    journey_failures: Counter = field(default_factory=Counter)
+    connections: int = 0
+
+    def stats(self, name: str) -> EndpointStats:
+        return self.endpoints.setdefault(name, EndpointStats())
+
+    @property
+    def requests(self) -> int:
+        return sum(len(s.latencies) + s.errors for s in self.endpoints.values())
+
+    @property
+    def error_rate(self) -> float:
+        errors = sum(s.errors for s in self.endpoints.values())
+        return errors / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": RUN_ID,
+            "timestamp": time.time(),
+            "users": self.users,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "requests": self.requests,
+            "rps": round(self.requests / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "error_rate": round(self.error_rate, 4),
+            "connections": self.connections,
+            "journeys": dict(self.journeys),
+            "journey_failures": dict(self.journey_failures),
+            "endpoints": {
+                name: {
+                    "n": len(s.latencies),
+                    "errors": s.errors,
+                    "rps": round(len(s.latencies) / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+                    "p50_ms": round(percentile(s.latencies, 50) * 1000, 1) if s.latencies else None,
+                    "p90_ms": round(percentile(s.latencies, 90) * 1000, 1) if s.latencies else None,
+                    "p99_ms": round(percentile(s.latencies, 99) * 1000, 1) if s.latencies else None,
+                    "statuses": {str(k): v for k, v in s.statuses.items()},
+                }
+                for name, s in sorted(self.endpoints.items())
+            },
+        }
+
+    def summary_lines(self) -> list:
+        data = self.to_dict()
+        lines = [
+            f"{self.users} users: {data['requests']} requests in {self.elapsed_s:.1f}s = {data['rps']:.1f} req/s, "
+            f"{self.error_rate:.2%} errors, {self.connections} connections opened"
+        ]
+        for name, s in data["endpoints"].items():
+            if s["n"]:
+                lines.append(
+                    f"  {name:<48} {s['rps']:>8.1f}/s  p50={s['p50_ms']:>7.1f}ms "
+                    f"p90={s['p90_ms']:>7.1f}ms p99={s['p99_ms']:>7.1f}ms  errors={s['errors']}"
+                )
+            else:
+                lines.append(f"  {name:<48} no responses, errors={s['errors']}")
+        failures = ", ".join(f"{k}={v}" for k, v in sorted(self.journey_failures.items()))
+        if failures:
+            lines.append(f"  failed journeys: {failures}")
+        return lines
+
+
+class VirtualUser:
+    def __init__(self, uid: int, pool: HttpPool, spec: ApiSpec, result: StepResult, account: tuple, rng):
+        self.uid = uid
+        self.pool = pool
+        self.spec = spec
+        self.result = result
+        self.email, self.password = account
+        self.rng = rng
+        self.token = None
+        self.username = None
+
+    async def call(self, method: str, route: str, body=None, page: int = 0, **params):
+        op, path = self.spec.url(method, route, page=page, **params)
+        stats = self.result.stats(op.name)
+        start = time.perf_counter()
+        try:
+            status, payload = await self.pool.request(method, path, body, self.token)
+        except (OSError, asyncio.IncompleteReadError, ValueError, asyncio.TimeoutError) as e:
+            stats.errors += 1
+            stats.statuses[type(e).__name__] += 1
+            raise LoadError(f"{op.name}: {e!r}") from e
+        stats.latencies.append(time.perf_counter() - start)
+        stats.statuses[status] += 1
+        if status >= 400:
+            stats.errors += 1
+            raise LoadError(f"{op.name} -> {status}")
+        try:
+            return json.loads(payload) if payload else None
+        except ValueError as e:
+            raise LoadError(f"{op.name}: invalid JSON") from e
+
+    async def login(self) -> None:
+        data = await self.call("POST", "/auth/login", {"email": self.email, "password": self.password})
+        self.token = data["access_token"]
+        self.username = (await self.call("GET", "/users/me"))["username"]
+
+    def term(self) -> str:
+        return self.rng.choice([t for t in LOAD_SEARCH_TERMS.split(",") if t])
+
+
+async def browse(vu: VirtualUser) -> None:
+    await vu.call("GET", "/users/me")
+    feed = await vu.call("GET", "/playlists/feed") or []
+    await vu.call("GET", "/playlists/feed", page=1)
+    if feed:
+        playlist_id = vu.rng.choice(feed)["id"]
+        await vu.call("GET", "/playlists/{playlist_id}", playlist_id=playlist_id)
+        await vu.call("GET", "/playlists/{playlist_id}/comments", playlist_id=playlist_id)
+
+
+async def search(vu: VirtualUser) -> None:
+    term = vu.term()
+    await vu.call("GET", "/songs/all", query=term)
+    for route in ("/songs/search", "/songs/users/search", "/songs/playlists/search"):
+        for page in range(2):
+            await vu.call("GET", route, page=page, query=term)
+
+
+async def curate(vu: VirtualUser) -> None:
+    found = await vu.call("GET", "/songs/all", query=vu.term(), type="songs")
+    song_ids = [item["song"]["id"] for item in (found or {}).get("songs", [])][:3]
+    playlist = await vu.call("POST", "/playlists/", {"title": unique_name("load"), "song_ids": song_ids})
+    playlist_id = playlist["id"]
+    try:
+        await vu.call("POST", "/playlists/{playlist_id}/like", playlist_id=playlist_id)
+        comment = await vu.call(
+            "POST",
+            "/playlists/{playlist_id}/comments",
+            {"body": unique_name("load-comment"), "playlist_id": playlist_id},
+            playlist_id=playlist_id,
+        )
+        await vu.call("GET", "/playlists/{playlist_id}", playlist_id=playlist_id)
+        await vu.call("DELETE", "/playlists/{playlist_id}/like", playlist_id=playlist_id)
+        await vu.call("DELETE", "/playlists/comments/{comment_id}", comment_id=comment["id"])
+    finally:
+        # Like the resources fixture: never leave load data in the account
+        await vu.call("DELETE", "/playlists/{playlist_id}", playlist_id=playlist_id)
+
+
+async def social(vu: VirtualUser) -> None:
+    found = await vu.call("GET", "/songs/users/search", query=LOAD_FOLLOW_QUERY)
+    users = [item.get("user", item) for item in (found or {}).get("users", [])]
+    others = [u["username"] for u in users if u.get("username") and u["username"] != vu.username]
+    if not others:
+        return
+    username = vu.rng.choice(others)
+    await vu.call("GET", "/users/{username}", username=username)
+    await vu.call("POST", "/users/{username}/follow", username=username)
+    try:
+        await vu.call("GET", "/users/{username}/followers", username=username)
+    finally:
+        await vu.call("DELETE", "/users/{username}/follow", username=username)
+
+
+JOURNEYS = {"browse": browse, "search": search, "curate": curate, "social": social}
+
+
+def parse_mix(raw: str) -> dict:
+    """Parse "browse=4,search=3" into journey weights."""
+    mix = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            name, weight = item.split("=", 1)
+            if name.strip() not in JOURNEYS:
+                raise ValueError(f"unknown journey {name.strip()!r}; known: {', '.join(JOURNEYS)}")
+            mix[name.strip()] = float(weight)
+    return mix or {name: 1.0 for name in JOURNEYS}
+
+
+async def _user_loop(vu: VirtualUser, mix: dict, deadline: float, start_delay: float) -> None:
+    await asyncio.sleep(start_delay)
+    names, weights = list(mix), list(mix.values())
+    journeys_left = 0
+    while time.perf_counter() < deadline:
+        name = "login"
+        try:
+            if journeys_left <= 0:
+                await vu.login()
+                journeys_left = LOAD_SESSION_JOURNEYS
+            name = vu.rng.choices(names, weights)[0]
+            await JOURNEYS[name](vu)
+            vu.result.journeys[name] += 1
+        # KeyError/TypeError: a response without the fields the journey reads next
+        except (LoadError, KeyError, TypeError) as e:
+            vu.result.journey_failures[name] += 1
+            if isinstance(e, LoadError) and name == "login":
+                await asyncio.sleep(1.0)
+        journeys_left -= 1
+        if LOAD_THINK_S:
+            await asyncio.sleep(vu.rng.uniform(0, LOAD_THINK_S))
+
+
+async def run_step(
+    base_url: str,
+    users: int,
+    duration_s: float,
+    accounts: list,
+    mix: dict,
+    spec: ApiSpec | None = None,
+    connections: int = LOAD_CONNECTIONS,
+    ramp_s: float = LOAD_RAMP_S,
+    seed: int = 0,
+) -> StepResult:
+    """Run ``users`` virtual users for ``duration_s`` seconds against ``base_url``."""
+    spec = spec or ApiSpec()
+    pool = HttpPool(base_url, size=connections)
+    result = StepResult(users)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + duration_s
+    vus = [
+        VirtualUser(i, pool, spec, result, accounts[i % len(accounts)], random.Random(rng.random()))
+        for i in range(users)
+    ]
+    ramp = min(ramp_s, duration_s / 3)
+    try:
+        await asyncio.gather(*(_user_loop(vu, mix, deadline, ramp * vu.uid / max(1, users)) for vu in vus))
+    finally:
+        await pool.close()
+    result.elapsed_s = time.perf_counter() - start
+    result.connections = pool.opened
+    return result
+
+
+def run_load(
+    base_url: str = LOAD_BASE_URL,
+    steps: list | None = None,
+    step_s: float = LOAD_STEP_S,
+    accounts: list | None = None,
+    mix: dict | None = None,
+    output: str | None = LOAD_OUTPUT,
+    log=print,
+) -> list:
+    """Run every concurrency step in turn; each step's result is logged and appended to ``output``."""
+    steps = steps or [int(s) for s in LOAD_STEPS.split(",") if s.strip()]
+    accounts = accounts or env_accounts()
+    mix = mix or parse_mix(LOAD_MIX)
+    spec = ApiSpec()
+    results = []
+    for users in steps:
+        result = asyncio.run(run_step(base_url, users, step_s, accounts, mix, spec))
+        results.append(result)
+        for line in result.summary_lines():
+            log(line)
+        if output:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            with open(output, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result.to_dict()) + "\n")
+    return results
+
+
+def env_accounts() -> list:
+    """TEST_ACCOUNTS plus TEST_EMAIL/TEST_PASSWORD; virtual users share them round-robin."""
+    accounts = parse_accounts(os.getenv("TEST_ACCOUNTS"))
+    if os.getenv("TEST_EMAIL") and os.getenv("TEST_PASSWORD"):
+        accounts.append((os.environ["TEST_EMAIL"], os.environ["TEST_PASSWORD"]))
+    if not accounts:
+        raise AssertionError("Load mode needs TEST_EMAIL/TEST_PASSWORD or TEST_ACCOUNTS.")
+    return accounts
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=LOAD_BASE_URL, help="origin serving /api/v1 (Vite or the API itself)")
+    parser.add_argument("--steps", default=LOAD_STEPS, help="concurrent users per step, e.g. 10,100,1000")
+    parser.add_argument("--step-s", type=float, default=LOAD_STEP_S)
+    parser.add_argument("--mix", default=LOAD_MIX)
+    parser.add_argument("--output", default=LOAD_OUTPUT)
+    args = parser.parse_args(argv)
+    run_load(
+        args.base_url,
+        [int(s) for s in args.steps.split(",") if s.strip()],
+        args.step_s,
+        mix=parse_mix(args.mix),
+        output=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Locators for the SoundPuff pages, one namespace per page.
+
+Locators are ``(By, value)`` tuples that can be passed straight to ``find_element``,
+``EC.*`` conditions or ``Probe``. They prefer ids, ``data-testid`` hooks and other
+attributes over text matching: CSS lookups use the browser's selector index, while
+``contains(normalize-space(), ...)`` XPaths walk and normalise the text of every
+candidate node. XPath is only used where an element can only be told apart by its
+text (menu items, dynamic titles).
+
+Locators that depend on a value (a playlist title, a comment) are built by functions
+that cache their result, so repeated lookups in a polling loop don't rebuild strings.
+"""
+from functools import lru_cache
+
+from selenium.webdriver.common.by import By
+
+
+def css(selector: str) -> tuple:
+    return (By.CSS_SELECTOR, selector)
+
+
+def xpath(expression: str) -> tuple:
+    return (By.XPATH, expression)
+
+
+def testid(name: str) -> tuple:
+    return css(f"[data-testid='{name}']")
+
+
+@lru_cache(maxsize=1024)
+def xpath_literal(s: str) -> str:
+    """Return a safe XPath string literal for arbitrary text."""
+    if "'" not in s:
+        return f"'{s}'"
+    if '"' not in s:
+        return f'"{s}"'
+    # concat('foo', "'", 'bar')
+    parts = s.split("'")
+    return "concat(" + ", \"'\", ".join([f"'{p}'" for p in parts]) + ")"
+
+
+@lru_cache(maxsize=1024)
+def css_literal(s: str) -> str:
+    """Return a double-quoted CSS string literal for arbitrary text."""
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\a ") + '"'
+
+
+@lru_cache(maxsize=1024)
+def button_with_text(text: str) -> tuple:
+    return xpath(f"//button[normalize-space()={xpath_literal(text)}]")
+
+
+class Auth:
+    EMAIL = (By.ID, "login-email")
+    PASSWORD = (By.ID, "login-password")
+    SUBMIT = css("form:has(#login-email) button[type='submit']")
+    ERROR = css("[data-slot='alert'][role='alert']")
+
+
+class Landing:
+    HEADING = testid("landing-heading")
+
+
+class Home:
+    FEED = testid("feed")
+    FEED_HEADING = testid("feed-heading")
+    FEED_CARD_TITLE = css("[data-testid='feed'] h3")
+    CARD_TITLE = css("h3")
+    PLAY_NOW = xpath("//button[contains(normalize-space(), 'Play Now')]")
+
+
+class Library:
+    HEADING = testid("library-heading")
+    CARD_TITLE = css("h3[title]")
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def playlist_title(title: str) -> tuple:
+        return css(f"h3[title={css_literal(title)}]")
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def playlist_title_text(title: str) -> tuple:
+        # Fallback for cards that don't set the title attribute
+        return xpath(f"//h3[normalize-space()={xpath_literal(title)}]")
+
+
+class CreatePlaylist:
+    TITLE = (By.ID, "title")
+    DESCRIPTION = (By.ID, "description")
+    SONG_SEARCH = css("input[placeholder='Search songs...']")
+    SONG_CHECKBOX = css("[data-slot='checkbox']")
+    SELECTED_COUNT = testid("selected-count")
+    SUBMIT = css("form button[type='submit']")
+
+
+class Playlist:
+    ACTIONS = testid("playlist-actions")
+    LIKE = testid("playlist-like")
+    LIKES = testid("playlist-likes")
+    DELETE = testid("playlist-delete")
+    SONG_ROW = testid("song-row")
+    SONG_MENU = css("button[aria-label='Open song menu']")
+    ADD_TO_ANOTHER = button_with_text("Add to another playlist")
+    COMMENT_INPUT = css("input[placeholder='Add a comment...']")
+    COMMENT_SUBMIT = css("form:has(input[placeholder='Add a comment...']) button[type='submit']")
+    COMMENT = testid("comment")
+    # Relative to a COMMENT element
+    COMMENT_LIKE = css("button[aria-label='Like comment']")
+    COMMENT_LIKES = css("button[aria-label='Like comment'] + span")
+    COMMENT_MENU = css("button[aria-label='Open comment menu']")
+    COMMENT_DELETE = xpath(".//button[normalize-space()='Delete']")
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def comment_text(text: str) -> tuple:
+        return xpath(f"//p[normalize-space()={xpath_literal(text)}]")
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def comment_with_text(text: str) -> tuple:
+        return xpath(f"//*[@data-testid='comment'][.//p[normalize-space()={xpath_literal(text)}]]")
+
+
+class AddToPlaylistModal:
+    @staticmethod
+    def target(title: str) -> tuple:
+        return button_with_text(title)
+
+
+class Search:
+    INPUT = css("input[placeholder='Search for songs, playlists, or users...']")
+    SONGS_HEADING = xpath("//h2[contains(text(), 'Songs')]")
+    RESULTS_HEADING = xpath("//h2[contains(text(), 'Songs')] | //h2[contains(text(), 'Users')]")
+    USER_CARD = testid("user-card")
+    USER_CARD_LINK = css("[data-testid='user-card'] img, [data-testid='user-card'] .cursor-pointer")
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def tab(value: str) -> tuple:
+        # Radix tab triggers get id "<base>-trigger-<value>"
+        return css(f"[role='tab'][id$='-trigger-{value.lower()}']")
+
+
+class Profile:
+    EDIT = testid("edit-profile")
+    FOLLOW = testid("follow-button")
+
+
+class PlayerBar:
+    ROOT = testid("player-bar")
+    TOGGLE = testid("player-toggle")
+    PAUSE = css("[data-testid='player-toggle'][aria-label='Pause']")
+    PLAY = css("[data-testid='player-toggle'][aria-label='Play']")
+    NEXT = testid("player-next")
+    PREVIOUS = testid("player-previous")
+    SEEK = testid("player-seek")
+
+
+# Every static locator, keyed "Page.NAME" (used by the selector benchmark)
+REGISTRY = {
+    f"{page.__name__}.{name}": value
+    for page in (Auth, Landing, Home, Library, CreatePlaylist, Playlist, Search, Profile, PlayerBar)
+    for name, value in vars(page).items()
+    if name.isupper() and isinstance(value, tuple)
+}
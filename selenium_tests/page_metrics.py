@@ -0,0 +1,246 @@
+import json
+import os
+import re
+import statistics
+
+from selenium import webdriver
+
+from selenium_tests.ui_helpers import ARTIFACTS_DIR
+
+
+# Harvest Navigation/Resource Timing and Web Vitals for every page visit (PAGE_METRICS=0 disables)
+PAGE_METRICS = os.getenv("PAGE_METRICS", "1") in ("1", "true", "True")
+PAGE_METRICS_OUTPUT = os.getenv("PAGE_METRICS_OUTPUT", os.path.join(ARTIFACTS_DIR, "page_metrics.jsonl"))
+
+# Collapse ids in SPA paths so visits aggregate per route
+_ROUTE_PATTERNS = [
+    (re.compile(r"^/app/(playlist|edit-playlist)/[^/]+"), r"/app/\1/*"),
+    (re.compile(r"^/app/user/[^/]+"), "/app/user/*"),
+]
+
+# Installed into every new document. Each hard load or SPA route change opens a "visit";
+# paint, LCP, layout-shift, long-task and resource entries are attributed to the visit
+# they happened in. LCP/FCP only exist for the initial load of a document.
+_VITALS_JS = r"""
+(() => {
+  if (window.__spVitals || !/^https?:$/.test(location.protocol)) return;
+  const v = window.__spVitals = { visits: [] };
+  let current = null;
+  const startVisit = (kind) => {
+    current = {
+      route: location.pathname, kind: kind, start: performance.now(),
+      fcp: null, lcp: null, cls: 0, long_tasks: 0, long_task_ms: 0,
+      resources: 0, transfer_bytes: 0, api_requests: 0, dom_settled_ms: null,
+    };
+    v.visits.push(current);
+  };
+  startVisit('load');
+  const visitAt = (t) => {
+    for (let i = v.visits.length - 1; i >= 0; i--) if (v.visits[i].start <= t) return v.visits[i];
+    return v.visits[0];
+  };
+  const observe = (type, cb) => {
+    try { new PerformanceObserver((list) => list.getEntries().forEach(cb)).observe({ type: type, buffered: true }); }
+    catch (e) {}
+  };
+  observe('paint', (e) => { if (e.name === 'first-contentful-paint') v.visits[0].fcp = e.startTime; });
+  observe('largest-contentful-paint', (e) => { v.visits[0].lcp = e.startTime; });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) visitAt(e.startTime).cls += e.value; });
+  observe('longtask', (e) => { const x = visitAt(e.startTime); x.long_tasks++; x.long_task_ms += e.duration; });
+  observe('resource', (e) => {
+    const x = visitAt(e.startTime);
+    x.resources++; x.transfer_bytes += e.transferSize || 0;
+    if (e.name.indexOf('/api/v1') !== -1) x.api_requests++;
+  });
+  for (const name of ['pushState', 'replaceState']) {
+    const orig = history[name];
+    history[name] = function () {
+      const before = location.pathname;
+      const r = orig.apply(this, arguments);
+      if (location.pathname !== before) startVisit('spa');
+      return r;
+    };
+  }
+  window.addEventListener('popstate', () => startVisit('spa'));
+  new MutationObserver(() => { current.dom_settled_ms = performance.now() - current.start; })
+    .observe(document, { childList: true, subtree: true });
+})();
+"""
+
+_HARVEST_JS = r"""
+const v = window.__spVitals;
+if (!v) return null;
+const nav = performance.getEntriesByType('navigation')[0];
+return {
+  origin: performance.timeOrigin,
+  visits: v.visits,
+  navigation: nav ? {
+    ttfb: nav.responseStart, dom_interactive: nav.domInteractive,
+    dom_content_loaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd,
+    transfer_bytes: nav.transferSize,
+  } : null,
+};
+"""
+
+# Scrolls the page's main scroll container one step per animation frame and records the
+# frame intervals; frames over 1.5x the median interval count as dropped.
+_SCROLL_JS = r"""
+const stepPx = arguments[0], maxFrames = arguments[1], done = arguments[arguments.length - 1];
+const candidates = [document.scrollingElement].concat(Array.from(document.querySelectorAll('*')).filter((el) => {
+  const style = getComputedStyle(el);
+  return /(auto|scroll)/.test(style.overflowY) && el.scrollHeight > el.clientHeight;
+}));
+const scroller = candidates.reduce((a, b) => (b.scrollHeight - b.clientHeight > a.scrollHeight - a.clientHeight ? b : a));
+scroller.scrollTop = 0;
+const deltas = [];
+let last = null, frames = 0;
+const tick = (t) => {
+  if (last !== null) deltas.push(t - last);
+  last = t;
+  const atEnd = scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - 1;
+  if (atEnd || frames++ >= maxFrames) {
+    const sorted = deltas.slice().sort((a, b) => a - b);
+    const pick = (p) => sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))] : null;
+    const median = pick(0.5);
+    done({
+      frames: deltas.length, scroll_px: scroller.scrollTop, scroll_height: scroller.scrollHeight,
+      frame_p50_ms: median, frame_p95_ms: pick(0.95), frame_max_ms: sorted.length ? sorted[sorted.length - 1] : null,
+      dropped: median ? deltas.filter((d) => d > median * 1.5).length : 0,
+    });
+    return;
+  }
+  scroller.scrollTop += stepPx;
+  requestAnimationFrame(tick);
+};
+requestAnimationFrame(tick);
+"""
+
+# (nodeid, visit) for every visit in the session, for the per-route summary
+_SESSION_VISITS = []
+
+
+def route_key(path: str) -> str:
+    for pattern, repl in _ROUTE_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(repl, path, count=1)
+    return path
+
+
+def install_page_metrics(browser) -> None:
+    browser.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _VITALS_JS})
+
+
+def runtime_metrics(browser) -> dict:
+    """Chrome's Performance-domain counters for the current page (JSHeapUsedSize, Nodes, ...)."""
+    browser.execute_cdp_cmd("Performance.enable", {})
+    data = browser.execute_cdp_cmd("Performance.getMetrics", {})
+    return {m["name"]: m["value"] for m in data.get("metrics", [])}
+
+
+def scroll_frame_timings(browser, step_px: int = 120, max_frames: int = 600) -> dict:
+    """Scroll the main scroll container to the bottom, one step per frame, and report frame timings."""
+    return browser.execute_async_script(_SCROLL_JS, step_px, max_frames)
+
+
+class PageMetricsRecorder:
+    """Collects the visits of one test; later harvests of the same document overwrite earlier ones."""
+
+    def __init__(self):
+        self._visits = {}
+
+    def collect(self, browser) -> None:
+        data = browser.execute_script(_HARVEST_JS)
+        if not data:
+            return
+        for i, visit in enumerate(data["visits"]):
+            visit = dict(visit)
+            visit["route"] = route_key(visit["route"])
+            if i == 0 and data.get("navigation"):
+                visit["navigation"] = data["navigation"]
+            self._visits[(data["origin"], i)] = visit
+
+    @property
+    def visits(self) -> list:
+        return [self._visits[k] for k in sorted(self._visits)]
+
+
+class InstrumentedChrome(webdriver.Chrome):
+    """Chrome driver that harvests page metrics before navigating away from a page.
+
+    ``page_metrics`` is set by the ``browser`` fixture for the duration of a test.
+    """
+
+    page_metrics = None
+
+    def get(self, url):
+        self._harvest()
+        super().get(url)
+
+    def refresh(self):
+        self._harvest()
+        super().refresh()
+
+    def _harvest(self) -> None:
+        if self.page_metrics is None:
+            return
+        try:
+            self.page_metrics.collect(self)
+        except Exception:
+            pass
+
+
+def record_page_metrics(item, recorder: PageMetricsRecorder, path: str = PAGE_METRICS_OUTPUT) -> None:
+    """Attach a test's visits to its report and append them to the metrics file."""
+    visits = recorder.visits
+    if not visits:
+        return
+    item.user_properties.append(("page_metrics", visits))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for visit in visits:
+            f.write(json.dumps({"test": item.nodeid, **visit}) + "\n")
+            _SESSION_VISITS.append((item.nodeid, visit))
+
+
+def route_medians() -> dict:
+    """Per-route medians over the session as numbers (``None`` where a metric never fired)."""
+    by_route = {}
+    for _nodeid, visit in _SESSION_VISITS:
+        by_route.setdefault(visit["route"], []).append(visit)
+
+    def med(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values), 1) if values else None
+
+    medians = {}
+    for route, visits in by_route.items():
+        loads = [v for v in visits if v["kind"] == "load"]
+        medians[route] = {
+            "visits": len(visits),
+            "fcp": med(v["fcp"] for v in loads),
+            "lcp": med(v["lcp"] for v in loads),
+            "settled": med(v["dom_settled_ms"] for v in visits),
+            "long_tasks": med(v["long_task_ms"] for v in visits),
+            "cls": max(v["cls"] for v in visits),
+            "kB": med(v["transfer_bytes"] / 1024 for v in visits),
+        }
+    return medians
+
+
+def route_summary() -> list:
+    """Per-route medians over the session, as printable lines."""
+
+    def fmt(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    lines = []
+    for route, m in sorted(route_medians().items()):
+        lines.append(
+            f"{route:<28} visits={m['visits']:<3} "
+            f"fcp={fmt(m['fcp'])}ms lcp={fmt(m['lcp'])}ms "
+            f"settled={fmt(m['settled'])}ms "
+            f"long_tasks={fmt(m['long_tasks'])}ms "
+            f"cls={m['cls']:.3f} "
+            f"kB={fmt(m['kB'])}"
+        )
+    return lines
@@ -0,0 +1,208 @@
+"""Run the Selenium suite across N workers, sharded by historical test duration.
+
+Usage (from the repo root):
+
+    TEST_ACCOUNTS="a@example.com:pw1,b@example.com:pw2" \\
+        python -m selenium_tests.parallel -n 2 [extra pytest args]
+
+Each worker is a separate pytest process with its own Chrome pool and its own test
+account (TEST_EMAIL/TEST_PASSWORD are overridden per worker), so tests never share
+library contents or like counts. Tests are assigned longest-first to the least
+loaded worker using durations recorded by previous runs.
+"""
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+from selenium_tests.baseline import BASELINE_FILE, load_history as load_baseline, merge_history as merge_baseline
+from selenium_tests.flaky import FLAKE_HISTORY_FILE, load_history, merge_history
+from selenium_tests.impact import IMPACT_MAP_FILE, load_map, merge_map
+
+DURATIONS_FILE = os.getenv(
+    "SELENIUM_DURATIONS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_durations.json"),
+)
+# Used for tests that have never run before
+DEFAULT_TEST_DURATION = 10.0
+# Weight of the newest sample when updating the stored duration
+DURATION_SMOOTHING = 0.5
+
+
+@dataclass
+class Shard:
+    worker: int
+    nodeids: list = field(default_factory=list)
+    expected: float = 0.0
+
+
+def load_durations(path: str = DURATIONS_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_durations(samples: dict, path: str = DURATIONS_FILE) -> None:
+    """Merge new per-test durations into the history file (exponentially smoothed)."""
+    history = load_durations(path)
+    for nodeid, seconds in samples.items():
+        old = history.get(nodeid)
+        if old is None:
+            history[nodeid] = round(seconds, 3)
+        else:
+            history[nodeid] = round(DURATION_SMOOTHING * seconds + (1 - DURATION_SMOOTHING) * old, 3)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def parse_accounts(raw: str | None) -> list:
+    """Parse TEST_ACCOUNTS ("email:password,email:password") into (email, password) pairs."""
+    accounts = []
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ":" not in item:
+            raise ValueError(f"TEST_ACCOUNTS entry {item!r} is not in email:password form")
+        email, password = item.split(":", 1)
+        accounts.append((email.strip(), password.strip()))
+    return accounts
+
+
+def single_worker_features() -> list:
+    """Enabled features whose session fixture binds a fixed port, so only one pytest process can use them."""
+    features = []
+    if os.getenv("STUB_BACKEND", "0") in ("1", "true", "True"):
+        features.append(f"STUB_BACKEND=1 (the stub listens on STUB_PORT={os.getenv('STUB_PORT', '8765')})")
+    if os.getenv("PROD_BUILD", "0") in ("1", "true", "True"):
+        features.append(f"PROD_BUILD=1 (the build is served on BASE_URL={os.getenv('BASE_URL', 'http://localhost:3000')})")
+    if os.getenv("API_CASSETTES"):
+        features.append(f"API_CASSETTES (the proxy listens on CASSETTE_PORT={os.getenv('CASSETTE_PORT', '8766')})")
+    return features
+
+
+def shard_tests(nodeids: list, workers: int, durations: dict) -> list:
+    """Longest-processing-time-first assignment of tests to workers."""
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = sorted(known)[len(known) // 2] if known else DEFAULT_TEST_DURATION
+    costs = {n: durations.get(n, fallback) for n in nodeids}
+
+    shards = [Shard(worker=i) for i in range(workers)]
+    heap = [(0.0, i) for i in range(workers)]
+    for nodeid in sorted(nodeids, key=lambda n: costs[n], reverse=True):
+        load, i = heapq.heappop(heap)
+        shards[i].nodeids.append(nodeid)
+        shards[i].expected = load + costs[nodeid]
+        heapq.heappush(heap, (shards[i].expected, i))
+    return [s for s in shards if s.nodeids]
+
+
+def collect_nodeids(pytest_args: list) -> list:
+    out = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode not in (0, 5):
+        sys.stderr.write(out.stdout + out.stderr)
+        raise SystemExit(out.returncode)
+    return [line.strip() for line in out.stdout.splitlines() if "::" in line]
+
+
+def worker_args(pytest_args: list) -> list:
+    """``pytest_args`` without the test paths: workers get their own node ids instead."""
+    return [arg for arg in pytest_args if arg.startswith("-") or not os.path.exists(arg.split("::")[0])]
+
+
+def run(workers: int, pytest_args: list) -> int:
+    blocked = single_worker_features() if workers > 1 else []
+    if blocked:
+        raise SystemExit(
+            f"{workers} workers can't share {', '.join(blocked)}: every worker would try to bind the same "
+            "port. Run with -n 1, or plain pytest."
+        )
+    accounts = parse_accounts(os.getenv("TEST_ACCOUNTS"))
+    if workers > 1 and len(accounts) < workers:
+        raise SystemExit(
+            f"{workers} workers need {workers} accounts in TEST_ACCOUNTS (got {len(accounts)}); "
+            "workers sharing one account would collide on library contents and like counts."
+        )
+
+    nodeids = collect_nodeids(pytest_args or ["selenium_tests"])
+    if not nodeids:
+        print("No tests collected.")
+        return 5
+    shards = shard_tests(nodeids, workers, load_durations())
+    # -x, -s, --maxfail, --tb, -p ... apply to every worker
+    extra = worker_args(pytest_args)
+
+    procs = []
+    start = time.monotonic()
+    for shard in shards:
+        env = dict(os.environ)
+        env["SELENIUM_WORKER"] = f"w{shard.worker}"
+        env["SELENIUM_DURATIONS_FILE"] = f"{DURATIONS_FILE}.w{shard.worker}"
+        if accounts:
+            env["TEST_EMAIL"], env["TEST_PASSWORD"] = accounts[shard.worker]
+        log_path = os.path.join(os.path.dirname(DURATIONS_FILE), f".worker-w{shard.worker}.log")
+        log = open(log_path, "w", encoding="utf-8")
+        cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *extra, *shard.nodeids]
+        procs.append((shard, subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT), log, log_path))
+        print(f"[w{shard.worker}] {len(shard.nodeids)} tests, expected {shard.expected:.1f}s -> {log_path}")
+
+    exit_code = 0
+    for shard, proc, log, log_path in procs:
+        code = proc.wait()
+        log.close()
+        elapsed = time.monotonic() - start
+        print(f"[w{shard.worker}] finished with exit code {code} after {elapsed:.1f}s")
+        if code != 0:
+            with open(log_path, "r", encoding="utf-8") as f:
+                sys.stdout.write(f.read())
+        exit_code = max(exit_code, code)
+
+        worker_file = f"{DURATIONS_FILE}.w{shard.worker}"
+        samples = load_durations(worker_file)
+        if samples:
+            save_durations(samples)
+        worker_history = f"{FLAKE_HISTORY_FILE}.w{shard.worker}"
+        merge_history(load_history(worker_history))
+        worker_map = f"{IMPACT_MAP_FILE}.w{shard.worker}"
+        merge_map(load_map(worker_map))
+        worker_baseline = f"{BASELINE_FILE}.w{shard.worker}"
+        merge_baseline(load_baseline(worker_baseline))
+        for path in (worker_file, worker_history, worker_map, worker_baseline):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    longest = max(load_durations().get(n, 0.0) for n in nodeids)
+    print(f"Wall clock {time.monotonic() - start:.1f}s across {len(shards)} workers (longest test ~{longest:.1f}s)")
+    return exit_code
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "-n",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of workers (default: one per TEST_ACCOUNTS entry)",
+    )
+    args, pytest_args = parser.parse_known_args(argv)
+    workers = args.workers or max(1, len(parse_accounts(os.getenv("TEST_ACCOUNTS"))))
+    return run(workers, pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import json
+import math
+import os
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+
+from selenium_tests.ui_helpers import ARTIFACTS_DIR
+
+
+# Measured iterations per NFR-4 scenario, and unmeasured warmup iterations before them
+BENCHMARK_RUNS = int(os.getenv("BENCHMARK_RUNS", "1"))
+BENCHMARK_WARMUP = int(os.getenv("BENCHMARK_WARMUP", "0"))
+# One JSON object per scenario per run is appended here
+BENCHMARK_OUTPUT = os.getenv("BENCHMARK_OUTPUT", os.path.join(ARTIFACTS_DIR, "benchmarks.jsonl"))
+
+# Served by prod_server.py from `npm run build` output instead of the Vite dev server
+PROD_BUILD = os.getenv("PROD_BUILD", "0") in ("1", "true", "True")
+BUILD_MODE = "prod" if PROD_BUILD else "dev"
+
+# Identifies all results written by one pytest session
+RUN_ID = time.strftime("%Y%m%dT%H%M%S")
+
+
+def percentile(samples: list, p: float) -> float:
+    """Linear-interpolated percentile (same definition as numpy's default)."""
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * (p / 100.0)
+    lo, hi = math.floor(k), math.ceil(k)
+    if lo == hi:
+        return ordered[int(k)]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class BenchmarkRun:
+    """Handed to the scenario callable: it brackets the measured part with start()/stop()."""
+
+    def __init__(self):
+        self._start = None
+        self.elapsed = None
+        self.notes = {}
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+
+    def stop(self) -> float:
+        if self._start is None:
+            raise RuntimeError("BenchmarkRun.stop() called before start()")
+        self.elapsed = time.perf_counter() - self._start
+        return self.elapsed
+
+    def note(self, key: str, value) -> None:
+        """Attach a secondary per-run metric (e.g. backend latency in ms)."""
+        self.notes[key] = value
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    samples: list
+    warmup: int = 0
+    notes: dict = field(default_factory=dict)
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.samples, 50)
+
+    @property
+    def p90(self) -> float:
+        return percentile(self.samples, 90)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.samples, 99)
+
+    def summary(self) -> str:
+        return (
+            f"{self.scenario}: n={len(self.samples)} p50={self.p50:.3f}s "
+            f"p90={self.p90:.3f}s p99={self.p99:.3f}s max={max(self.samples):.3f}s"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "run_id": RUN_ID,
+            "git_rev": _git_rev(),
+            "build": BUILD_MODE,
+            "timestamp": time.time(),
+            "warmup": self.warmup,
+            "n": len(self.samples),
+            "samples": [round(s, 6) for s in self.samples],
+            "p50": self.p50,
+            "p90": self.p90,
+            "p99": self.p99,
+            "mean": statistics.fmean(self.samples),
+            "stdev": statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            "notes": self.notes,
+        }
+
+
+def run_benchmark(scenario: str, measure, runs: int | None = None, warmup: int | None = None) -> BenchmarkResult:
+    """Run ``measure(run)`` warmup + runs times and collect the measured durations.
+
+    ``measure`` does its own setup (navigation etc.) and calls ``run.start()`` /
+    ``run.stop()`` around the part that counts, using ``time.perf_counter``.
+    """
+    runs = BENCHMARK_RUNS if runs is None else runs
+    warmup = BENCHMARK_WARMUP if warmup is None else warmup
+    result = BenchmarkResult(scenario=scenario, samples=[], warmup=warmup)
+    for i in range(warmup + max(1, runs)):
+        run = BenchmarkRun()
+        measure(run)
+        if run.elapsed is None:
+            raise RuntimeError(f"Scenario {scenario!r} never called run.stop()")
+        if i < warmup:
+            continue
+        result.samples.append(run.elapsed)
+        for key, value in run.notes.items():
+            result.notes.setdefault(key, []).append(value)
+    return result
+
+
+def record_benchmark(result: BenchmarkResult, path: str = BENCHMARK_OUTPUT) -> None:
+    """Append the result as one JSON line so successive runs can be compared."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result.to_dict()) + "\n")
+
+
+def assert_budget(result: BenchmarkResult, **budgets: float) -> None:
+    """Assert percentile budgets in seconds, e.g. ``assert_budget(result, p90=2.0)``."""
+    failures = []
+    for name, limit in budgets.items():
+        value = getattr(result, name)
+        if not value < limit:
+            failures.append(f"{name}={value:.3f}s >= {limit:.3f}s")
+    assert not failures, f"{result.scenario} over budget ({', '.join(failures)}); {result.summary()}"
+
+
+_GIT_REV = None
+
+
+def _git_rev() -> str:
+    global _GIT_REV
+    if _GIT_REV is None:
+        try:
+            _GIT_REV = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            _GIT_REV = ""
+    return _GIT_REV
@@ -0,0 +1,119 @@
+from selenium_tests.ui_helpers import wait_for_js
+
+
+# PlayerContext plays through a detached ``new Audio()``, so there is no <audio> in the DOM
+# to query. This script (installed into every document) wraps HTMLMediaElement play() and
+# the src setter to find that element, and logs into window.__spMedia:
+#   current - the element that was played / given a src last
+#   events  - {seq, type, t, src, time} for media events, play() calls, src changes and
+#             user input (pointerdown/click, captured before React handles them)
+_MEDIA_JS = r"""
+(() => {
+  if (window.__spMedia) return;
+  const m = window.__spMedia = { seq: 0, events: [], current: null };
+  const MAX_EVENTS = 2000;
+  const TYPES = ['loadstart', 'loadedmetadata', 'canplay', 'playing', 'waiting', 'stalled',
+                 'seeking', 'seeked', 'pause', 'ended', 'error', 'emptied'];
+  const log = (type, el, src) => {
+    m.events.push({ seq: ++m.seq, type: type, t: performance.now(),
+                    src: src !== undefined ? src : (el ? el.currentSrc || el.src || '' : ''),
+                    time: el ? el.currentTime : null });
+    if (m.events.length > MAX_EVENTS) m.events.splice(0, m.events.length - MAX_EVENTS);
+    if (window.__sp && window.__sp.notify) window.__sp.notify();
+  };
+  const track = (el) => {
+    m.current = el;
+    if (el.__spMedia) return;
+    el.__spMedia = true;
+    for (const type of TYPES) el.addEventListener(type, () => log(type, el));
+  };
+  const proto = HTMLMediaElement.prototype;
+  const play = proto.play;
+  proto.play = function () { track(this); log('play', this); return play.apply(this, arguments); };
+  const src = Object.getOwnPropertyDescriptor(proto, 'src');
+  if (src && src.set) {
+    Object.defineProperty(proto, 'src', Object.assign({}, src, {
+      set(value) { track(this); src.set.call(this, value); log('src', this, this.src); },
+    }));
+  }
+  for (const type of ['pointerdown', 'click']) {
+    window.addEventListener(type, () => log('input', null, ''), true);
+  }
+})();
+"""
+
+_MEDIA_STATE_JS = """
+const m = window.__spMedia, el = m && m.current;
+if (!el) return null;
+const b = el.buffered;
+return {
+  src: el.currentSrc || el.src, paused: el.paused, ended: el.ended,
+  current_time: el.currentTime, duration: isFinite(el.duration) ? el.duration : null,
+  ready_state: el.readyState, network_state: el.networkState,
+  buffered_s: b.length ? b.end(b.length - 1) : 0, error: el.error ? el.error.code : null,
+};
+"""
+
+# Events that mean playback ran dry after it had started
+STALL_EVENTS = ("waiting", "stalled")
+
+
+def install_media_probe(browser) -> None:
+    browser.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _MEDIA_JS})
+
+
+def media_mark(browser) -> int:
+    return browser.execute_script("return window.__spMedia ? window.__spMedia.seq : 0;")
+
+
+def media_events(browser, since: int = 0) -> list:
+    return browser.execute_script(
+        "const m = window.__spMedia; return m ? m.events.filter(e => e.seq > arguments[0]) : [];", since
+    )
+
+
+def media_state(browser) -> dict | None:
+    """State of the player's audio element (src, paused, current_time, ready_state, ...)."""
+    return browser.execute_script(_MEDIA_STATE_JS)
+
+
+def wait_for_media_event(browser, event_type: str, since: int = 0, exclude_src: str | None = None, timeout: float | None = None) -> dict:
+    """Wait for a ``event_type`` media event after ``since``; with ``exclude_src``, one for another track."""
+    return wait_for_js(
+        browser,
+        """
+        const m = window.__spMedia;
+        if (!m) return null;
+        return m.events.find(e => e.seq > args[0] && e.type === args[1] && (!args[2] || e.src !== args[2])) || null;
+        """,
+        since,
+        event_type,
+        exclude_src or "",
+        timeout=timeout,
+        message=f"no '{event_type}' media event",
+    )
+
+
+def time_media_action(browser, action, event_type: str, new_track: bool = False, timeout: float | None = None) -> float:
+    """Run ``action`` (a click) and return ms from the user input to the ``event_type`` event.
+
+    Both ends are timestamped in the page, so WebDriver round-trips are not included.
+    """
+    before = media_state(browser) if new_track else None
+    mark = media_mark(browser)
+    action()
+    event = wait_for_media_event(browser, event_type, mark, before["src"] if before else None, timeout=timeout)
+    inputs = [e for e in media_events(browser, mark) if e["seq"] < event["seq"]]
+    first_input = next((e for e in inputs if e["type"] == "input"), inputs[0] if inputs else event)
+    return event["t"] - first_input["t"]
+
+
+def stall_count(events: list) -> int:
+    """Number of waiting/stalled events per track once that track was playing."""
+    playing, stalls = set(), 0
+    for e in events:
+        if e["type"] == "playing":
+            playing.add(e["src"])
+        elif e["type"] in STALL_EVENTS and e["src"] in playing:
+            stalls += 1
+    return stalls
@@ -0,0 +1,284 @@
+"""Serve the production build (``npm run build`` -> ``build/``) instead of the Vite dev server.
+
+The dev server transforms and serves every module on request, so first loads under
+``npm run dev`` mostly measure Vite. With ``PROD_BUILD=1`` the ``prod_build`` fixture
+serves ``build/`` on the host and port of ``BASE_URL``, the way a static host would:
+
+- hashed files under ``/assets/`` are cached for a year (``immutable``), ``index.html``
+  is revalidated on every load (``no-cache``), everything else for an hour; all get an ETag
+- text responses are compressed: a prebuilt ``.br``/``.gz`` next to the file if there is
+  one, otherwise brotli (if the ``brotli`` module is installed) or gzip, once per file
+- any other path outside ``/assets/`` gets ``index.html`` (client-side routing)
+- ``/api`` is proxied to the stub backend, the cassette proxy, or ``API_PROXY_TARGET``,
+  like Vite's proxy does
+
+Each run stores its per-route page-metric medians under its build mode (``dev`` or
+``prod``), and the terminal summary compares them with the last run of the other mode.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import urllib3
+
+from selenium_tests.perf import BUILD_MODE
+from selenium_tests.ui_helpers import ARTIFACTS_DIR
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+PROD_BUILD_DIR = os.getenv(
+    "PROD_BUILD_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "build"),
+)
+# Same default as vite.config.ts
+API_PROXY_TARGET = os.getenv("API_PROXY_TARGET", "https://soundpuff-api.ozten.app")
+BUILD_MODES_FILE = os.getenv("BUILD_MODES_FILE", os.path.join(ARTIFACTS_DIR, "build_modes.json"))
+
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/manifest+json")
+# Not worth a compression round trip below this
+_MIN_COMPRESS_BYTES = 1024
+_SKIP_PROXY_HEADERS = {"host", "connection", "keep-alive", "content-length", "transfer-encoding"}
+_SKIP_RESPONSE_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SoundPuffStatic/1.0"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        server = self.server.prod
+        if self.path.startswith("/api"):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            status, headers, data = server.proxy(method, self.path, self.headers, raw)
+            self._send(status, headers, data)
+            return
+        if method not in ("GET", "HEAD"):
+            self._send(405, {"Allow": "GET, HEAD"}, b"")
+            return
+        status, headers, data = server.static(
+            unquote(urlsplit(self.path).path),
+            self.headers.get("Accept-Encoding", ""),
+            self.headers.get("If-None-Match"),
+        )
+        self._send(status, headers, b"" if method == "HEAD" else data, length=len(data))
+
+    def _send(self, status: int, headers: dict, data: bytes, length: int | None = None) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data) if length is None else length))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+
+def _accepts(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class ProdServer:
+    """Threaded static server for a Vite build, with an ``/api`` reverse proxy."""
+
+    def __init__(self, root: str = PROD_BUILD_DIR, host: str = "127.0.0.1", port: int = 0, upstream: str = API_PROXY_TARGET):
+        if not os.path.isfile(os.path.join(root, "index.html")):
+            raise FileNotFoundError(f"no production build in {root}: run `npm run build` first")
+        self.root = os.path.realpath(root)
+        self.upstream = upstream.rstrip("/")
+        # (path, encoding) -> compressed bytes; files in a build don't change during a run
+        self._compressed = {}
+        self._lock = threading.Lock()
+        self._http = urllib3.PoolManager(num_pools=2, maxsize=16, retries=False, cert_reqs="CERT_NONE")
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.prod = self
+        self._thread = None
+        # Bytes sent vs the uncompressed file sizes, for the summary
+        self.sent_bytes = 0
+        self.raw_bytes = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ProdServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="prod-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- static -------------------------------------------------------------
+    def _resolve(self, path: str) -> str | None:
+        full = os.path.realpath(os.path.join(self.root, path.lstrip("/")))
+        if full != self.root and not full.startswith(self.root + os.sep):
+            return None
+        if os.path.isfile(full):
+            return full
+        # Client-side routes (/app/home, /app/user/john.doe) get the app shell; a missing
+        # hashed asset is a real 404
+        if not path.startswith("/assets/"):
+            return os.path.join(self.root, "index.html")
+        return None
+
+    def _encode(self, full: str, data: bytes, accepted: set) -> tuple:
+        """The best encoding the client accepts: a prebuilt file first, then compressed here."""
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and os.path.isfile(full + suffix):
+                with open(full + suffix, "rb") as f:
+                    return encoding, f.read()
+        for encoding, compress in (("br", brotli.compress if brotli else None), ("gzip", gzip.compress)):
+            if compress is None or encoding not in accepted:
+                continue
+            with self._lock:
+                cached = self._compressed.get((full, encoding))
+            if cached is None:
+                cached = compress(data)
+                with self._lock:
+                    self._compressed[(full, encoding)] = cached
+            return encoding, cached
+        return "", data
+
+    def static(self, path: str, accept_encoding: str, if_none_match: str | None) -> tuple:
+        full = self._resolve(path)
+        if full is None:
+            return 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not Found"
+        stat = os.stat(full)
+        etag = '"' + hashlib.sha1(f"{full}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:16] + '"'
+        rel = os.path.relpath(full, self.root).replace(os.sep, "/")
+        if rel.startswith("assets/"):
+            cache = _IMMUTABLE
+        elif rel == "index.html":
+            cache = "no-cache"
+        else:
+            cache = "public, max-age=3600"
+        headers = {"Cache-Control": cache, "ETag": etag, "Vary": "Accept-Encoding"}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return 304, headers, b""
+
+        content_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        headers["Content-Type"] = content_type
+        with open(full, "rb") as f:
+            data = f.read()
+        raw_size = len(data)
+        if content_type.startswith(_COMPRESSIBLE) and raw_size >= _MIN_COMPRESS_BYTES:
+            encoding, data = self._encode(full, data, _accepts(accept_encoding))
+            if encoding:
+                headers["Content-Encoding"] = encoding
+        with self._lock:
+            self.raw_bytes += raw_size
+            self.sent_bytes += len(data)
+        return 200, headers, data
+
+    # --- /api ---------------------------------------------------------------
+    def proxy(self, method: str, path: str, headers, raw: bytes) -> tuple:
+        forwarded = {k: v for k, v in headers.items() if k.lower() not in _SKIP_PROXY_HEADERS}
+        try:
+            resp = self._http.request(
+                method,
+                f"{self.upstream}{path}",
+                body=raw or None,
+                headers=forwarded,
+                redirect=False,
+                preload_content=True,
+                # Passed through as sent, Content-Encoding included
+                decode_content=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            return 502, {"Content-Type": "application/json"}, json.dumps({"detail": str(e)}).encode("utf-8")
+        kept = {k: v for k, v in resp.headers.items() if k.lower() not in _SKIP_RESPONSE_HEADERS}
+        return resp.status, kept, resp.data
+
+    def summary_lines(self) -> list:
+        if not self.raw_bytes:
+            return []
+        return [
+            f"Production build from {self.root}: {self.sent_bytes / 1024:.0f} KB sent for "
+            f"{self.raw_bytes / 1024:.0f} KB of files ({'brotli/gzip' if brotli else 'gzip'})"
+        ]
+
+
+def save_route_medians(medians: dict, mode: str = BUILD_MODE, run_id: str = "", path: str = BUILD_MODES_FILE) -> None:
+    """Store this run's per-route medians as the latest ``mode`` run."""
+    if not medians:
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            modes = json.load(f)
+    except (FileNotFoundError, ValueError):
+        modes = {}
+    modes[mode] = {"run_id": run_id, "routes": medians}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(modes, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def mode_comparison(path: str = BUILD_MODES_FILE) -> list:
+    """Per route: dev vs prod median FCP, settle time and transfer size, from the last run of each."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            modes = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+    if "dev" not in modes or "prod" not in modes:
+        return []
+    dev, prod = modes["dev"]["routes"], modes["prod"]["routes"]
+
+    def cell(metric, route, unit):
+        a, b = dev[route].get(metric), prod[route].get(metric)
+        if a is None or b is None:
+            return f"{metric}=-"
+        ratio = f" x{b / a:.2f}" if a else ""
+        return f"{metric}={a:.0f}->{b:.0f}{unit}{ratio}"
+
+    lines = [f"dev run {modes['dev']['run_id']} -> prod run {modes['prod']['run_id']}"]
+    for route in sorted(set(dev) & set(prod)):
+        lines.append(
+            f"{route:<28} {cell('fcp', route, 'ms')} {cell('settled', route, 'ms')} {cell('kB', route, 'kB')}"
+        )
+    return lines
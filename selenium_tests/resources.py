@@ -0,0 +1,188 @@
+"""Unique names for test data and cleanup of everything a test creates.
+
+Tests ask the ``resources`` fixture for names and create data through it:
+
+    playlist = resources.playlist("src")          # created over REST and tracked
+    title = resources.name("playlist")            # for data created through the UI...
+    resources.track_title(title)                  # ...found by title at teardown
+
+Names look like ``selenium-src-1718000000-w1-3``: creation second, worker (or process) and
+a per-process counter, so two playlists made in the same second, or by parallel workers
+sharing an account, never collide. At teardown the tracker deletes the comments and
+playlists it recorded in parallel over the API; ones the test already deleted are ignored.
+
+Runs that crash skip teardown. ``sweep`` deletes the account's own ``selenium-*``
+playlists older than ``SWEEP_MIN_AGE_S``, judged by the timestamp in the name. Their comments
+go with them. Run it at session start with ``SWEEP_LEFTOVERS=1``, or standalone:
+
+    python -m selenium_tests.resources --sweep
+"""
+import argparse
+import itertools
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium_tests.api_client import ApiError
+
+
+RESOURCE_CLEANUP = os.getenv("RESOURCE_CLEANUP", "1") in ("1", "true", "True")
+RESOURCE_CLEANUP_WORKERS = int(os.getenv("RESOURCE_CLEANUP_WORKERS", "4"))
+SWEEP_LEFTOVERS = os.getenv("SWEEP_LEFTOVERS", "0") in ("1", "true", "True")
+# Younger leftovers may belong to a run that is still going
+SWEEP_MIN_AGE_S = float(os.getenv("SWEEP_MIN_AGE_S", "3600"))
+NAME_PREFIX = "selenium"
+# Also matches the older "selenium-src-<timestamp>" names
+_NAME_TIME = re.compile(rf"^{NAME_PREFIX}-[\w-]*?-(\d{{10}})(?:-|$)")
+_PAGE = 100
+
+_COUNTER = itertools.count(1)
+
+
+def unique_name(kind: str) -> str:
+    """``selenium-<kind>-<unix time>-<worker>-<n>``, unique across workers and within a second."""
+    owner = os.getenv("SELENIUM_WORKER") or f"p{os.getpid()}"
+    return f"{NAME_PREFIX}-{kind}-{int(time.time())}-{owner}-{next(_COUNTER)}"
+
+
+def name_time(name: str) -> int | None:
+    m = _NAME_TIME.match(name or "")
+    return int(m.group(1)) if m else None
+
+
+def _owner_id(playlist: dict):
+    return playlist.get("user_id") or (playlist.get("owner") or {}).get("id")
+
+
+def own_playlists(api, user_id, pages: int | None = None) -> list:
+    """The account's playlists from ``GET /playlists/``, in the backend's order (``pages`` limits the scan)."""
+    found = []
+    for page in itertools.count():
+        if pages is not None and page >= pages:
+            break
+        batch = api.playlists(skip=page * _PAGE, limit=_PAGE)
+        found.extend(p for p in batch if _owner_id(p) == user_id)
+        if len(batch) < _PAGE:
+            break
+    return found
+
+
+def _delete_all(delete, ids) -> int:
+    """Run ``delete(id)`` for every id in parallel; ids that are already gone don't count."""
+
+    def one(resource_id):
+        try:
+            delete(resource_id)
+            return 1
+        except ApiError as e:
+            if e.status in (403, 404):
+                return 0
+            print(f"Cleanup of {resource_id} failed: {e}")
+            return 0
+
+    ids = list(ids)
+    if not ids:
+        return 0
+    with ThreadPoolExecutor(max_workers=RESOURCE_CLEANUP_WORKERS, thread_name_prefix="cleanup") as pool:
+        return sum(pool.map(one, ids))
+
+
+class ResourceTracker:
+    """Hands out names and remembers the playlists and comments a test created."""
+
+    def __init__(self, api):
+        self.api = api
+        self.playlist_ids = []
+        self.comment_ids = []
+        # Created through the UI; resolved to ids at cleanup
+        self.titles = []
+        self.comment_texts = []
+
+    def name(self, kind: str) -> str:
+        return unique_name(kind)
+
+    def playlist(self, kind: str = "playlist", song_ids: list | None = None, **kwargs) -> dict:
+        playlist = self.api.create_playlist(self.name(kind), song_ids, **kwargs)
+        self.playlist_ids.append(playlist["id"])
+        return playlist
+
+    def comment(self, playlist_id: int, kind: str = "comment") -> dict:
+        comment = self.api.add_comment(playlist_id, self.name(kind))
+        self.comment_ids.append(comment["id"])
+        return comment
+
+    def track_title(self, title: str) -> None:
+        self.titles.append(title)
+
+    def track_comment_text(self, playlist_id: int, text: str) -> None:
+        self.comment_texts.append((playlist_id, text))
+
+    def _resolve(self) -> None:
+        for playlist_id, text in self.comment_texts:
+            try:
+                comments = self.api.comments(playlist_id)
+            except ApiError:
+                continue
+            self.comment_ids.extend(c["id"] for c in comments if c.get("body") == text)
+        self.comment_texts = []
+        if self.titles:
+            me = self.api.me()
+            missing = set(self.titles)
+            # GET /playlists/ makes no promise about order: scan until every title turned up
+            for page in itertools.count():
+                batch = self.api.playlists(skip=page * _PAGE, limit=_PAGE)
+                for p in batch:
+                    if _owner_id(p) == me["id"] and p["title"] in missing:
+                        self.playlist_ids.append(p["id"])
+                        missing.discard(p["title"])
+                if not missing or len(batch) < _PAGE:
+                    break
+            self.titles = []
+
+    def cleanup(self) -> dict:
+        """Delete everything recorded; returns counts of what was removed."""
+        self._resolve()
+        removed = {
+            "comments": _delete_all(self.api.delete_comment, dict.fromkeys(self.comment_ids)),
+            "playlists": _delete_all(self.api.delete_playlist, dict.fromkeys(self.playlist_ids)),
+        }
+        self.comment_ids, self.playlist_ids = [], []
+        return removed
+
+
+def sweep(api, min_age_s: float = SWEEP_MIN_AGE_S, dry_run: bool = False) -> list:
+    """Delete the account's leftover ``selenium-*`` playlists older than ``min_age_s``."""
+    me = api.me()
+    cutoff = time.time() - min_age_s
+    stale = []
+    for playlist in own_playlists(api, me["id"]):
+        created = name_time(playlist.get("title", ""))
+        if created is not None and created < cutoff:
+            stale.append(playlist)
+    if not dry_run:
+        _delete_all(api.delete_playlist, [p["id"] for p in stale])
+    return stale
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sweep", action="store_true", help="delete leftover selenium-* playlists")
+    parser.add_argument("--min-age-s", type=float, default=SWEEP_MIN_AGE_S)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.sweep:
+        parser.print_help()
+        return
+
+    from selenium_tests.ui_helpers import api_for_env
+
+    stale = sweep(api_for_env(), args.min_age_s, dry_run=args.dry_run)
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"{verb} {len(stale)} leftover playlists")
+    for playlist in stale:
+        print(f"  {playlist['id']}  {playlist['title']}")
+
+
+if __name__ == "__main__":
+    main()
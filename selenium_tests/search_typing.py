@@ -0,0 +1,246 @@
+"""Keystroke-to-results analysis for the debounced search boxes.
+
+SearchPage (``/songs/all``) and CreatePlaylistPage (``/songs/search``) wait 500ms after the
+last change before they search, and don't cancel requests that are already running. This
+probe (installed for the benchmark only) logs into ``window.__spSearch``:
+
+- ``key``: every ``input`` event, with the box's value, captured before React sees it
+- ``request`` / ``response``: search XHRs with their ``query`` parameter; for a response
+  the song titles it returned
+- ``render``: after a DOM change or a response, the responses whose first song titles are
+  all on screen (checked once per frame, so ``t`` is close to the paint)
+
+``analyze`` turns one typed query into counts: requests fired, cancelled, duplicated and
+superseded, how often the screen showed results for a query the user had already typed
+past (stale), and how often older results replaced newer ones (out of order). When several
+queries' results look the same on screen, the render is credited to the most recently
+typed of them, so stale and out-of-order counts are lower bounds.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+
+from selenium_tests.perf import percentile
+from selenium_tests.ui_helpers import wait_for_js
+
+# What the app's setTimeout uses (and what ui_helpers assumes)
+SEARCH_DEBOUNCE_MS = 500
+
+_SEARCH_JS = r"""
+(() => {
+  if (window.__spSearch) return;
+  const s = window.__spSearch = { seq: 0, requests: 0, pending: 0, last: performance.now(),
+                                  events: [], responses: [], shown: '' };
+  const MAX_EVENTS = 5000;
+  // Axios goes through XHR; fetch is not used for search
+  const SEARCH = /\/api\/v1\/songs\/(all|search|users\/search|playlists\/search)(\?|$)/;
+  const log = (e) => {
+    e.seq = ++s.seq; s.events.push(e); s.last = e.t;
+    if (s.events.length > MAX_EVENTS) s.events.splice(0, s.events.length - MAX_EVENTS);
+    if (window.__sp && window.__sp.notify) window.__sp.notify();
+  };
+  const titles = (text) => {
+    try {
+      const d = JSON.parse(text);
+      return (d.songs || []).map((i) => (i && (i.song || i).title) || '').filter(Boolean);
+    } catch (e) { return []; }
+  };
+
+  let frame = 0;
+  const check = () => {
+    frame = 0;
+    const text = document.body ? document.body.innerText : '';
+    const matches = s.responses
+      .filter((r) => r.titles.length && r.titles.slice(0, 3).every((t) => text.indexOf(t) !== -1))
+      .map((r) => r.id);
+    const key = matches.join(',');
+    if (key !== s.shown) {
+      s.shown = key;
+      log({ type: 'render', t: performance.now(), matches: matches });
+    }
+  };
+  const schedule = () => { if (!frame) frame = requestAnimationFrame(check); };
+  new MutationObserver(schedule).observe(document, { childList: true, subtree: true, characterData: true });
+
+  window.addEventListener('input', (e) => {
+    const el = e.target;
+    if (el && typeof el.value === 'string') log({ type: 'key', t: performance.now(), value: el.value });
+  }, true);
+
+  const open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__spSearchUrl = SEARCH.test(String(url)) ? String(url) : null;
+    return open.apply(this, arguments);
+  };
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    const url = this.__spSearchUrl;
+    if (url) {
+      const id = ++s.requests;
+      const query = new URL(url, location.href).searchParams.get('query') || '';
+      let aborted = false;
+      s.pending++;
+      log({ type: 'request', t: performance.now(), id: id, url: url, query: query });
+      this.addEventListener('abort', () => { aborted = true; });
+      this.addEventListener('loadend', () => {
+        s.pending = Math.max(0, s.pending - 1);
+        const ok = !aborted && this.status >= 200 && this.status < 300;
+        const found = ok && (this.responseType === '' || this.responseType === 'text') ? titles(this.responseText) : [];
+        if (ok) s.responses.push({ id: id, query: query, titles: found });
+        log({ type: 'response', t: performance.now(), id: id, query: query, status: this.status,
+              aborted: aborted, titles: found.length });
+        schedule();
+      });
+    }
+    return send.apply(this, arguments);
+  };
+})();
+"""
+
+
+@dataclass
+class TypedQuery:
+    """What happened while one query was typed, until the page went quiet."""
+
+    page: str
+    query: str
+    interval_ms: float
+    keys: int = 0
+    fired: int = 0
+    cancelled: int = 0
+    # Same query text requested more than once
+    duplicates: int = 0
+    # Requests for a prefix the user typed past
+    superseded: int = 0
+    stale_applied: int = 0
+    out_of_order: int = 0
+    ambiguous: int = 0
+    # Last keystroke -> results for the final query on screen; None if they never showed
+    latency_ms: float | None = None
+    final_ok: bool = False
+    errors: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def install_search_probe(browser) -> str:
+    """Inject the probe into every new document; returns the id for ``remove_search_probe``."""
+    return browser.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _SEARCH_JS})["identifier"]
+
+
+def remove_search_probe(browser, identifier: str) -> None:
+    browser.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+def search_mark(browser) -> int:
+    return browser.execute_script("return window.__spSearch ? window.__spSearch.seq : 0;")
+
+
+def search_events(browser, since: int = 0) -> list:
+    return browser.execute_script(
+        "const s = window.__spSearch; return s ? s.events.filter(e => e.seq > arguments[0]) : [];", since
+    )
+
+
+def wait_for_search_quiet(browser, quiet_ms: float, timeout: float | None = None) -> None:
+    """Wait until no search request is running and nothing was typed, answered or rendered for ``quiet_ms``."""
+    wait_for_js(
+        browser,
+        "const s = window.__spSearch; return !!s && s.pending === 0 && performance.now() - s.last >= args[0];",
+        quiet_ms,
+        timeout=timeout,
+        recheck_ms=50,
+        message="search never went quiet",
+    )
+
+
+def type_like_human(element, text: str, interval_ms: float, rng: random.Random, pause_chance: float = 0.1) -> None:
+    """Send ``text`` one key at a time, ``interval_ms`` apart on average, with jitter and the odd pause."""
+    last = time.perf_counter()
+    for i, char in enumerate(text):
+        if i:
+            gap = max(30.0, rng.gauss(interval_ms, interval_ms * 0.3))
+            if rng.random() < pause_chance:
+                gap *= rng.uniform(2.0, 4.0)
+            # WebDriver round-trips count towards the gap
+            time.sleep(max(0.0, gap / 1000.0 - (time.perf_counter() - last)))
+        last = time.perf_counter()
+        element.send_keys(char)
+
+
+def analyze(page: str, query: str, interval_ms: float, events: list) -> TypedQuery:
+    run = TypedQuery(page=page, query=query, interval_ms=interval_ms)
+    keys = [e for e in events if e["type"] == "key"]
+    requests = [e for e in events if e["type"] == "request"]
+    responses = {e["id"]: e for e in events if e["type"] == "response"}
+    run.keys = len(keys)
+    if not keys:
+        run.errors.append("no input events")
+        return run
+    final = keys[-1]["value"]
+
+    # Position in the typing sequence: later-typed values supersede earlier ones
+    order = {}
+    for i, key in enumerate(keys):
+        order[key["value"]] = i
+
+    run.fired = len(requests)
+    run.cancelled = sum(1 for r in requests if r["id"] in responses and responses[r["id"]]["aborted"])
+    run.duplicates = run.fired - len({r["query"] for r in requests})
+    run.superseded = sum(1 for r in requests if r["query"] != final)
+    run.errors += [
+        f"{r['query']!r}: HTTP {responses[r['id']]['status']}"
+        for r in requests
+        if r["id"] in responses and not responses[r["id"]]["aborted"] and not 200 <= responses[r["id"]]["status"] < 300
+    ]
+    query_of = {r["id"]: r["query"] for r in requests}
+
+    shown_order, shown = -1, None
+    for render in (e for e in events if e["type"] == "render"):
+        queries = {query_of[i] for i in render["matches"] if i in query_of}
+        if not queries:
+            shown = None
+            continue
+        if len(queries) > 1:
+            run.ambiguous += 1
+        # Credit the most recently typed candidate
+        shown = max(queries, key=lambda q: order.get(q, -1))
+        typed = [k["value"] for k in keys if k["t"] <= render["t"]]
+        current = typed[-1] if typed else ""
+        if shown != current:
+            run.stale_applied += 1
+        if order.get(shown, -1) < shown_order:
+            run.out_of_order += 1
+        shown_order = max(shown_order, order.get(shown, -1))
+        if run.latency_ms is None and shown == final and render["t"] >= keys[-1]["t"]:
+            run.latency_ms = render["t"] - keys[-1]["t"]
+    run.final_ok = shown == final
+    if not any(r["query"] == final for r in requests):
+        run.errors.append(f"no request for the final query {final!r}")
+    return run
+
+
+def summary_lines(runs: list) -> list:
+    """Per page and typing speed: latency percentiles and request/staleness totals."""
+    lines = []
+    groups = {}
+    for run in runs:
+        groups.setdefault((run.page, run.interval_ms), []).append(run)
+    for (page, interval_ms), group in sorted(groups.items()):
+        latencies = [r.latency_ms for r in group if r.latency_ms is not None]
+        keys = sum(r.keys for r in group)
+        fired = sum(r.fired for r in group)
+        latency = (
+            f"p50={percentile(latencies, 50):.0f}ms p90={percentile(latencies, 90):.0f}ms"
+            if latencies
+            else "no final results"
+        )
+        lines.append(
+            f"{page:<15} {interval_ms:>4.0f}ms/key  {len(group)} queries  {latency}  "
+            f"requests={fired} ({fired / keys if keys else 0:.2f}/key) "
+            f"cancelled={sum(r.cancelled for r in group)} duplicates={sum(r.duplicates for r in group)} "
+            f"superseded={sum(r.superseded for r in group)} stale={sum(r.stale_applied for r in group)} "
+            f"out_of_order={sum(r.out_of_order for r in group)} wrong_final={sum(not r.final_ok for r in group)}"
+        )
+    return lines
@@ -0,0 +1,797 @@
+"""In-memory stand-in for the SoundPuff REST API (see ``api-docs.json``).
+
+Start it through the ``stub_backend`` session fixture (``STUB_BACKEND=1``) or standalone:
+
+    python -m selenium_tests.stub_backend --port 8765 --dataset songs=500,users=30,playlists=80
+
+and point the Vite proxy at it with ``API_PROXY_TARGET=http://127.0.0.1:8765 npm run dev``.
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+TOKEN_TTL = 60 * 60
+DEFAULT_DATASET = {"songs": 200, "users": 20, "playlists": 40, "songs_per_playlist": 8}
+
+_GENRES = ["Pop", "Rock", "Jazz", "Lofi", "Indie", "Techno", "Blues", "Folk", "Soul", "Metal"]
+_WORDS = ["Night", "Summer", "Echo", "River", "Neon", "Golden", "Velvet", "Paper", "Storm", "Signal"]
+# Usernames referenced by the UI tests (e.g. the follow flow searches for "lura")
+_USERNAMES = ["lura", "deniz", "mira", "kaan", "selin", "arda", "nova", "eren", "ilay", "toprak"]
+# song_url of every stub song; served by the same server so playback works offline
+_MEDIA_PATH = re.compile(r"^/media/song-(\d+)\.wav$")
+# Length of the generated audio; the player assumes 30s previews
+MEDIA_SECONDS = 30
+MEDIA_SAMPLE_RATE = 8000
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=8)
+def media_wav(seconds: float = MEDIA_SECONDS, sample_rate: int = MEDIA_SAMPLE_RATE) -> bytes:
+    """A quiet 440 Hz tone as 8-bit mono PCM WAV; every song gets the same fixed-size file."""
+    frames = int(seconds * sample_rate)
+    step = 2 * math.pi * 440 / sample_rate
+    pcm = bytes(128 + int(8 * math.sin(i * step)) for i in range(frames))
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate, 1, 8,
+        b"data", len(pcm),
+    )
+    return header + pcm
+
+
+@dataclass
+class StubUser:
+    id: str
+    username: str
+    email: str
+    password: str
+    bio: str | None = None
+    avatar_url: str | None = None
+    created_at: str = field(default_factory=_now)
+
+
+@dataclass
+class StubPlaylist:
+    id: int
+    title: str
+    user_id: str
+    description: str | None = None
+    privacy: str = "public"
+    song_ids: list = field(default_factory=list)
+    likes: set = field(default_factory=set)
+    cover_image_url: str | None = None
+    created_at: str = field(default_factory=_now)
+    updated_at: str | None = None
+
+
+@dataclass
+class StubComment:
+    id: int
+    playlist_id: int
+    user_id: str
+    body: str
+    parent_comment_id: int | None = None
+    likes: set = field(default_factory=set)
+    created_at: str = field(default_factory=_now)
+
+
+class StubState:
+    """All backend data, guarded by one lock (handlers run on server threads)."""
+
+    def __init__(self, media_base_url: str = ""):
+        self.lock = threading.RLock()
+        self.media_base_url = media_base_url
+        self.users = {}
+        self.songs = {}
+        self.playlists = {}
+        self.comments = {}
+        self.follows = set()
+        self.tokens = {}
+        self._ids = {"song": 0, "playlist": 0, "comment": 0}
+
+    def next_id(self, kind: str) -> int:
+        self._ids[kind] += 1
+        return self._ids[kind]
+
+    # --- seeding ------------------------------------------------------------
+    def add_user(self, username: str, email: str, password: str, bio: str | None = None) -> StubUser:
+        with self.lock:
+            for user in self.users.values():
+                if user.email == email:
+                    return user
+            user = StubUser(id=str(uuid.uuid4()), username=username, email=email, password=password, bio=bio)
+            self.users[user.id] = user
+            return user
+
+    def add_song(self, title: str, artist: str, album_art_url: str | None = None) -> dict:
+        with self.lock:
+            song_id = self.next_id("song")
+            song = {
+                "id": song_id,
+                "title": title,
+                "artist": artist,
+                "album_art_url": album_art_url or "no",
+                "song_url": f"{self.media_base_url}/song-{song_id}.wav",
+                "created_at": _now(),
+            }
+            self.songs[song_id] = song
+            return song
+
+    def add_playlist(self, user_id: str, title: str, song_ids=(), description=None, privacy="public") -> StubPlaylist:
+        with self.lock:
+            pl = StubPlaylist(
+                id=self.next_id("playlist"),
+                title=title,
+                user_id=user_id,
+                description=description,
+                privacy=privacy,
+                song_ids=[s for s in song_ids if s in self.songs],
+            )
+            self.playlists[pl.id] = pl
+            return pl
+
+    def seed(self, songs=0, users=0, playlists=0, songs_per_playlist=0, rng_seed: int = 0) -> None:
+        """Add a deterministic synthetic dataset on top of the current state."""
+        rng = random.Random(rng_seed)
+        with self.lock:
+            for i in range(users):
+                name = _USERNAMES[i] if i < len(_USERNAMES) else f"user{i}"
+                self.add_user(name, f"{name}@stub.soundpuff.test", "password", bio=f"{name} makes playlists")
+            for i in range(songs):
+                genre = _GENRES[i % len(_GENRES)]
+                self.add_song(f"{genre} {rng.choice(_WORDS)} {i + 1}", f"{rng.choice(_WORDS)} {genre} Band")
+            owners = list(self.users)
+            song_ids = list(self.songs)
+            for i in range(playlists if owners else 0):
+                picked = rng.sample(song_ids, min(songs_per_playlist, len(song_ids)))
+                genre = _GENRES[i % len(_GENRES)]
+                self.add_playlist(rng.choice(owners), f"{genre} Mix {i + 1}", picked, description=f"Best of {genre}")
+
+    def follow_owners(self, user: StubUser, count: int = 3) -> None:
+        """Make ``user`` follow the first ``count`` playlist owners so their feed isn't empty."""
+        with self.lock:
+            owners = []
+            for pl in sorted(self.playlists.values(), key=lambda p: p.id):
+                if pl.user_id != user.id and pl.user_id not in owners:
+                    owners.append(pl.user_id)
+            for owner in owners[:count]:
+                self.follows.add((user.id, owner))
+
+    # --- auth ---------------------------------------------------------------
+    def issue_token(self, user: StubUser) -> dict:
+        exp = int(time.time()) + TOKEN_TTL
+        payload = base64.urlsafe_b64encode(json.dumps({"sub": user.id, "exp": exp}).encode()).decode().rstrip("=")
+        token = f"stub.{payload}.{uuid.uuid4().hex}"
+        self.tokens[token] = (user.id, exp)
+        return {"access_token": token, "refresh_token": uuid.uuid4().hex, "token_type": "bearer", "expires_in": TOKEN_TTL}
+
+    def user_for_token(self, token: str | None) -> StubUser | None:
+        entry = self.tokens.get(token or "")
+        if not entry or entry[1] < time.time():
+            return None
+        return self.users.get(entry[0])
+
+    def user_by_name(self, username: str) -> StubUser | None:
+        for user in self.users.values():
+            if user.username == username:
+                return user
+        return None
+
+    # --- serialisation ------------------------------------------------------
+    def user_json(self, user: StubUser) -> dict:
+        return {
+            "id": user.id,
+            "username": user.username,
+            "bio": user.bio,
+            "avatar_url": user.avatar_url,
+            "created_at": user.created_at,
+        }
+
+    def playlist_json(self, pl: StubPlaylist, viewer: StubUser | None) -> dict:
+        return {
+            "id": pl.id,
+            "title": pl.title,
+            "description": pl.description,
+            "privacy": pl.privacy,
+            "user_id": pl.user_id,
+            "created_at": pl.created_at,
+            "updated_at": pl.updated_at,
+            "cover_image_url": pl.cover_image_url,
+            "owner": self.user_json(self.users[pl.user_id]),
+            "songs": [self.songs[s] for s in pl.song_ids if s in self.songs],
+            "likes_count": len(pl.likes),
+            "comments_count": sum(1 for c in self.comments.values() if c.playlist_id == pl.id),
+            "is_liked": bool(viewer and viewer.id in pl.likes),
+            "likes": [{"user_id": uid} for uid in pl.likes],
+        }
+
+    def comment_json(self, c: StubComment, viewer: StubUser | None) -> dict:
+        return {
+            "id": c.id,
+            "body": c.body,
+            "user_id": c.user_id,
+            "playlist_id": c.playlist_id,
+            "parent_comment_id": c.parent_comment_id,
+            "created_at": c.created_at,
+            "user": self.user_json(self.users[c.user_id]),
+            "likes_count": len(c.likes),
+            "is_liked": bool(viewer and viewer.id in c.likes),
+        }
+
+    def visible_playlists(self, viewer: StubUser | None) -> list:
+        pls = [p for p in self.playlists.values() if p.privacy == "public" or (viewer and p.user_id == viewer.id)]
+        return sorted(pls, key=lambda p: p.id, reverse=True)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+_ROUTES = []
+
+
+def route(method: str, pattern: str, auth: bool = True):
+    def register(fn):
+        _ROUTES.append((method, re.compile(f"^{pattern}$"), auth, fn))
+        return fn
+
+    return register
+
+
+def _page(items: list, query: dict, first: str, second: str, default_limit: int) -> list:
+    start = int(query.get(first, 0) or 0)
+    limit = int(query.get(second, default_limit) or default_limit)
+    return items[start : start + limit]
+
+
+def _require(body: dict, *keys):
+    missing = [k for k in keys if k not in body or body[k] in (None, "")]
+    if missing:
+        raise HttpError(422, [{"loc": ["body", k], "msg": "Field required", "type": "missing"} for k in missing])
+
+
+def _playlist_or_404(state: StubState, playlist_id) -> StubPlaylist:
+    pl = state.playlists.get(int(playlist_id))
+    if pl is None:
+        raise HttpError(404, "Playlist not found")
+    return pl
+
+
+def _comment_or_404(state: StubState, comment_id) -> StubComment:
+    c = state.comments.get(int(comment_id))
+    if c is None:
+        raise HttpError(404, "Comment not found")
+    return c
+
+
+def _owned(pl, user: StubUser):
+    if pl.user_id != user.id:
+        raise HttpError(403, "Not enough permissions")
+    return pl
+
+
+# --- auth ---------------------------------------------------------------------
+@route("POST", "/api/v1/auth/signup", auth=False)
+def _signup(state, user, m, query, body):
+    _require(body, "email", "password", "username")
+    if any(u.email == body["email"] for u in state.users.values()) or state.user_by_name(body["username"]):
+        raise HttpError(400, "Email or username already registered")
+    return 201, state.issue_token(state.add_user(body["username"], body["email"], body["password"]))
+
+
+@route("POST", "/api/v1/auth/login", auth=False)
+def _login(state, user, m, query, body):
+    _require(body, "email", "password")
+    for u in state.users.values():
+        if u.email == body["email"] and u.password == body["password"]:
+            return 200, state.issue_token(u)
+    raise HttpError(401, "Incorrect email or password")
+
+
+@route("POST", "/api/v1/auth/password-reset/request", auth=False)
+def _reset_request(state, user, m, query, body):
+    _require(body, "email")
+    return 200, {"message": "If the email exists, a reset link has been sent"}
+
+
+@route("POST", "/api/v1/auth/password-reset/confirm", auth=False)
+def _reset_confirm(state, user, m, query, body):
+    _require(body, "token", "password")
+    raise HttpError(400, "Invalid or expired token")
+
+
+# --- users --------------------------------------------------------------------
+@route("GET", "/api/v1/users/me")
+def _me(state, user, m, query, body):
+    return 200, state.user_json(user)
+
+
+@route("PUT", "/api/v1/users/me")
+def _update_me(state, user, m, query, body):
+    for key in ("bio", "avatar_url"):
+        if key in body:
+            setattr(user, key, body[key])
+    return 200, state.user_json(user)
+
+
+@route("DELETE", "/api/v1/users/me")
+def _delete_me(state, user, m, query, body):
+    state.users.pop(user.id, None)
+    for pid in [p.id for p in state.playlists.values() if p.user_id == user.id]:
+        del state.playlists[pid]
+    for cid in [c.id for c in state.comments.values() if c.user_id == user.id]:
+        del state.comments[cid]
+    return 204, None
+
+
+@route("GET", "/api/v1/users/(?P<username>[^/]+)")
+def _get_user(state, user, m, query, body):
+    target = state.user_by_name(m["username"])
+    if target is None:
+        raise HttpError(404, "User not found")
+    return 200, state.user_json(target)
+
+
+@route("POST", "/api/v1/users/(?P<username>[^/]+)/follow")
+def _follow(state, user, m, query, body):
+    target = state.user_by_name(m["username"])
+    if target is None:
+        raise HttpError(404, "User not found")
+    if target.id == user.id:
+        raise HttpError(400, "You cannot follow yourself")
+    state.follows.add((user.id, target.id))
+    return 204, None
+
+
+@route("DELETE", "/api/v1/users/(?P<username>[^/]+)/follow")
+def _unfollow(state, user, m, query, body):
+    target = state.user_by_name(m["username"])
+    if target is None:
+        raise HttpError(404, "User not found")
+    state.follows.discard((user.id, target.id))
+    return 204, None
+
+
+@route("GET", "/api/v1/users/(?P<username>[^/]+)/followers")
+def _followers(state, user, m, query, body):
+    target = state.user_by_name(m["username"])
+    if target is None:
+        raise HttpError(404, "User not found")
+    return 200, [state.user_json(state.users[a]) for a, b in state.follows if b == target.id and a in state.users]
+
+
+@route("GET", "/api/v1/users/(?P<username>[^/]+)/following")
+def _following(state, user, m, query, body):
+    target = state.user_by_name(m["username"])
+    if target is None:
+        raise HttpError(404, "User not found")
+    return 200, [state.user_json(state.users[b]) for a, b in state.follows if a == target.id and b in state.users]
+
+
+# --- playlists ----------------------------------------------------------------
+@route("GET", "/api/v1/playlists/")
+def _list_playlists(state, user, m, query, body):
+    items = _page(state.visible_playlists(user), query, "skip", "limit", 20)
+    return 200, [state.playlist_json(p, user) for p in items]
+
+
+@route("POST", "/api/v1/playlists/")
+def _create_playlist(state, user, m, query, body):
+    _require(body, "title")
+    pl = state.add_playlist(
+        user.id, body["title"], body.get("song_ids") or [], body.get("description"), body.get("privacy") or "public"
+    )
+    return 201, state.playlist_json(pl, user)
+
+
+@route("GET", "/api/v1/playlists/feed")
+def _feed(state, user, m, query, body):
+    followed = {b for a, b in state.follows if a == user.id}
+    items = [p for p in state.visible_playlists(user) if p.user_id in followed]
+    return 200, [state.playlist_json(p, user) for p in _page(items, query, "skip", "limit", 20)]
+
+
+@route("GET", r"/api/v1/playlists/(?P<playlist_id>\d+)")
+def _get_playlist(state, user, m, query, body):
+    return 200, state.playlist_json(_playlist_or_404(state, m["playlist_id"]), user)
+
+
+@route("PUT", r"/api/v1/playlists/(?P<playlist_id>\d+)")
+def _update_playlist(state, user, m, query, body):
+    pl = _owned(_playlist_or_404(state, m["playlist_id"]), user)
+    for key in ("title", "description", "privacy"):
+        if body.get(key) is not None:
+            setattr(pl, key, body[key])
+    if body.get("song_ids") is not None:
+        pl.song_ids = [s for s in body["song_ids"] if s in state.songs]
+    pl.updated_at = _now()
+    return 200, state.playlist_json(pl, user)
+
+
+@route("DELETE", r"/api/v1/playlists/(?P<playlist_id>\d+)")
+def _delete_playlist(state, user, m, query, body):
+    pl = _owned(_playlist_or_404(state, m["playlist_id"]), user)
+    del state.playlists[pl.id]
+    for cid in [c.id for c in state.comments.values() if c.playlist_id == pl.id]:
+        del state.comments[cid]
+    return 204, None
+
+
+@route("POST", r"/api/v1/playlists/(?P<playlist_id>\d+)/songs")
+def _add_song(state, user, m, query, body):
+    pl = _owned(_playlist_or_404(state, m["playlist_id"]), user)
+    _require(body, "song_id")
+    song_id = int(body["song_id"])
+    if song_id not in state.songs:
+        raise HttpError(404, "Song not found")
+    if song_id in pl.song_ids:
+        raise HttpError(400, "Song already in playlist")
+    pl.song_ids.append(song_id)
+    return 201, state.playlist_json(pl, user)
+
+
+@route("DELETE", r"/api/v1/playlists/(?P<playlist_id>\d+)/songs/(?P<song_id>\d+)")
+def _remove_song(state, user, m, query, body):
+    pl = _owned(_playlist_or_404(state, m["playlist_id"]), user)
+    pl.song_ids = [s for s in pl.song_ids if s != int(m["song_id"])]
+    return 204, None
+
+
+@route("POST", r"/api/v1/playlists/(?P<playlist_id>\d+)/like")
+def _like_playlist(state, user, m, query, body):
+    pl = _playlist_or_404(state, m["playlist_id"])
+    if user.id in pl.likes:
+        raise HttpError(400, "Playlist already liked")
+    pl.likes.add(user.id)
+    return 201, {"playlist_id": pl.id, "user_id": user.id, "created_at": _now()}
+
+
+@route("DELETE", r"/api/v1/playlists/(?P<playlist_id>\d+)/like")
+def _unlike_playlist(state, user, m, query, body):
+    pl = _playlist_or_404(state, m["playlist_id"])
+    if user.id not in pl.likes:
+        raise HttpError(404, "Like not found")
+    pl.likes.discard(user.id)
+    return 204, None
+
+
+# --- comments -----------------------------------------------------------------
+@route("GET", r"/api/v1/playlists/(?P<playlist_id>\d+)/comments")
+def _list_comments(state, user, m, query, body):
+    pl = _playlist_or_404(state, m["playlist_id"])
+    items = sorted((c for c in state.comments.values() if c.playlist_id == pl.id), key=lambda c: c.id)
+    return 200, [state.comment_json(c, user) for c in items]
+
+
+@route("POST", r"/api/v1/playlists/(?P<playlist_id>\d+)/comments")
+def _create_comment(state, user, m, query, body):
+    pl = _playlist_or_404(state, m["playlist_id"])
+    _require(body, "body")
+    c = StubComment(
+        id=state.next_id("comment"),
+        playlist_id=pl.id,
+        user_id=user.id,
+        body=body["body"],
+        parent_comment_id=body.get("parent_comment_id"),
+    )
+    state.comments[c.id] = c
+    return 201, state.comment_json(c, user)
+
+
+@route("PUT", r"/api/v1/playlists/comments/(?P<comment_id>\d+)")
+def _update_comment(state, user, m, query, body):
+    c = _owned(_comment_or_404(state, m["comment_id"]), user)
+    _require(body, "body")
+    c.body = body["body"]
+    return 200, state.comment_json(c, user)
+
+
+@route("DELETE", r"/api/v1/playlists/comments/(?P<comment_id>\d+)")
+def _delete_comment(state, user, m, query, body):
+    c = _owned(_comment_or_404(state, m["comment_id"]), user)
+    del state.comments[c.id]
+    return 204, None
+
+
+@route("POST", r"/api/v1/playlists/comments/(?P<comment_id>\d+)/like")
+def _like_comment(state, user, m, query, body):
+    _comment_or_404(state, m["comment_id"]).likes.add(user.id)
+    return 201, None
+
+
+@route("DELETE", r"/api/v1/playlists/comments/(?P<comment_id>\d+)/like")
+def _unlike_comment(state, user, m, query, body):
+    _comment_or_404(state, m["comment_id"]).likes.discard(user.id)
+    return 204, None
+
+
+# --- search -------------------------------------------------------------------
+def _search_query(query: dict) -> str:
+    q = (query.get("query") or "").strip()
+    if not q:
+        raise HttpError(422, [{"loc": ["query", "query"], "msg": "Field required", "type": "missing"}])
+    return q.lower()
+
+
+def _match_songs(state, q):
+    return [s for s in state.songs.values() if q in s["title"].lower() or q in s["artist"].lower()]
+
+
+def _match_users(state, q):
+    return [u for u in state.users.values() if q in u.username.lower()]
+
+
+def _match_playlists(state, q, user):
+    return [p for p in state.visible_playlists(user) if q in p.title.lower()]
+
+
+@route("GET", "/api/v1/songs/search")
+def _search_songs(state, user, m, query, body):
+    q = _search_query(query)
+    hits = _match_songs(state, q)
+    page = _page(hits, query, "offset", "limit", 20)
+    return 200, {"query": q, "songs": [{"song": s, "relevance": 1.0} for s in page], "total": len(hits)}
+
+
+@route("GET", "/api/v1/songs/users/search")
+def _search_users(state, user, m, query, body):
+    q = _search_query(query)
+    hits = _match_users(state, q)
+    page = _page(hits, query, "offset", "limit", 20)
+    return 200, {"query": q, "users": [{"user": state.user_json(u), "relevance": 1.0} for u in page], "total": len(hits)}
+
+
+@route("GET", "/api/v1/songs/playlists/search")
+def _search_playlists(state, user, m, query, body):
+    q = _search_query(query)
+    hits = _match_playlists(state, q, user)
+    page = _page(hits, query, "offset", "limit", 20)
+    return 200, {
+        "query": q,
+        "playlists": [{"playlist": state.playlist_json(p, user), "relevance": 1.0} for p in page],
+        "total": len(hits),
+    }
+
+
+@route("GET", "/api/v1/songs/all")
+def _search_all(state, user, m, query, body):
+    q = _search_query(query)
+    kind = query.get("type") or "all"
+    songs = _match_songs(state, q) if kind in ("all", "songs") else []
+    users = _match_users(state, q) if kind in ("all", "users") else []
+    playlists = _match_playlists(state, q, user) if kind in ("all", "playlists") else []
+    return 200, {
+        "query": q,
+        "songs": [{"song": s, "relevance": 1.0} for s in _page(songs, query, "offset", "limit", 10)],
+        "users": [{"user": state.user_json(u), "relevance": 1.0} for u in _page(users, query, "offset", "limit", 10)],
+        "playlists": [
+            {"playlist": state.playlist_json(p, user), "relevance": 1.0}
+            for p in _page(playlists, query, "offset", "limit", 10)
+        ],
+        "total_songs": len(songs),
+        "total_users": len(users),
+        "total_playlists": len(playlists),
+    }
+
+
+@route("GET", "/", auth=False)
+def _root(state, user, m, query, body):
+    return 200, {"message": "SoundPuff stub API"}
+
+
+@route("GET", "/health", auth=False)
+def _health(state, user, m, query, body):
+    return 200, {"status": "ok"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SoundPuffStub/1.0"
+    # Headers and body go out in separate writes; without this Nagle adds ~40ms per response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        backend = self.server.backend
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        if method == "GET" and _MEDIA_PATH.match(path):
+            self._send_media(backend)
+            return
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        backend.delay()
+        try:
+            body = json.loads(raw) if raw else {}
+            status, payload = backend.handle(method, path, query, body, self.headers.get("Authorization"))
+        except HttpError as e:
+            status, payload = e.status, {"detail": e.detail}
+        except (ValueError, TypeError, KeyError) as e:
+            status, payload = 422, {"detail": str(e)}
+        self._send(status, payload)
+
+    def _send_media(self, backend) -> None:
+        # Media has its own latency knob: API latency shouldn't change playback numbers
+        if backend.media_latency_ms:
+            time.sleep(backend.media_latency_ms / 1000.0)
+        data = media_wav(backend.media_seconds)
+        start, end = 0, len(data) - 1
+        status = 200
+        # Chrome fetches media with Range requests and can only seek when they are honoured
+        spec = self.headers.get("Range", "")
+        if spec.startswith("bytes="):
+            first, _, last = spec[6:].split(",")[0].strip().partition("-")
+            if first:
+                start = int(first)
+                end = min(int(last), end) if last else end
+            elif last:
+                start = max(0, len(data) - int(last))
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 206
+        body = data[start:end + 1]
+        self.send_response(status)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Cache-Control", "no-store")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send(self, status: int, payload) -> None:
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+
+class StubBackend:
+    """Threaded HTTP server around a ``StubState``, with optional injected latency.
+
+    It also serves the songs' audio (``/media/song-<id>.wav``): a generated tone of
+    ``media_seconds`` so playback timings don't depend on a remote CDN.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rng_seed: int = 0,
+        media_seconds: float = MEDIA_SECONDS,
+        media_latency_ms: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.media_seconds = media_seconds
+        self.media_latency_ms = media_latency_ms
+        self._rng = random.Random(rng_seed)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.backend = self
+        self._thread = None
+        self.state = StubState(media_base_url=f"{self.url}/media")
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def delay(self) -> None:
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000.0)
+
+    def handle(self, method: str, path: str, query: dict, body: dict, authorization: str | None):
+        token = authorization[7:] if authorization and authorization.startswith("Bearer ") else None
+        with self.state.lock:
+            user = self.state.user_for_token(token)
+            for route_method, pattern, auth, fn in _ROUTES:
+                if route_method != method:
+                    continue
+                m = pattern.match(path)
+                if not m:
+                    continue
+                if auth and user is None:
+                    raise HttpError(401, "Not authenticated")
+                return fn(self.state, user, m, query, body)
+        raise HttpError(404, "Not Found")
+
+
+def parse_dataset(raw: str | None) -> dict:
+    """Parse "songs=200,users=20,playlists=40" into seed() keyword arguments."""
+    dataset = dict(DEFAULT_DATASET)
+    for item in (raw or "").split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            dataset[key.strip()] = int(value)
+    return dataset
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dataset", default="", help="e.g. songs=500,users=30,playlists=80")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--media-seconds", type=float, default=MEDIA_SECONDS)
+    parser.add_argument("--media-latency-ms", type=float, default=0.0)
+    parser.add_argument("--user", action="append", default=[], help="email:password account to create (repeatable)")
+    args = parser.parse_args(argv)
+
+    backend = StubBackend(
+        args.host,
+        args.port,
+        args.latency_ms,
+        args.jitter_ms,
+        media_seconds=args.media_seconds,
+        media_latency_ms=args.media_latency_ms,
+    )
+    backend.state.seed(**parse_dataset(args.dataset))
+    for item in args.user:
+        email, password = item.split(":", 1)
+        backend.state.follow_owners(backend.state.add_user(email.split("@")[0], email, password))
+    print(f"SoundPuff stub API listening on {backend.url}")
+    try:
+        backend._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+from selenium_tests.load import LOAD_BASE_URL, run_load
+
+# Opt-in: steps through LOAD_STEPS concurrent virtual users (see load.py)
+LOAD_TEST = os.getenv("LOAD_TEST", "0") in ("1", "true", "True")
+# Share of failed requests allowed in any step
+LOAD_MAX_ERROR_RATE = float(os.getenv("LOAD_MAX_ERROR_RATE", "0.01"))
+
+pytestmark = pytest.mark.skipif(not LOAD_TEST, reason="set LOAD_TEST=1 to run the API load test")
+
+
+def test_api_under_concurrent_users(stub_backend):
+    # With STUB_BACKEND=1 talk to the stub directly: the Vite proxy would be the bottleneck
+    base_url = os.getenv("LOAD_BASE_URL") or (stub_backend.url if stub_backend is not None else LOAD_BASE_URL)
+    print()
+    results = run_load(base_url, log=lambda line: print(f"   [Load] {line}"))
+
+    over = [f"{r.users} users: {r.error_rate:.2%}" for r in results if r.error_rate > LOAD_MAX_ERROR_RATE]
+    assert not over, f"error rate above {LOAD_MAX_ERROR_RATE:.2%} at " + ", ".join(over)
@@ -1,9 +1,12 @@
 import os
-import time
+
+import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from selenium_tests.baseline import check_baseline
+from selenium_tests.perf import record_benchmark, run_benchmark
 from selenium_tests.ui_helpers import (
     BASE_URL,
     login_with_env,
@@ -11,29 +14,51 @@ from selenium_tests.ui_helpers import (
     submit_create_playlist_form,
 )
 
+# Timed scenarios: keep the full profile so they stay comparable with the baseline
+pytestmark = pytest.mark.full_profile
+
 
 def test_login(browser):
-    login_with_env(browser)
+    # Always exercise the real login form here; other tests reuse the cached token.
+    def _measure(run):
+        if browser.current_url.startswith(BASE_URL):
+            browser.execute_script("window.localStorage.clear();")
+        run.start()
+        login_with_env(browser, use_cache=False)
+        run.stop()
+
+    result = run_benchmark("login", _measure)
+    record_benchmark(result)
     assert "/app/" in browser.current_url
+    check_baseline(result)
 
 
-def test_create_playlist(browser):
+def test_create_playlist(browser, resources):
     login_with_env(browser)
 
-    # go to create playlist page
-    browser.get(f"{BASE_URL}/app/create-playlist")
-    wait = WebDriverWait(browser, 10)
-    wait.until(EC.presence_of_element_located((By.ID, "title")))
+    def _measure(run):
+        # go to create playlist page
+        browser.get(f"{BASE_URL}/app/create-playlist")
+        wait = WebDriverWait(browser, 10)
+        wait.until(EC.presence_of_element_located((By.ID, "title")))
+
+        # fill title and description
+        title = resources.name("playlist")
+        resources.track_title(title)
+        browser.find_element(By.ID, "title").send_keys(title)
+        try:
+            browser.find_element(By.ID, "description").send_keys("Created by automated Selenium test")
+        except Exception:
+            pass
 
-    # fill title and description
-    title = f"selenium-playlist-{int(time.time())}"
-    browser.find_element(By.ID, "title").send_keys(title)
-    try:
-        browser.find_element(By.ID, "description").send_keys("Created by automated Selenium test")
-    except Exception:
-        pass
+        select_first_song_on_create_playlist(browser)
 
-    select_first_song_on_create_playlist(browser)
+        # measured: submit -> library
+        run.start()
+        submit_create_playlist_form(browser)
+        run.stop()
 
-    submit_create_playlist_form(browser)
+    result = run_benchmark("playlist_create", _measure)
+    record_benchmark(result)
     assert "/app/library" in browser.current_url
+    check_baseline(result)
@@ -1,9 +1,7 @@
 import os
 import time
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -12,17 +10,9 @@ BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
 
 
 @pytest.fixture
-def driver():
-    opts = Options()
-    headless = os.getenv("HEADLESS", "1") in ("1", "true", "True")
-    if headless:
-        opts.add_argument("--headless=new")
-        opts.add_argument("--disable-gpu")
-    # Use Selenium 4's built-in Selenium Manager to obtain a driver automatically
-    driver = webdriver.Chrome(options=opts)
-    driver.set_window_size(1280, 800)
-    yield driver
-    driver.quit()
+def driver(browser):
+    # Reuse the pooled Chrome from conftest instead of launching a dedicated one.
+    return browser
 
 
 def test_home_title(driver):
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from selenium_tests.crowd import ACTIONS, BrowserHost, run_journey, run_users, summary_lines
+from selenium_tests.load import env_accounts
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.ui_helpers import login_cached
+
+# Opt-in: number of simulated users, spread over CROWD_BROWSERS Chrome processes
+CROWD_USERS = int(os.getenv("CROWD_USERS", "0"))
+CROWD_BROWSERS = int(os.getenv("CROWD_BROWSERS", "2"))
+CROWD_DURATION_S = float(os.getenv("CROWD_DURATION_S", "60"))
+# Pause between journeys per user, seconds (uniform 0..N)
+CROWD_THINK_S = float(os.getenv("CROWD_THINK_S", "1"))
+# Uncontended journeys by a single user before the crowd starts
+CROWD_SOLO_ROUNDS = int(os.getenv("CROWD_SOLO_ROUNDS", "3"))
+CROWD_MAX_ERROR_RATE = float(os.getenv("CROWD_MAX_ERROR_RATE", "0.05"))
+
+pytestmark = [
+    pytest.mark.skipif(CROWD_USERS <= 0, reason="set CROWD_USERS=N to run the browser-context crowd"),
+    pytest.mark.full_profile,
+]
+
+
+def test_concurrent_users_in_browser_contexts(browser, browser_pool, resources):
+    # Everyone reads and likes the same playlist: that's where contention shows
+    playlist = resources.playlist("crowd")
+    accounts = env_accounts()
+    # Likes are per account; users sharing one would toggle each other's state
+    like = len(set(accounts)) >= CROWD_USERS
+
+    hosts = [BrowserHost(browser)]
+    extra = [browser_pool.acquire(fresh=True) for _ in range(max(0, CROWD_BROWSERS - 1))]
+    hosts += [BrowserHost(drv) for drv in extra]
+    try:
+        solo = hosts[0].add_user(0, accounts[0])
+        login_cached(solo.driver, *solo.account)
+        for _ in range(CROWD_SOLO_ROUNDS):
+            run_journey(solo, playlist["id"], like=like)
+
+        users = [hosts[i % len(hosts)].add_user(i + 1, accounts[i % len(accounts)]) for i in range(CROWD_USERS)]
+        elapsed = run_users(users, playlist["id"], CROWD_DURATION_S, CROWD_THINK_S, like=like)
+    finally:
+        for host in hosts:
+            host.close()
+        for drv in extra:
+            browser_pool.release(drv, poisoned=True)
+
+    print()
+    print(f"   [Crowd] {CROWD_USERS} users in {len(hosts)} Chrome processes for {elapsed:.0f}s")
+    if not like:
+        print(f"   [Crowd] likes skipped: {len(set(accounts))} accounts for {CROWD_USERS} users (set TEST_ACCOUNTS)")
+    for line in summary_lines(users, solo):
+        print(f"   [Crowd] {line}")
+    notes = {"users": CROWD_USERS, "browsers": len(hosts)}
+    for action in ACTIONS:
+        samples = [s for u in users for s in u.timings[action]]
+        if samples:
+            solo_p50 = solo.p50(action) if solo.timings[action] else None
+            record_benchmark(BenchmarkResult(scenario=f"crowd_{action}", samples=samples, notes={**notes, "solo_p50": solo_p50}))
+
+    attempts = sum(len(u.timings[a]) for u in users for a in ACTIONS) + sum(len(u.errors) for u in users)
+    errors = [e for u in users for e in u.errors]
+    assert attempts, "no user finished an action"
+    assert len(errors) / attempts <= CROWD_MAX_ERROR_RATE, f"{len(errors)}/{attempts} actions failed, e.g. {errors[0]}"
@@ -1,19 +1,27 @@
-import time
 import pytest
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from selenium_tests.baseline import check_baseline
+from selenium_tests.locators import Home, Landing, Profile, Search
+from selenium_tests.perf import assert_budget, record_benchmark, run_benchmark
 from selenium_tests.ui_helpers import (
     BASE_URL,
+    Probe,
     login_with_env,
-    click_with_fallback
+    click_with_fallback,
+    network_mark,
+    network_tracker,
+    wait_for_probe,
+    wait_for_request,
+    wait_until,
 )
 
 # ----------------------------------------------------------------
 # TEST 1: ARAMA FONKSİYONU (UC-09)
 # ----------------------------------------------------------------
+@pytest.mark.lean
 def test_search_functionality(browser):
     """
     SearchPage.tsx testleri:
@@ -29,32 +37,34 @@ def test_search_functionality(browser):
 
     # 2. Input'u bul
     search_input = wait.until(
-        EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Search for songs, playlists, or users...']"))
+        EC.visibility_of_element_located(Search.INPUT)
     )
     
     # 3. Arama yap: "Rock"
     search_term = "Pop" 
     search_input.clear()
+    mark = network_mark(browser)
     search_input.send_keys(search_term)
-    time.sleep(1) # Sonuçları bekle
+    wait_for_request(browser, "/songs/all", since=mark) # Sonuçları bekle
     
     # 4. Şarkı sonuçlarının geldiğini doğrula
     try:
-        wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(text(), 'Songs')]")))
+        wait.until(EC.presence_of_element_located(Search.SONGS_HEADING))
     except:
         print("Uyarı: 'Songs' başlığı bulunamadı, arama sonucu boş olabilir.")
     
     assert search_term in browser.page_source or "No results found" in browser.page_source
 
     # 5. Tab Değişikliği Testi - Users Tabına Geç
-    users_tab = browser.find_element(By.XPATH, "//button[normalize-space()='Users']")
+    users_tab = browser.find_element(*Search.tab("users"))
     click_with_fallback(browser, users_tab)
-    time.sleep(1)
+    wait_until(browser, lambda d: users_tab.get_attribute("data-state") == "active")
 
 
 # ----------------------------------------------------------------
 # TEST 2: SOSYAL ETKİLEŞİM - FOLLOW (UC-07) - GÜNCELLENDİ
 # ----------------------------------------------------------------
+@pytest.mark.lean
 def test_follow_unfollow_flow(browser):
     """
     ProfilePage.tsx testleri: Follow / Unfollow işlemi.
@@ -67,58 +77,58 @@ def test_follow_unfollow_flow(browser):
     
     # wait for input
     search_input = wait.until(
-        EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Search for songs, playlists, or users...']"))
+        EC.visibility_of_element_located(Search.INPUT)
     )
     search_input.clear()
     
     #a real username to search
     target_user = "lura"
+    mark = network_mark(browser)
     search_input.send_keys(target_user)
-    time.sleep(2) # Sonuçları bekle
+    wait_for_request(browser, "/songs/all", since=mark) # Sonuçları bekle
     
     # click on users tab
-    users_tab = browser.find_element(By.XPATH, "//button[normalize-space()='Users']")
+    users_tab = browser.find_element(*Search.tab("users"))
     click_with_fallback(browser, users_tab)
-    time.sleep(1)
+    wait_until(browser, lambda d: users_tab.get_attribute("data-state") == "active")
 
     # click on the first user from the list
     try:
        #we can click from avatar or name
-        first_user = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'bg-gray-900')]//img | //div[contains(@class, 'bg-gray-900')]//p")))
+        first_user = wait.until(EC.element_to_be_clickable(Search.USER_CARD_LINK))
         click_with_fallback(browser, first_user)
     except:
         pytest.skip(f"Arama sonucunda '{target_user}' için kullanıcı bulunamadı, veritabanını kontrol et.")
 
-    # find profile page
+    # find profile page: Edit Profile (own profile) and the follow button in one probe per tick
+    profile_buttons = {
+        "edit": Probe(Profile.EDIT, text=False),
+        "follow": Probe(Profile.FOLLOW, limit=1),
+    }
     try:
-        
-        if len(browser.find_elements(By.XPATH, "//button[contains(normalize-space(), 'Edit Profile')]")) > 0:
+        state = wait_for_probe(
+            browser,
+            profile_buttons,
+            lambda r: r if r["edit"].count or r["follow"].count else None,
+            timeout=15,
+        )
+        if state["edit"].count:
              pytest.skip("Kendi profilimize (login olduğumuz hesap) denk geldik, follow testi yapılamaz.")
              return
 
-        # wait for Follow/Unfollow buttons
-        follow_btn = wait.until(EC.presence_of_element_located((
-            By.XPATH, 
-            "//button[contains(normalize-space(), 'Follow') or contains(normalize-space(), 'Unfollow') or contains(normalize-space(), 'Following')]"
-        )))
-        
-        initial_text = follow_btn.text
+        initial_text = state["follow"].texts[0]
         print(f"   [Bilgi] Başlangıç Durumu: {initial_text}")
         
         # click
+        follow_btn = browser.find_element(*Profile.FOLLOW)
         click_with_fallback(browser, follow_btn)
         
-        # wait for the text change
-        def text_has_changed(driver):
-            try:
-                btn = driver.find_element(By.XPATH, "//button[contains(normalize-space(), 'Follow') or contains(normalize-space(), 'Unfollow') or contains(normalize-space(), 'Following')]")
-                return btn.text != initial_text
-            except:
-                return False
-            
-        wait.until(text_has_changed)
-        
-        new_text = browser.find_element(By.XPATH, "//button[contains(normalize-space(), 'Follow') or contains(normalize-space(), 'Unfollow') or contains(normalize-space(), 'Following')]").text
+        # wait for the text change (tek round-trip / tick)
+        def text_has_changed(results):
+            texts = results["follow"].texts
+            return texts[0] if texts and texts[0] != initial_text else None
+
+        new_text = wait_for_probe(browser, {"follow": profile_buttons["follow"]}, text_has_changed, timeout=15)
         print(f"   [Başarılı] Follow durumu değişti: {initial_text} -> {new_text}")
         
     except Exception as e:
@@ -129,34 +139,47 @@ def test_follow_unfollow_flow(browser):
 # ----------------------------------------------------------------
 # TEST 3: FEED PERFORMANS & SCROLL (UC-08 & NFR-4)
 # ----------------------------------------------------------------
+@pytest.mark.full_profile
 def test_feed_performance(browser):
     """
     HomePage.tsx testleri: Feed yüklenme hızı.
+    BENCHMARK_RUNS/BENCHMARK_WARMUP ile birden fazla ölçüm alınır; bütçe p90 üzerinden.
     """
     login_with_env(browser)
-    browser.get(f"{BASE_URL}/app/home")
-    wait = WebDriverWait(browser, 15)
+    tracker = network_tracker(browser)
 
-    start_time = time.time()
+    def _measure(run):
+        mark = tracker.mark()
+        browser.get(f"{BASE_URL}/app/home")
+        wait = WebDriverWait(browser, 15)
+        run.start()
 
-    # 1. "Your Feed" başlığının gelmesini bekle
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h1[contains(text(), 'Your Feed')]")))
-    
-    # 2. Kartların görünür olmasını bekle
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h1[contains(text(), 'Your Feed')]/..//h3")))
+        # 1. "Your Feed" başlığının gelmesini bekle
+        wait.until(EC.presence_of_element_located(Home.FEED_HEADING))
+
+        # 2. Kartların görünür olmasını bekle
+        wait.until(EC.presence_of_element_located(Home.FEED_CARD_TITLE))
+        run.stop()
+
+        # Backend vs. render payı: feed isteğinin CDP zamanlamaları
+        feed_reqs = tracker.wait_for("/playlists/feed", since=mark)
+        run.note("api_ms", max(r.duration_ms for r in feed_reqs))
+        run.note("backend_ms", max(r.backend_ms or 0.0 for r in feed_reqs))
+
+    result = run_benchmark("feed_load", _measure)
+    record_benchmark(result)
+    print(f"   [Performans] Feed Load Time: {result.summary()}")
 
-    end_time = time.time()
-    load_time = end_time - start_time
-    
-    print(f"   [Performans] Feed Load Time: {load_time:.2f}s")
-    
     # NFR-4: 2 saniye kuralı (Frontend render payı ile 3s)
-    assert load_time < 3.0, f"Feed çok yavaş yüklendi: {load_time}s"
+    assert_budget(result, p90=3.0)
+    # Bütçe içinde olsa bile önceki koşulara göre anlamlı yavaşlama hata sayılır
+    check_baseline(result)
 
 
 # ----------------------------------------------------------------
 # TEST 4: GUEST ERİŞİM KISITLAMASI (UC-03)
 # ----------------------------------------------------------------
+@pytest.mark.lean
 def test_guest_cannot_access_protected_routes(browser):
     """
     Guest Kullanıcı Testleri: Login olmadan erişim denemesi.
@@ -178,44 +201,54 @@ def test_guest_cannot_access_protected_routes(browser):
     wait = WebDriverWait(browser, 10)
     
     # "Share Your Music" veya benzeri landing page metni
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(text(), 'Share Your Music')]")))
+    wait.until(EC.presence_of_element_located(Landing.HEADING))
 
 # ----------------------------------------------------------------
 # TEST 5: SEARCH PERFORMANCE (NFR-4 variant)
 # ----------------------------------------------------------------
+@pytest.mark.full_profile
 def test_search_response_time(browser):
     """
     Performance Test: Measures how fast search results appear.
-    Criteria: Results should appear within 2 seconds (NFR-4).
+    Criteria: Results should appear within 2 seconds (NFR-4), judged on p90 of
+    BENCHMARK_RUNS samples.
     """
     login_with_env(browser)
-    wait = WebDriverWait(browser, 15)
-    
-    # 1. Arama sayfasına git
-    browser.get(f"{BASE_URL}/app/search")
-    
-    # 2. Input'u bul
-    search_input = wait.until(
-        EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Search for songs, playlists, or users...']"))
-    )
-    
-    # 3. Sayacı başlat ve Arama yap
-    search_term = "Pop"
-    search_input.clear()
-    
-    start_time = time.time() # Kronometre başla ⏱️
-    search_input.send_keys(search_term)
-    
-    # 4. Sonuçların DOM'a düşmesini bekle (Songs veya Users başlığı)
-    # Not: React state update + Network gecikmesi dahil süre
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(text(), 'Songs')] | //h2[contains(text(), 'Users')]")))
-    
-    end_time = time.time() # Kronometre dur 🛑
-    
-    response_time = end_time - start_time
-    print(f"   [Performans] Search Response Time: {response_time:.2f}s")
-    
-    # Hedef: 2.0 saniyenin altında olmalı
-    assert response_time < 2.0, f"Arama çok yavaş: {response_time:.2f}s (Hedef: < 2.0s)"
+    tracker = network_tracker(browser)
 
-   
\ No newline at end of file
+    def _measure(run):
+        wait = WebDriverWait(browser, 15)
+
+        # 1. Arama sayfasına git
+        browser.get(f"{BASE_URL}/app/search")
+
+        # 2. Input'u bul
+        search_input = wait.until(
+            EC.visibility_of_element_located(Search.INPUT)
+        )
+
+        # 3. Sayacı başlat ve Arama yap
+        search_term = "Pop"
+        search_input.clear()
+
+        mark = tracker.mark()
+        run.start() # Kronometre başla ⏱️
+        search_input.send_keys(search_term)
+
+        # 4. Arama isteğinin bitmesini, sonra sonuçların DOM'a düşmesini bekle (Songs veya Users başlığı)
+        # Not: React state update + Network gecikmesi dahil süre
+        search_reqs = tracker.wait_for("/songs/all", since=mark)
+        wait.until(EC.presence_of_element_located(Search.RESULTS_HEADING))
+        run.stop() # Kronometre dur 🛑
+
+        run.note("api_ms", search_reqs[-1].duration_ms)
+        run.note("backend_ms", search_reqs[-1].backend_ms or 0.0)
+        run.note("requests", len(search_reqs))
+
+    result = run_benchmark("search_response", _measure)
+    record_benchmark(result)
+    print(f"   [Performans] Search Response Time: {result.summary()}")
+
+    # Hedef: 2.0 saniyenin altında olmalı
+    assert_budget(result, p90=2.0)
+    check_baseline(result)
@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+
+from selenium_tests.locators import REGISTRY, Library, Playlist, xpath
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.ui_helpers import Probe, login_with_env, open_library, open_playlist
+
+# Opt-in: seeds a large playlist and times every registered locator in the page
+LOCATOR_BENCHMARK = os.getenv("LOCATOR_BENCHMARK", "0") in ("1", "true", "True")
+LOCATOR_BENCHMARK_SONGS = int(os.getenv("LOCATOR_BENCHMARK_SONGS", "300"))
+LOCATOR_BENCHMARK_REPS = int(os.getenv("LOCATOR_BENCHMARK_REPS", "200"))
+
+pytestmark = [
+    pytest.mark.skipif(not LOCATOR_BENCHMARK, reason="set LOCATOR_BENCHMARK=1 to run selector benchmarks"),
+    pytest.mark.full_profile,
+]
+
+# The text/class-substring XPaths the registry replaced, timed side by side for comparison
+LEGACY = {
+    "legacy.selected_count": xpath("//span[contains(normalize-space(.), 'selected')]"),
+    "legacy.follow_button": xpath(
+        "//button[contains(normalize-space(), 'Follow') or contains(normalize-space(), 'Unfollow') "
+        "or contains(normalize-space(), 'Following')]"
+    ),
+    "legacy.playlist_like": xpath(
+        "//div[contains(@class,'flex items-center gap-4 mt-6')]//button[.//*[name()='svg' and contains(@class,'w-8')]]"
+    ),
+    "legacy.playlist_likes": xpath("//span[contains(normalize-space(), 'likes')]"),
+    "legacy.song_row": xpath("//div[contains(@class, 'group') and contains(@class, 'grid-cols')]"),
+    "legacy.player_bar": xpath("//div[contains(@class, 'fixed') and contains(@class, 'bottom-0')]"),
+    "legacy.pause_button": xpath("//button[.//svg[contains(@class, 'lucide-pause')]]"),
+    "legacy.library_heading": xpath("//h1[contains(normalize-space(.),'My Playlists')]"),
+}
+
+# Runs each query `reps` times in a few batches; returns per-lookup ms per batch and match count
+_TIME_LOCATORS_JS = r"""
+const queries = arguments[0], reps = arguments[1], batches = 5;
+const run = (q) => q.xpath
+  ? document.evaluate(q.selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength
+  : document.querySelectorAll(q.selector).length;
+const out = {};
+for (const name of Object.keys(queries)) {
+  const q = queries[name];
+  const samples = [];
+  let count = 0;
+  for (let b = 0; b < batches; b++) {
+    const n = Math.max(1, Math.floor(reps / batches));
+    const t0 = performance.now();
+    for (let i = 0; i < n; i++) count = run(q);
+    samples.push((performance.now() - t0) / n);
+  }
+  out[name] = { samples: samples, count: count };
+}
+return { results: out, nodes: document.getElementsByTagName('*').length };
+"""
+
+
+def _time_locators(browser, page: str, locators: dict) -> list:
+    queries = {name: Probe(locator).to_js() for name, locator in locators.items()}
+    data = browser.execute_script(_TIME_LOCATORS_JS, queries, LOCATOR_BENCHMARK_REPS)
+    rows = []
+    for name, timing in data["results"].items():
+        result = BenchmarkResult(
+            scenario=f"locator:{page}:{name}",
+            samples=[ms / 1000.0 for ms in timing["samples"]],
+            notes={"matches": timing["count"], "dom_nodes": data["nodes"]},
+        )
+        record_benchmark(result)
+        rows.append((name, result.p50 * 1e6, timing["count"]))
+
+    # Round-trip cost of the same lookup through WebDriver, for a couple of locators
+    for name in ("Playlist.SONG_ROW", "legacy.song_row"):
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            browser.find_elements(*locators[name])
+            samples.append(time.perf_counter() - start)
+        result = BenchmarkResult(scenario=f"locator:{page}:{name}:find_elements", samples=samples)
+        record_benchmark(result)
+        rows.append((f"{name} (find_elements)", result.p50 * 1e6, None))
+    return rows
+
+
+def _print_rows(page: str, rows: list) -> None:
+    print(f"\n   [Locator] {page}")
+    for name, us, count in sorted(rows, key=lambda r: -r[1]):
+        matches = "" if count is None else f" matches={count}"
+        print(f"   {name:<44} {us:>10.1f}us{matches}")
+
+
+def test_locator_cost_on_large_playlist(browser, api, resources):
+    song_ids = api.song_ids(LOCATOR_BENCHMARK_SONGS)
+    playlist = resources.playlist("locators", song_ids)
+
+    login_with_env(browser)
+    open_playlist(browser, playlist["id"])
+    browser.find_element(*Playlist.SONG_ROW)
+
+    locators = {**REGISTRY, **LEGACY, "Library.playlist_title": Library.playlist_title(playlist["title"])}
+    rows = _time_locators(browser, "playlist", locators)
+    _print_rows(f"playlist ({len(song_ids)} songs)", rows)
+    assert any(name == "Playlist.SONG_ROW" and count == len(song_ids) for name, _us, count in rows)
+
+    open_library(browser)
+    _print_rows("library", _time_locators(browser, "library", locators))
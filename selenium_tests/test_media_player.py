@@ -1,13 +1,14 @@
-import time
+import re
 import pytest
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from selenium_tests.locators import Home, Playlist, PlayerBar
 from selenium_tests.ui_helpers import (
     BASE_URL,
     login_with_env,
-    click_with_fallback
+    click_with_fallback,
+    wait_for_network_idle,
 )
 
 # ----------------------------------------------------------------
@@ -22,7 +23,7 @@ def test_media_player_controls(browser):
     
     # 1. Ana sayfaya git
     browser.get(f"{BASE_URL}/app/home")
-    time.sleep(2) # Sayfa yüklenmesini bekle
+    wait_for_network_idle(browser) # Sayfa yüklenmesini bekle
 
     # 2. Bir Playlist'e Gir
     # Hero Banner varsa "Play Now" butonu bizi playlist sayfasına atar.
@@ -30,13 +31,13 @@ def test_media_player_controls(browser):
     try:
         try:
             # Hero Banner "Play Now" butonu (Navigate eder)
-            hero_btn = browser.find_element(By.XPATH, "//button[contains(normalize-space(), 'Play Now')]")
+            hero_btn = browser.find_element(*Home.PLAY_NOW)
             click_with_fallback(browser, hero_btn)
             print("   [Adım] Hero Banner üzerinden playlist sayfasına gidiliyor...")
         except:
             # Hero yoksa ilk karta tıkla
             print("   [Bilgi] Hero Banner yok, listeden bir playlist seçiliyor...")
-            first_card_title = wait.until(EC.element_to_be_clickable((By.XPATH, "(//h3)[1]")))
+            first_card_title = wait.until(EC.element_to_be_clickable(Home.CARD_TITLE))
             click_with_fallback(browser, first_card_title)
         
         # Playlist sayfasına girdiğimizi doğrula
@@ -48,8 +49,8 @@ def test_media_player_controls(browser):
 
     # 3. Listeden Bir Şarkıya Tıkla (Player'ı tetiklemek için)
     try:
-        # Şarkı listesinin yüklenmesini bekle (Grup class'ı olan divler şarkı satırlarıdır)
-        first_song_row = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'group') and contains(@class, 'grid-cols')]")))
+        # Şarkı listesinin yüklenmesini bekle
+        first_song_row = wait.until(EC.element_to_be_clickable(Playlist.SONG_ROW))
         
         click_with_fallback(browser, first_song_row)
         print("   [Adım] Listedeki ilk şarkıya tıklandı.")
@@ -59,23 +60,20 @@ def test_media_player_controls(browser):
 
     # 4. Player Bar'ın Görünmesini Bekle
     try:
-        # 'fixed bottom-0' sınıfına sahip div (Player Bar)
-        player_bar = wait.until(EC.visibility_of_element_located((By.XPATH, "//div[contains(@class, 'fixed') and contains(@class, 'bottom-0')]")))
+        player_bar = wait.until(EC.visibility_of_element_located(PlayerBar.ROOT))
         print("   [Kontrol] Player Bar açıldı.")
     except:
-        browser.save_screenshot("player_bar_error.png")
         pytest.fail("Şarkıya tıklanmasına rağmen Player Bar açılmadı!")
 
     # 5. Play/Pause Testi
     try:
         # Şarkı başladığı için Pause butonu görünmeli
-        pause_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[.//svg[contains(@class, 'lucide-pause')]]")))
+        pause_btn = wait.until(EC.element_to_be_clickable(PlayerBar.PAUSE))
         click_with_fallback(browser, pause_btn)
         print("   [Adım] Şarkı duraklatıldı (Pause).")
-        time.sleep(1)
 
         # Şimdi Play butonu görünmeli
-        play_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'fixed')]//button[.//svg[contains(@class, 'lucide-play')]]")))
+        play_btn = wait.until(EC.element_to_be_clickable(PlayerBar.PLAY))
         click_with_fallback(browser, play_btn)
         print("   [Adım] Şarkı tekrar başlatıldı (Play).")
         
@@ -88,6 +86,7 @@ def test_media_player_controls(browser):
 # ----------------------------------------------------------------
 # TEST 2: PLAYLIST LIKE / UNLIKE (UC-11 & FR-10)
 # ----------------------------------------------------------------
+@pytest.mark.lean
 def test_playlist_social_interaction(browser):
     print("\n----------------------------------------------------------------")
     print("   [TEST 2] BAŞLIYOR: Playlist Beğeni (Like/Unlike)")
@@ -98,49 +97,35 @@ def test_playlist_social_interaction(browser):
     # 1. Playlist Sayfasına Git
     if "/playlist/" not in browser.current_url:
         browser.get(f"{BASE_URL}/app/home")
-        time.sleep(2)
+        wait_for_network_idle(browser)
         try:
-            playlist_title = wait.until(EC.element_to_be_clickable((By.XPATH, "(//h3)[1]")))
+            playlist_title = wait.until(EC.element_to_be_clickable(Home.CARD_TITLE))
             click_with_fallback(browser, playlist_title)
             wait.until(EC.url_contains("/playlist/"))
             print(f"   [Adım] Playlist detay sayfasına girildi.")
         except:
             pytest.skip("Playlist detay sayfasına gidilemedi.")
 
-    # 2. Like Butonunu Bul (Header'daki)
-    # STRATEJİ: Header'daki "likes" yazısını (örn: "5 likes") referans alarak yanındaki butonu buluyoruz.
-    # Bu yöntem, sayfadaki diğer kalp ikonlarıyla karışmasını %100 engeller.
-    # 2. Header Like Butonunu Bul (Frontend değiştirmeden)
+    # 2. Header Like Butonunu Bul (data-testid: sayfadaki diğer kalp ikonlarıyla karışmaz)
     try:
-        likes_text_element = wait.until(
-            EC.visibility_of_element_located(
-                (By.XPATH, "//span[contains(normalize-space(), 'likes')]")
-            )
-        )
-
-        # Aynı satırdaki (container) ilk button = playlist like
-        header_like_btn = likes_text_element.find_element(
-            By.XPATH,
-            "ancestor::div[contains(@class,'flex')][1]//button[1]"
-        )
+        likes_text_element = wait.until(EC.visibility_of_element_located(Playlist.LIKES))
+        header_like_btn = browser.find_element(*Playlist.LIKE)
 
         browser.execute_script(
             "arguments[0].scrollIntoView({block:'center'});",
             header_like_btn
         )
-        time.sleep(0.5)
 
         print(f"   [Bilgi] Mevcut durum: {likes_text_element.text}")
 
         click_with_fallback(browser, header_like_btn)
         print("   [Adım] Header Like butonuna tıklandı.")
 
-        time.sleep(1)
+        wait_for_network_idle(browser)
         print("   [Başarılı] Like işlemi tamamlandı.")
 
     except Exception as e:
         print(f"   [Hata] Header Like butonu bulunamadı: {e}")
-        browser.save_screenshot("like_error.png")
         raise
 
     print("   [TEST 2] TAMAMLANDI ✅")
@@ -149,7 +134,8 @@ def test_playlist_social_interaction(browser):
 
 # TEST 3: COMMENTING SYSTEM (UC-12 & FR-11)
 # ----------------------------------------------------------------
-def test_comment_submission(browser):
+@pytest.mark.lean
+def test_comment_submission(browser, resources):
     print("\n----------------------------------------------------------------")
     print("   [TEST 3] BAŞLIYOR: Yorum Yapma")
     
@@ -159,20 +145,23 @@ def test_comment_submission(browser):
     # Playlist sayfasında olduğumuzdan emin olalım, değilsek gidelim
     if "/playlist/" not in browser.current_url:
         browser.get(f"{BASE_URL}/app/home")
-        time.sleep(2)
+        wait_for_network_idle(browser)
         try:
-            playlist_title = wait.until(EC.element_to_be_clickable((By.XPATH, "(//h3)[1]")))
+            playlist_title = wait.until(EC.element_to_be_clickable(Home.CARD_TITLE))
             click_with_fallback(browser, playlist_title)
             wait.until(EC.url_contains("/playlist/"))
         except:
             pytest.skip("Playlist sayfasına girilemedi.")
 
     # 2. Yorum Yaz
-    test_comment = f"Test {int(time.time())}"
+    test_comment = resources.name("comment")
+    # Başkasının playlist'ine yazılıyor; test bitince API üzerinden silinir
+    playlist_id = int(re.search(r"/playlist/(\d+)", browser.current_url).group(1))
+    resources.track_comment_text(playlist_id, test_comment)
     
     try:
         # Input alanını bul
-        comment_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Add a comment...']")))
+        comment_input = wait.until(EC.visibility_of_element_located(Playlist.COMMENT_INPUT))
         
         # Input'a scroll yap
         browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", comment_input)
@@ -181,13 +170,13 @@ def test_comment_submission(browser):
         comment_input.send_keys(test_comment)
         
         # Gönder butonunu bul (Input'un yanındaki buton)
-        send_btn = browser.find_element(By.XPATH, "//input[@placeholder='Add a comment...']/following-sibling::button")
+        send_btn = browser.find_element(*Playlist.COMMENT_SUBMIT)
         click_with_fallback(browser, send_btn)
         
         print(f"   [Adım] Yorum gönderildi: {test_comment}")
         
         # Yorumun sayfada göründüğünü doğrula (Biraz zaman tanıyarak)
-        wait.until(EC.text_to_be_present_in_element((By.XPATH, "//body"), test_comment))
+        wait.until(EC.presence_of_element_located(Playlist.comment_text(test_comment)))
         print("   [Başarılı] Yorum sayfada göründü.")
         
     except Exception as e:
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from selenium_tests.baseline import check_baselines
+from selenium_tests.locators import Playlist, PlayerBar
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.player_metrics import (
+    media_events,
+    media_mark,
+    media_state,
+    stall_count,
+    time_media_action,
+)
+from selenium_tests.ui_helpers import click_with_fallback, login_with_env, open_playlist, wait_for_js
+
+# Opt-in; with STUB_BACKEND=1 the audio comes from the stub's fixed-size files, so runs are reproducible
+PLAYER_BENCHMARK = os.getenv("PLAYER_BENCHMARK", "0") in ("1", "true", "True")
+PLAYER_BENCHMARK_TRACKS = int(os.getenv("PLAYER_BENCHMARK_TRACKS", "5"))
+PLAYER_BENCHMARK_ROUNDS = int(os.getenv("PLAYER_BENCHMARK_ROUNDS", "3"))
+# Seconds of playback per track before switching, the window in which stalls are counted
+PLAYER_BENCHMARK_LISTEN_S = float(os.getenv("PLAYER_BENCHMARK_LISTEN_S", "2"))
+SEEK_POSITIONS = (0.25, 0.5, 0.75)
+
+pytestmark = [
+    pytest.mark.skipif(not PLAYER_BENCHMARK, reason="set PLAYER_BENCHMARK=1 to run the player benchmark"),
+    pytest.mark.full_profile,
+]
+
+
+def _click_seek_bar(browser, seek_bar, fraction: float) -> None:
+    # Offsets are from the element's centre; Radix seeks on pointerdown
+    offset = int((fraction - 0.5) * seek_bar.size["width"])
+    ActionChains(browser).move_to_element_with_offset(seek_bar, offset, 0).click().perform()
+
+
+def _listen(browser, seconds: float) -> None:
+    """Let the current track play for ``seconds`` of media time."""
+    if seconds <= 0:
+        return
+    target = (media_state(browser) or {}).get("current_time", 0) + seconds
+    wait_for_js(
+        browser,
+        "const m = window.__spMedia; return m && m.current && m.current.currentTime >= args[0];",
+        target,
+        timeout=seconds * 3 + 10,
+        message=f"playback did not advance {seconds}s",
+    )
+
+
+def _click(browser, locator):
+    return lambda: click_with_fallback(browser, WebDriverWait(browser, 15).until(EC.element_to_be_clickable(locator)))
+
+
+def test_player_playback_latency(browser, api, resources):
+    song_ids = api.song_ids(PLAYER_BENCHMARK_TRACKS)
+    if len(song_ids) < 2:
+        pytest.skip("need at least two songs for track switching")
+    playlist = resources.playlist("player", song_ids)
+
+    login_with_env(browser)
+    timings = {"start": [], "seek": [], "next": [], "previous": []}
+    stalls, errors = 0, 0
+    for _ in range(PLAYER_BENCHMARK_ROUNDS):
+        # Fresh document each round: a new Audio element, nothing buffered
+        open_playlist(browser, playlist["id"])
+        mark = media_mark(browser)
+        timings["start"].append(time_media_action(browser, _click(browser, Playlist.SONG_ROW), "playing"))
+
+        seek_bar = WebDriverWait(browser, 15).until(EC.visibility_of_element_located(PlayerBar.SEEK))
+        for fraction in SEEK_POSITIONS:
+            timings["seek"].append(
+                time_media_action(browser, lambda f=fraction: _click_seek_bar(browser, seek_bar, f), "seeked")
+            )
+
+        for direction, locator in (("next", PlayerBar.NEXT), ("previous", PlayerBar.PREVIOUS)):
+            for _ in range(len(song_ids) - 1):
+                _listen(browser, PLAYER_BENCHMARK_LISTEN_S)
+                timings[direction].append(
+                    time_media_action(browser, _click(browser, locator), "playing", new_track=True)
+                )
+
+        events = media_events(browser, mark)
+        stalls += stall_count(events)
+        errors += sum(1 for e in events if e["type"] == "error")
+
+    notes = {"tracks": len(song_ids), "rounds": PLAYER_BENCHMARK_ROUNDS, "stalls": stalls, "errors": errors}
+    print()
+    results = []
+    for name, samples_ms in timings.items():
+        result = BenchmarkResult(scenario=f"player_{name}", samples=[ms / 1000.0 for ms in samples_ms], notes=notes)
+        record_benchmark(result)
+        print(f"   [Player] {result.summary()}")
+        results.append(result)
+    print(f"   [Player] stalls={stalls} errors={errors} over {PLAYER_BENCHMARK_ROUNDS} rounds of {len(song_ids)} tracks")
+    # A regression in one action must not keep the others from being stored and compared
+    check_baselines(results)
+
+    assert errors == 0, f"{errors} media errors during playback"
@@ -1,49 +1,44 @@
-import time
 import pytest
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from selenium_tests.locators import AddToPlaylistModal, Library, Playlist
 from selenium_tests.ui_helpers import (
-    BASE_URL,
+    Probe,
     login_with_env,
-    open_playlist_from_library,
-    submit_create_playlist_form,
-    select_first_song_on_create_playlist,
+    open_playlist,
+    probe,
+    wait_for_probe,
 )
 
+# Functional tests: images and fonts are not downloaded (see lean_profile.py)
+pytestmark = pytest.mark.lean
 
-def create_playlist(browser, title: str, timeout: int = 10):
-    browser.get(f"{BASE_URL}/app/create-playlist")
-    wait = WebDriverWait(browser, timeout)
-    wait.until(EC.presence_of_element_located((By.ID, "title")))
-    browser.find_element(By.ID, "title").send_keys(title)
-    select_first_song_on_create_playlist(browser, timeout=timeout)
-    submit_create_playlist_form(browser, timeout=timeout)
+
+def create_playlist(resources, kind: str) -> dict:
+    # Seed over REST: creating playlists through the form is covered by test_create_playlist.
+    # The tracker names it uniquely and deletes it after the test.
+    return resources.playlist(kind)
 
 
 def find_playlist_card_by_title(browser, title: str, timeout: int = 10):
     # Kept for backward compatibility in this file; use open_playlist_from_library instead.
-    els = browser.find_elements(By.XPATH, f"//h3[@title='{title}']")
+    els = browser.find_elements(*Library.playlist_title(title))
     return els[0] if els else None
 
 
 @pytest.mark.usefixtures("browser")
-def test_add_song_to_playlist(browser):
+def test_add_song_to_playlist(browser, resources):
     # Create two playlists (source and target)
-    login_with_env(browser)
-    title_src = f"selenium-src-{int(time.time())}"
-    create_playlist(browser, title_src)
-
-    title_tgt = f"selenium-tgt-{int(time.time())}"
-    create_playlist(browser, title_tgt)
+    src = create_playlist(resources, "src")
+    title_tgt = create_playlist(resources, "tgt")["title"]
 
-    # Open source playlist from library
-    open_playlist_from_library(browser, title_src, timeout=20)
+    login_with_env(browser)
+    open_playlist(browser, src["id"], timeout=20)
 
     # open first song menu
-    menu_buttons = browser.find_elements(By.XPATH, "//button[@aria-label='Open song menu']")
+    menu_buttons = browser.find_elements(*Playlist.SONG_MENU)
     if not menu_buttons:
         raise AssertionError(
             "No song menu buttons found. Ensure the playlist has at least one song and the Playlist page renders the song menu."
@@ -52,14 +47,14 @@ def test_add_song_to_playlist(browser):
 
     # click 'Add to another playlist'
     add_to_btn = WebDriverWait(browser, 5).until(
-        EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Add to another playlist']"))
+        EC.element_to_be_clickable(Playlist.ADD_TO_ANOTHER)
     )
     add_to_btn.click()
 
     # In modal, pick the target playlist
     # wait for modal button with title
     tgt_btn = WebDriverWait(browser, 5).until(
-        EC.element_to_be_clickable((By.XPATH, f"//button[normalize-space()='{title_tgt}']"))
+        EC.element_to_be_clickable(AddToPlaylistModal.target(title_tgt))
     )
     tgt_btn.click()
 
@@ -75,53 +70,55 @@ def test_add_song_to_playlist(browser):
     assert "added to playlist" in alert_text.lower() or "already in" in alert_text.lower()
 
 
+# "<n> likes" in the playlist header, read in a single in-page probe
+_LIKES = {"likes": Probe(Playlist.LIKES, text=False, match=r"^(\d+)", limit=1)}
+
+
+def _like_count(results) -> int:
+    numbers = results["likes"].numbers()
+    return numbers[0] if numbers else 0
+
+
 def _get_playlist_like_count(browser):
     # returns integer likes count shown on the playlist page
-    span = browser.find_element(By.XPATH, "//span[contains(text(),'likes')]")
-    text = span.text.strip()
-    try:
-        num = int(text.split()[0])
-    except Exception:
-        num = 0
-    return num
+    return _like_count(probe(browser, _LIKES))
 
 
-def test_like_and_unlike_playlist(browser):
-    login_with_env(browser)
-    title = f"selenium-like-{int(time.time())}"
-    create_playlist(browser, title)
+def _wait_for_like_count(browser, expected: int, timeout: float = 5) -> None:
+    wait_for_probe(browser, _LIKES, lambda r: _like_count(r) == expected, timeout=timeout)
 
-    open_playlist_from_library(browser, title, timeout=20)
+
+def test_like_and_unlike_playlist(browser, resources):
+    playlist = create_playlist(resources, "like")
+
+    login_with_env(browser)
+    open_playlist(browser, playlist["id"], timeout=20)
 
     before = _get_playlist_like_count(browser)
     # click like button in header (button containing the Heart icon)
-    header_like_btn = browser.find_element(
-        By.XPATH,
-        "//div[contains(@class,'flex items-center gap-4 mt-6')]//button[.//*[name()='svg' and contains(@class,'w-8')]]",
-    )
+    header_like_btn = browser.find_element(*Playlist.LIKE)
     header_like_btn.click()
-    time.sleep(0.5)
+    _wait_for_like_count(browser, before + 1)
     after_like = _get_playlist_like_count(browser)
     assert after_like == before + 1
 
     # unlike
     header_like_btn.click()
-    time.sleep(0.5)
+    _wait_for_like_count(browser, before)
     after_unlike = _get_playlist_like_count(browser)
     assert after_unlike == before
 
 
-def test_comment_like_delete_flow(browser):
-    login_with_env(browser)
-    title = f"selenium-comment-{int(time.time())}"
-    create_playlist(browser, title)
+def test_comment_like_delete_flow(browser, resources):
+    playlist = create_playlist(resources, "comment")
 
-    open_playlist_from_library(browser, title, timeout=20)
+    login_with_env(browser)
+    open_playlist(browser, playlist["id"], timeout=20)
 
-    comment_text = f"Automated comment {int(time.time())}"
+    comment_text = resources.name("comment")
     # find comment input
     input_el = WebDriverWait(browser, 5).until(
-        EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Add a comment...']"))
+        EC.presence_of_element_located(Playlist.COMMENT_INPUT)
     )
     input_el.clear()
     input_el.send_keys(comment_text)
@@ -130,26 +127,23 @@ def test_comment_like_delete_flow(browser):
 
     # wait for comment to appear
     comment_p = WebDriverWait(browser, 10).until(
-        EC.presence_of_element_located((By.XPATH, f"//p[normalize-space()='{comment_text}']"))
+        EC.presence_of_element_located(Playlist.comment_text(comment_text))
     )
     assert comment_p
 
     # like the comment
-    comment_container = comment_p.find_element(By.XPATH, "ancestor::div[contains(@class,'flex gap-3')]")
-    like_btn = comment_container.find_element(By.XPATH, ".//button[@aria-label='Like comment']")
-    likes_span = comment_container.find_element(By.XPATH, ".//button[@aria-label='Like comment']/following-sibling::span[1]")
-    before_likes = int(likes_span.text.strip() or 0)
+    comment_container = browser.find_element(*Playlist.comment_with_text(comment_text))
+    like_btn = comment_container.find_element(*Playlist.COMMENT_LIKE)
+    comment_likes = {"likes": Probe(Playlist.COMMENT_LIKES, root=comment_container, limit=1)}
+    before_likes = int(probe(browser, comment_likes)["likes"].texts[0] or 0)
     like_btn.click()
-    WebDriverWait(browser, 5).until(lambda d: int(likes_span.text.strip() or 0) >= before_likes + 1)
+    wait_for_probe(browser, comment_likes, lambda r: r["likes"].count and int(r["likes"].texts[0] or 0) >= before_likes + 1, timeout=5)
 
     # open comment menu and delete
-    menu_btn = comment_container.find_element(
-        By.XPATH,
-        ".//div[contains(@class,'absolute') and contains(@class,'top-2')]/button",
-    )
+    menu_btn = comment_container.find_element(*Playlist.COMMENT_MENU)
     menu_btn.click()
     del_btn = WebDriverWait(browser, 5).until(
-        EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Delete']"))
+        lambda _d: comment_container.find_element(*Playlist.COMMENT_DELETE)
     )
     del_btn.click()
     # confirm dialog
@@ -161,23 +155,21 @@ def test_comment_like_delete_flow(browser):
         pass
 
     # ensure comment removed
-    time.sleep(0.5)
-    elems = browser.find_elements(By.XPATH, f"//p[normalize-space()='{comment_text}']")
+    comment_probe = {"comment": Probe(Playlist.comment_text(comment_text), text=False)}
+    wait_for_probe(browser, comment_probe, lambda r: r["comment"].count == 0, timeout=5)
+    elems = browser.find_elements(*Playlist.comment_text(comment_text))
     assert not elems
 
 
-def test_delete_playlist(browser):
-    login_with_env(browser)
-    title = f"selenium-delete-{int(time.time())}"
-    create_playlist(browser, title)
+def test_delete_playlist(browser, resources):
+    playlist = create_playlist(resources, "delete")
 
-    open_playlist_from_library(browser, title, timeout=20)
+    login_with_env(browser)
+    open_playlist(browser, playlist["id"], timeout=20)
 
     # click Delete
     del_btn = WebDriverWait(browser, 5).until(
-        EC.element_to_be_clickable(
-            (By.XPATH, "//div[contains(@class,'flex items-center gap-4 mt-6')]//button[normalize-space()='Delete']")
-        )
+        EC.element_to_be_clickable(Playlist.DELETE)
     )
     del_btn.click()
     # confirm
@@ -0,0 +1,144 @@
+import os
+import time
+
+import pytest
+
+from selenium_tests.locators import Library, Playlist, Search
+from selenium_tests.page_metrics import runtime_metrics, scroll_frame_timings
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.ui_helpers import (
+    BASE_URL,
+    login_cached,
+    network_tracker,
+    probe,
+    wait_for_network_idle,
+    wait_for_probe,
+)
+
+# Opt-in: needs the stub backend (STUB_BACKEND=1), which is seeded in-process
+SCALE_TESTS = os.getenv("SCALE_TESTS", "0") in ("1", "true", "True")
+SCALE_LIBRARY_SIZES = [int(n) for n in os.getenv("SCALE_LIBRARY_SIZES", "10,100,1000").split(",")]
+SCALE_PLAYLIST_SIZES = [int(n) for n in os.getenv("SCALE_PLAYLIST_SIZES", "50,200,500").split(",")]
+SCALE_CATALOG_SIZES = [int(n) for n in os.getenv("SCALE_CATALOG_SIZES", "1000,10000").split(",")]
+SCALE_EMAIL = "scale@stub.soundpuff.test"
+SCALE_PASSWORD = "scale-password"
+
+pytestmark = [
+    pytest.mark.skipif(not SCALE_TESTS, reason="set SCALE_TESTS=1 (with STUB_BACKEND=1) to run scale tests"),
+    pytest.mark.full_profile,
+]
+
+# In-page time (ms since navigation start) of the last DOM mutation, from the page-metrics script
+_DOM_SETTLED_JS = """
+const v = window.__spVitals;
+if (!v || !v.visits.length) return null;
+const visit = v.visits[v.visits.length - 1];
+return visit.dom_settled_ms === null ? null : visit.start + visit.dom_settled_ms;
+"""
+
+
+@pytest.fixture(scope="module")
+def scale_state(stub_backend):
+    if stub_backend is None:
+        pytest.skip("scale tests seed the stub backend directly; set STUB_BACKEND=1")
+    state = stub_backend.state
+    user = state.add_user("scale", SCALE_EMAIL, SCALE_PASSWORD)
+    return state, user
+
+
+def _top_up_songs(state, total: int) -> list:
+    with state.lock:
+        for i in range(len(state.songs), total):
+            state.add_song(f"Scale Track {i + 1}", f"Scale Artist {i % 97}")
+        return sorted(state.songs)
+
+
+def _top_up_library(state, user, total: int) -> None:
+    song_ids = _top_up_songs(state, 8)[:8]
+    with state.lock:
+        owned = sum(1 for p in state.playlists.values() if p.user_id == user.id and p.title.startswith("Scale Library"))
+        for i in range(owned, total):
+            state.add_playlist(user.id, f"Scale Library {i + 1}", song_ids)
+
+
+def _measure(browser, scenario: str, size: int, rendered: int) -> dict:
+    """Render time, DOM size, heap and scroll frame timings of the page currently open."""
+    settled_ms = browser.execute_script(_DOM_SETTLED_JS)
+    metrics = runtime_metrics(browser)
+    scroll = scroll_frame_timings(browser)
+    row = {
+        "scenario": scenario,
+        "size": size,
+        "rendered": rendered,
+        "dom_settled_ms": settled_ms,
+        "dom_nodes": int(metrics.get("Nodes", 0)),
+        "js_heap_mb": round(metrics.get("JSHeapUsedSize", 0) / 2**20, 2),
+        **scroll,
+    }
+    result = BenchmarkResult(scenario=f"scale:{scenario}:{size}", samples=[(settled_ms or 0) / 1000.0], notes=row)
+    record_benchmark(result)
+    print(
+        f"   [Scale] {scenario:<9} size={size:<6} rendered={rendered:<5} settled={settled_ms or 0:>7.0f}ms "
+        f"nodes={row['dom_nodes']:<7} heap={row['js_heap_mb']:>6.1f}MB "
+        f"frame p95={scroll['frame_p95_ms'] or 0:.1f}ms dropped={scroll['dropped']}/{scroll['frames']}"
+    )
+    return row
+
+
+@pytest.mark.parametrize("size", SCALE_LIBRARY_SIZES)
+def test_library_scale(browser, scale_state, size):
+    state, user = scale_state
+    _top_up_library(state, user, size)
+
+    login_cached(browser, SCALE_EMAIL, SCALE_PASSWORD)
+    browser.get(f"{BASE_URL}/app/library")
+    wait_for_probe(browser, {"heading": Library.HEADING}, lambda r: r["heading"].count)
+    wait_for_network_idle(browser, idle_ms=300)
+    rendered = probe(browser, {"cards": Library.CARD_TITLE})["cards"].count
+
+    row = _measure(browser, "library", size, rendered)
+    assert rendered > 0
+    # LibraryPage only filters the first page of /playlists/; report when it can't show them all
+    if rendered < size:
+        print(f"   [Scale] library shows {rendered} of {size} owned playlists")
+    assert row["dom_nodes"] > 0
+
+
+@pytest.mark.parametrize("size", SCALE_PLAYLIST_SIZES)
+def test_playlist_scale(browser, scale_state, size):
+    state, user = scale_state
+    song_ids = _top_up_songs(state, max(size, 1))[:size]
+    playlist = state.add_playlist(user.id, f"Scale Playlist {size} {int(time.time())}", song_ids)
+
+    login_cached(browser, SCALE_EMAIL, SCALE_PASSWORD)
+    browser.get(f"{BASE_URL}/app/playlist/{playlist.id}")
+    results = wait_for_probe(
+        browser,
+        {"rows": Playlist.SONG_ROW},
+        lambda r: r if r["rows"].count >= size else None,
+        timeout=60,
+    )
+
+    _measure(browser, "playlist", size, results["rows"].count)
+    assert results["rows"].count == size
+
+
+@pytest.mark.parametrize("size", SCALE_CATALOG_SIZES)
+def test_search_scale(browser, scale_state, size):
+    state, _user = scale_state
+    _top_up_songs(state, size)
+
+    login_cached(browser, SCALE_EMAIL, SCALE_PASSWORD)
+    browser.get(f"{BASE_URL}/app/search")
+    wait_for_probe(browser, {"input": Search.INPUT}, lambda r: r["input"].count)
+    search_input = browser.find_element(*Search.INPUT)
+    tracker = network_tracker(browser)
+    mark = tracker.mark()
+    search_input.send_keys("Scale")
+    reqs = tracker.wait_for("/songs/all", since=mark)
+    wait_for_probe(browser, {"heading": Search.SONGS_HEADING}, lambda r: r["heading"].count)
+    wait_for_network_idle(browser, idle_ms=300)
+
+    row = _measure(browser, "search", size, probe(browser, {"h": Search.SONGS_HEADING})["h"].count)
+    print(f"   [Scale] /songs/all over {size} songs: {reqs[-1].duration_ms:.0f}ms")
+    assert row["dom_nodes"] > 0
@@ -0,0 +1,101 @@
+import os
+import random
+
+import pytest
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from selenium_tests.baseline import check_baselines
+from selenium_tests.locators import CreatePlaylist, Search
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.search_typing import (
+    SEARCH_DEBOUNCE_MS,
+    analyze,
+    install_search_probe,
+    remove_search_probe,
+    search_events,
+    search_mark,
+    summary_lines,
+    type_like_human,
+    wait_for_search_quiet,
+)
+from selenium_tests.ui_helpers import BASE_URL, login_with_env
+
+# Opt-in: types every query at every speed on both search boxes
+SEARCH_TYPING = os.getenv("SEARCH_TYPING", "0") in ("1", "true", "True")
+# Comma-separated; by default the start of a few song titles the backend returns
+SEARCH_TYPING_QUERIES = os.getenv("SEARCH_TYPING_QUERIES", "")
+# Mean ms between keystrokes: fast typist, average, hunt-and-peck (slower than the debounce)
+SEARCH_TYPING_SPEEDS_MS = os.getenv("SEARCH_TYPING_SPEEDS_MS", "90,180,600")
+SEARCH_TYPING_ROUNDS = int(os.getenv("SEARCH_TYPING_ROUNDS", "2"))
+
+PAGES = {
+    "search": ("/app/search", Search.INPUT),
+    "create_playlist": ("/app/create-playlist", CreatePlaylist.SONG_SEARCH),
+}
+
+pytestmark = [
+    pytest.mark.skipif(not SEARCH_TYPING, reason="set SEARCH_TYPING=1 to run the search typing benchmark"),
+    pytest.mark.full_profile,
+]
+
+
+def _queries(api) -> list:
+    if SEARCH_TYPING_QUERIES:
+        return [q.strip() for q in SEARCH_TYPING_QUERIES.split(",") if q.strip()]
+    songs = api.search_all(os.getenv("TEST_SONG_QUERY", "a"), type="songs", limit=20).get("songs", [])
+    # Long enough to type for a while, short enough that the backend still matches it
+    titles = {item["song"]["title"][:14].strip() for item in songs}
+    queries = sorted(t for t in titles if len(t) >= 4)[:3]
+    if not queries:
+        pytest.skip("no song titles to type; set SEARCH_TYPING_QUERIES")
+    return queries
+
+
+@pytest.mark.parametrize("page", list(PAGES))
+def test_search_typing_latency(browser, api, page):
+    path, locator = PAGES[page]
+    queries = _queries(api)
+    speeds = [float(s) for s in SEARCH_TYPING_SPEEDS_MS.split(",") if s.strip()]
+    rng = random.Random(0)
+
+    login_with_env(browser)
+    probe = install_search_probe(browser)
+    runs = []
+    try:
+        for _ in range(SEARCH_TYPING_ROUNDS):
+            for interval_ms in speeds:
+                for query in queries:
+                    # Fresh page: no debounce timers or results left over from the previous query
+                    browser.get(f"{BASE_URL}{path}")
+                    box = WebDriverWait(browser, 15).until(EC.visibility_of_element_located(locator))
+                    mark = search_mark(browser)
+                    type_like_human(box, query, interval_ms, rng)
+                    wait_for_search_quiet(browser, SEARCH_DEBOUNCE_MS + 500)
+                    runs.append(analyze(page, query, interval_ms, search_events(browser, mark)))
+    finally:
+        remove_search_probe(browser, probe)
+
+    print()
+    for line in summary_lines(runs):
+        print(f"   [Search typing] {line}")
+    results = []
+    for interval_ms in speeds:
+        group = [r for r in runs if r.interval_ms == interval_ms]
+        samples = [r.latency_ms / 1000.0 for r in group if r.latency_ms is not None]
+        if not samples:
+            continue
+        counts = ("keys", "fired", "cancelled", "duplicates", "superseded", "stale_applied", "out_of_order")
+        notes = {"interval_ms": interval_ms, "queries": len(group), **{k: sum(getattr(r, k) for r in group) for k in counts}}
+        result = BenchmarkResult(scenario=f"search_typing_{page}_{interval_ms:.0f}ms", samples=samples, notes=notes)
+        record_benchmark(result)
+        results.append(result)
+    # Every typing speed is stored and compared before a regression fails the test
+    check_baselines(results)
+
+    errors = [f"{r.query!r}: {e}" for r in runs for e in r.errors]
+    assert not errors, f"search errors: {errors[:3]}"
+    wrong = [f"{r.query!r} at {r.interval_ms:.0f}ms/key" for r in runs if not r.final_ok]
+    assert not wrong, f"results on screen don't match what was typed: {wrong[:3]}"
+    reordered = [f"{r.query!r} at {r.interval_ms:.0f}ms/key" for r in runs if r.out_of_order]
+    assert not reordered, f"older results replaced newer ones: {reordered[:3]}"
@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+from selenium.webdriver.common.keys import Keys
+
+from selenium_tests.locators import Playlist, PlayerBar, Search
+from selenium_tests.page_metrics import runtime_metrics
+from selenium_tests.perf import BenchmarkResult, record_benchmark
+from selenium_tests.ui_helpers import (
+    BASE_URL,
+    click_with_fallback,
+    login_with_env,
+    network_mark,
+    spa_navigate,
+    wait_for_network_idle,
+    wait_for_probe,
+    wait_for_request,
+)
+
+# Opt-in: number of home -> playlist -> play -> search -> profile cycles in one document
+SOAK_ITERATIONS = int(os.getenv("SOAK_ITERATIONS", "0"))
+# Cycles before the growth trend is fitted (caches, lazy chunks and first renders settle)
+SOAK_WARMUP = int(os.getenv("SOAK_WARMUP", "3"))
+# Allowed growth per cycle after warmup
+SOAK_MAX_HEAP_KB = float(os.getenv("SOAK_MAX_HEAP_KB", "200"))
+SOAK_MAX_NODES = float(os.getenv("SOAK_MAX_NODES", "20"))
+SOAK_MAX_LISTENERS = float(os.getenv("SOAK_MAX_LISTENERS", "5"))
+
+pytestmark = [
+    pytest.mark.skipif(SOAK_ITERATIONS <= 0, reason="set SOAK_ITERATIONS=N to run the soak test"),
+    pytest.mark.full_profile,
+]
+
+
+def slope(values: list) -> float:
+    """Least-squares growth per step of ``values``."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2.0
+    mean_y = sum(values) / n
+    num = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+def _sample(browser) -> dict:
+    # Collect garbage first so the heap reflects retained objects, not pending garbage
+    browser.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    metrics = runtime_metrics(browser)
+    return {
+        "heap_kb": metrics.get("JSHeapUsedSize", 0) / 1024.0,
+        "nodes": metrics.get("Nodes", 0),
+        "listeners": metrics.get("JSEventListeners", 0),
+    }
+
+
+def _cycle(browser, playlist_id) -> None:
+    spa_navigate(browser, "/app/home")
+    wait_for_network_idle(browser)
+
+    spa_navigate(browser, f"/app/playlist/{playlist_id}")
+    wait_for_probe(browser, {"rows": Playlist.SONG_ROW}, lambda r: r["rows"].count)
+    click_with_fallback(browser, browser.find_element(*Playlist.SONG_ROW))
+    wait_for_probe(browser, {"toggle": PlayerBar.TOGGLE}, lambda r: r["toggle"].count)
+
+    spa_navigate(browser, "/app/search")
+    wait_for_probe(browser, {"input": Search.INPUT}, lambda r: r["input"].count)
+    search_input = browser.find_element(*Search.INPUT)
+    mark = network_mark(browser)
+    search_input.send_keys(Keys.CONTROL, "a")
+    search_input.send_keys("Pop")
+    wait_for_request(browser, "/songs/all", since=mark)
+
+    spa_navigate(browser, "/app/profile")
+    wait_for_network_idle(browser)
+
+
+def test_long_session_memory(browser, api, resources):
+    song_ids = api.song_ids(5)
+    playlist = resources.playlist("soak", song_ids)
+
+    login_with_env(browser)
+    browser.get(f"{BASE_URL}/app/home")
+    wait_for_network_idle(browser)
+
+    samples, durations = [], []
+    for i in range(SOAK_ITERATIONS):
+        start = time.perf_counter()
+        _cycle(browser, playlist["id"])
+        durations.append(time.perf_counter() - start)
+        samples.append(_sample(browser))
+        s = samples[-1]
+        print(
+            f"   [Soak] {i + 1:>3}/{SOAK_ITERATIONS} {durations[-1]:.2f}s heap={s['heap_kb'] / 1024:.1f}MB "
+            f"nodes={s['nodes']:.0f} listeners={s['listeners']:.0f}"
+        )
+
+    measured = samples[SOAK_WARMUP:] if len(samples) > SOAK_WARMUP + 1 else samples
+    growth = {key: slope([s[key] for s in measured]) for key in ("heap_kb", "nodes", "listeners")}
+    result = BenchmarkResult(
+        scenario="soak_cycle",
+        samples=durations,
+        notes={"growth_per_cycle": growth, "samples": samples, "warmup": SOAK_WARMUP},
+    )
+    record_benchmark(result)
+    print(
+        f"   [Soak] growth per cycle: heap={growth['heap_kb']:.1f}KB nodes={growth['nodes']:.1f} "
+        f"listeners={growth['listeners']:.1f}; {result.summary()}"
+    )
+
+    failures = []
+    for key, limit in (("heap_kb", SOAK_MAX_HEAP_KB), ("nodes", SOAK_MAX_NODES), ("listeners", SOAK_MAX_LISTENERS)):
+        if growth[key] > limit:
+            failures.append(f"{key} +{growth[key]:.1f}/cycle > {limit}")
+    assert not failures, f"Possible leak over {len(measured)} cycles: {', '.join(failures)}"
@@ -1,15 +1,112 @@
+import base64
+import json
 import os
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 
 import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from selenium_tests.api_client import ApiError, SoundPuffApi
+from selenium_tests.flaky import record_fallback
+from selenium_tests.locators import Auth, CreatePlaylist, Library, Playlist, xpath_literal
+
 
 BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
 SELENIUM_TIMEOUT = int(os.getenv("SELENIUM_TIMEOUT", "15"))
+# Benchmark results, timing data and failure artifacts are written under here
+ARTIFACTS_DIR = os.getenv("SELENIUM_ARTIFACTS", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".artifacts"))
+# Reuse one access token per account instead of driving the login form in every test
+LOGIN_CACHE = os.getenv("LOGIN_CACHE", "1") in ("1", "true", "True")
+# Static file from public/ on the app origin: lets us write localStorage without booting the SPA
+ORIGIN_PRIME_PATH = os.getenv("ORIGIN_PRIME_PATH", "/_redirects")
+# Treat tokens as expired this many seconds early so they can't lapse mid-test
+TOKEN_EXPIRY_MARGIN = 60
+# Used when the token carries no exp claim and the login response has no expires_in
+DEFAULT_TOKEN_TTL = 15 * 60
+# Longest single in-page wait; keeps execute_async_script well under the driver's script timeout
+_MAX_ASYNC_WAIT_MS = 5000
+
+
+# Installed into every new document (see install_page_bridge). Exposes window.__sp with:
+#   version  - bumped on every DOM mutation, /api/v1 request start/end and history change
+#   pending  - number of in-flight /api/v1 requests
+#   requests - recent /api/v1 requests {id, method, url, start, end, status, aborted}
+#   waiters  - callbacks woken on every bump (used by the wait helpers below)
+_PAGE_BRIDGE_JS = r"""
+(() => {
+  if (window.__sp) return;
+  const sp = window.__sp = {
+    version: 0, pending: 0, seq: 0, lastNetwork: performance.now(),
+    requests: [], waiters: new Set(),
+  };
+  const MAX_REQUESTS = 500;
+  const notify = () => {
+    sp.version++;
+    for (const w of Array.from(sp.waiters)) { try { w(); } catch (e) {} }
+  };
+  sp.notify = notify;
+  const isApi = (url) => String(url).indexOf('/api/v1') !== -1;
+  const begin = (method, url) => {
+    const rec = { id: ++sp.seq, method: String(method || 'GET').toUpperCase(), url: String(url),
+                  start: performance.now(), end: null, status: null, aborted: false };
+    sp.requests.push(rec);
+    if (sp.requests.length > MAX_REQUESTS) sp.requests.splice(0, sp.requests.length - MAX_REQUESTS);
+    sp.pending++; sp.lastNetwork = rec.start; notify();
+    return rec;
+  };
+  const finish = (rec, status, aborted) => {
+    if (rec.end !== null) return;
+    rec.end = performance.now(); rec.status = status; rec.aborted = !!aborted;
+    sp.pending = Math.max(0, sp.pending - 1); sp.lastNetwork = rec.end; notify();
+  };
+
+  const open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__spCall = isApi(url) ? [method, url] : null;
+    return open.apply(this, arguments);
+  };
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    if (this.__spCall) {
+      const rec = begin(this.__spCall[0], this.__spCall[1]);
+      this.addEventListener('abort', () => finish(rec, 0, true));
+      this.addEventListener('loadend', () => finish(rec, this.status, false));
+    }
+    return send.apply(this, arguments);
+  };
+
+  const origFetch = window.fetch;
+  if (origFetch) {
+    window.fetch = function (input, init) {
+      const url = typeof input === 'string' ? input : (input && input.url) || '';
+      if (!isApi(url)) return origFetch.apply(this, arguments);
+      const rec = begin((init && init.method) || (input && input.method), url);
+      return origFetch.apply(this, arguments).then(
+        (res) => { finish(rec, res.status, false); return res; },
+        (err) => { finish(rec, 0, err && err.name === 'AbortError'); throw err; });
+    };
+  }
+
+  for (const name of ['pushState', 'replaceState']) {
+    const orig = history[name];
+    history[name] = function () { const r = orig.apply(this, arguments); notify(); return r; };
+  }
+  window.addEventListener('popstate', notify);
+  new MutationObserver(notify).observe(document, {
+    childList: true, subtree: true, attributes: true, characterData: true,
+  });
+})();
+"""
 
 
 @dataclass(frozen=True)
@@ -18,18 +115,525 @@ class Credentials:
     password: str
 
 
-def _unique_suffix() -> str:
-    return str(int(time.time() * 1000))
+@dataclass(frozen=True)
+class CachedSession:
+    access_token: str
+    expires_at: float
 
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at - TOKEN_EXPIRY_MARGIN
+
+
+_SESSION_CACHE: dict[Credentials, CachedSession] = {}
+
+
+def install_page_bridge(browser) -> None:
+    """Inject the wait/network bridge into every document this driver loads from now on."""
+    browser.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _PAGE_BRIDGE_JS})
+
+
+def _wait_for_change(browser, since, max_ms: int):
+    """Block in the page until window.__sp.version moves past ``since`` (or ``max_ms``)."""
+    return browser.execute_async_script(
+        """
+        const since = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+        const sp = window.__sp;
+        if (!sp) { setTimeout(() => done(null), Math.min(maxMs, 100)); return; }
+        if (sp.version !== since) { done(sp.version); return; }
+        let timer = null;
+        const wake = () => { sp.waiters.delete(wake); clearTimeout(timer); done(sp.version); };
+        sp.waiters.add(wake);
+        timer = setTimeout(wake, maxMs);
+        """,
+        since,
+        max_ms,
+    )
+
+
+def wait_until(browser, condition, timeout: float | None = None, message: str = "", max_idle_ms: int = 500):
+    """Like ``WebDriverWait(...).until`` but event driven.
+
+    Instead of sleeping a fixed poll interval between checks, blocks inside the page until
+    the DOM mutates, an /api/v1 request starts/finishes or the route changes, so the
+    condition is re-checked as soon as something could have changed. ``max_idle_ms`` caps
+    each wait for conditions that don't show up as page events (alerts, timers).
+    """
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    end = time.monotonic() + timeout
+    version = None
+    while True:
+        try:
+            value = condition(browser)
+            if value:
+                return value
+        except (NoSuchElementException, StaleElementReferenceException):
+            pass
+        remaining_ms = int((end - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise TimeoutException(message)
+        try:
+            version = _wait_for_change(browser, version, min(remaining_ms, max_idle_ms))
+        except WebDriverException:
+            # Document unloaded mid-wait (navigation): re-check against the new page.
+            version = None
 
-def login_with_env(browser, timeout: int | None = None) -> Credentials:
-    """Log in using TEST_EMAIL/TEST_PASSWORD only.
 
-    This helper does NOT create users (no auto-signup).
+def wait_for_js(browser, predicate: str, *args, timeout: float | None = None, recheck_ms: int = 250, message: str = ""):
+    """Wait until the JS function body ``predicate`` returns a truthy value, evaluated in-page.
+
+    The predicate sees the page bridge as ``sp`` and extra arguments as ``args``. It is
+    re-evaluated on every bridge event (plus every ``recheck_ms`` for time-based
+    conditions), so the whole wait costs one WebDriver round-trip per ~5s.
     """
     if timeout is None:
         timeout = SELENIUM_TIMEOUT
+    end = time.monotonic() + timeout
+    while True:
+        remaining_ms = int((end - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise TimeoutException(message or f"JS condition not met: {predicate.strip()[:120]}")
+        try:
+            result = browser.execute_async_script(
+                """
+                const body = arguments[0], args = arguments[1], maxMs = arguments[2], recheck = arguments[3];
+                const done = arguments[arguments.length - 1];
+                const sp = window.__sp || null;
+                const pred = new Function('sp', 'args', body);
+                let finished = false, timer = null, ticker = null;
+                const finish = (res) => {
+                  if (finished) return;
+                  finished = true; clearTimeout(timer); clearInterval(ticker);
+                  if (sp) sp.waiters.delete(check);
+                  done(res);
+                };
+                const check = () => {
+                  let value = null;
+                  try { value = pred(sp, args); } catch (e) { value = null; }
+                  if (value) finish({ ok: true, value: value });
+                };
+                if (sp) sp.waiters.add(check);
+                ticker = setInterval(check, recheck);
+                timer = setTimeout(() => finish({ ok: false }), maxMs);
+                check();
+                """,
+                predicate,
+                list(args),
+                min(remaining_ms, _MAX_ASYNC_WAIT_MS),
+                recheck_ms,
+            )
+        except WebDriverException:
+            # Navigation unloaded the document mid-wait; try again on the new one.
+            continue
+        if result and result.get("ok"):
+            return result.get("value")
+
+
+# In-page evaluator shared by probe()/wait_for_probe(): runs every query of a batch and
+# extracts only what was asked for, so a whole page check is one WebDriver call.
+_PROBE_FN = r"""
+function (queries) {
+  const out = {};
+  for (const name of Object.keys(queries)) {
+    const q = queries[name];
+    const root = q.root || document;
+    let els = [];
+    try {
+      if (q.xpath) {
+        const res = document.evaluate(q.selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < res.snapshotLength; i++) els.push(res.snapshotItem(i));
+      } else {
+        els = Array.from(root.querySelectorAll(q.selector));
+      }
+    } catch (e) {
+      out[name] = { count: 0, items: [], error: String(e) };
+      continue;
+    }
+    const re = q.match ? new RegExp(q.match) : null;
+    const items = [];
+    let count = 0;
+    for (const el of els) {
+      const item = {};
+      if (q.text || re) {
+        const text = (el.innerText !== undefined ? el.innerText : el.textContent || '').trim();
+        if (re) {
+          const m = re.exec(text);
+          if (!m) continue;
+          item.groups = m.slice(1);
+        }
+        if (q.text) item.text = text;
+      }
+      count++;
+      if (items.length >= q.limit) continue;
+      if (q.attrs.length) {
+        item.attrs = {};
+        for (const a of q.attrs) item.attrs[a] = el.getAttribute(a);
+      }
+      if (q.states) {
+        item.visible = el.getClientRects().length > 0;
+        item.enabled = !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+        item.checked = el.checked !== undefined ? !!el.checked : el.getAttribute('aria-checked') === 'true';
+        item.state = el.getAttribute('data-state');
+      }
+      items.push(item);
+    }
+    out[name] = { count: count, items: items };
+  }
+  return out;
+}
+"""
+
 
+@dataclass(frozen=True)
+class Probe:
+    """One element query of a batched probe.
+
+    ``selector`` is a locator tuple from ``locators``, or a string: CSS, or XPath when it
+    starts with ``/``, ``(`` or ``.``. ``match`` is a
+    JS regex applied to the element text: non-matching elements are dropped and capture
+    groups are returned. ``root`` restricts the query to a WebElement's subtree.
+    """
+
+    selector: str | tuple
+    text: bool = True
+    attrs: tuple = ()
+    states: bool = False
+    match: str | None = None
+    limit: int = 20
+    root: object = None
+
+    def to_js(self) -> dict:
+        if isinstance(self.selector, tuple):
+            by, selector = self.selector
+            is_xpath = by == By.XPATH
+            if by == By.ID:
+                selector = f'[id="{selector}"]'
+        else:
+            selector = self.selector
+            is_xpath = selector.startswith(("/", "(", "."))
+        return {
+            "selector": selector,
+            "xpath": is_xpath,
+            "text": self.text,
+            "attrs": list(self.attrs),
+            "states": self.states,
+            "match": self.match,
+            "limit": self.limit,
+            "root": self.root,
+        }
+
+
+@dataclass
+class ProbeResult:
+    count: int
+    items: list
+    error: str | None = None
+
+    @property
+    def texts(self) -> list:
+        return [item.get("text", "") for item in self.items]
+
+    def attr(self, name: str) -> list:
+        return [item.get("attrs", {}).get(name) for item in self.items]
+
+    def numbers(self) -> list:
+        """First capture group of ``match`` for each item, as int (unparseable groups skipped)."""
+        out = []
+        for item in self.items:
+            try:
+                out.append(int(item["groups"][0]))
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+        return out
+
+
+def _probe_queries(queries: dict) -> dict:
+    return {name: (q if isinstance(q, Probe) else Probe(q)).to_js() for name, q in queries.items()}
+
+
+def _probe_results(raw: dict) -> dict:
+    return {name: ProbeResult(r["count"], r["items"], r.get("error")) for name, r in (raw or {}).items()}
+
+
+def probe(browser, queries: dict) -> dict:
+    """Evaluate many element queries in a single ``execute_script`` round-trip.
+
+    ``queries`` maps a name to a selector string or a ``Probe``; the result maps the same
+    names to ``ProbeResult`` (match count plus the requested text/attributes/states).
+    """
+    raw = browser.execute_script(f"return ({_PROBE_FN})(arguments[0]);", _probe_queries(queries))
+    return _probe_results(raw)
+
+
+def wait_for_probe(
+    browser,
+    queries: dict,
+    condition,
+    timeout: float | None = None,
+    message: str = "",
+    max_idle_ms: int = 500,
+):
+    """Wait until ``condition(results)`` is truthy, probing once per page change.
+
+    Each tick is a single async script that waits for the next bridge event (as
+    ``wait_until`` does) and then runs the probe, so polling costs one round-trip per
+    tick instead of one per element lookup and attribute read.
+    """
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    js_queries = _probe_queries(queries)
+    end = time.monotonic() + timeout
+    version = None
+    while True:
+        remaining_ms = int((end - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise TimeoutException(message or f"Probe condition not met for {sorted(queries)}")
+        try:
+            raw = browser.execute_async_script(
+                f"""
+                const queries = arguments[0], since = arguments[1], maxMs = arguments[2];
+                const done = arguments[arguments.length - 1];
+                const probe = ({_PROBE_FN});
+                const sp = window.__sp;
+                const finish = () => done({{ version: sp ? sp.version : -1, data: probe(queries) }});
+                if (!sp) {{ if (since === null) finish(); else setTimeout(finish, Math.min(maxMs, 100)); return; }}
+                if (sp.version !== since) {{ finish(); return; }}
+                let timer = null;
+                const wake = () => {{ sp.waiters.delete(wake); clearTimeout(timer); finish(); }};
+                sp.waiters.add(wake);
+                timer = setTimeout(wake, maxMs);
+                """,
+                js_queries,
+                version,
+                min(remaining_ms, max_idle_ms),
+            )
+        except WebDriverException:
+            # Document unloaded mid-wait (navigation): probe the new page right away.
+            version = None
+            continue
+        version = raw["version"]
+        value = condition(_probe_results(raw["data"]))
+        if value:
+            return value
+
+
+def network_mark(browser) -> int:
+    """Id of the newest /api/v1 request so far; pass to ``wait_for_request(since=...)``."""
+    return browser.execute_script("return window.__sp ? window.__sp.seq : 0;") or 0
+
+
+def wait_for_network_idle(browser, idle_ms: int = 150, timeout: float | None = None) -> None:
+    """Wait until no /api/v1 request has been in flight for ``idle_ms``."""
+    wait_for_js(
+        browser,
+        "return !sp || (sp.pending === 0 && performance.now() - sp.lastNetwork >= args[0]);",
+        idle_ms,
+        timeout=timeout,
+        recheck_ms=max(25, idle_ms // 2),
+        message=f"/api/v1 traffic did not go idle for {idle_ms}ms",
+    )
+
+
+def wait_for_request(browser, url_part: str, since: int = 0, timeout: float | None = None) -> list:
+    """Wait until an /api/v1 request containing ``url_part`` started after ``since`` has
+    completed and no other matching request is still in flight (debounced searches).
+
+    Returns the matching request records (method, url, start/end in page ms, status).
+    """
+    return wait_for_js(
+        browser,
+        """
+        if (!sp) return null;
+        const hits = sp.requests.filter((r) => r.id > args[1] && r.url.indexOf(args[0]) !== -1);
+        if (!hits.length || hits.some((r) => r.end === null)) return null;
+        return hits;
+        """,
+        url_part,
+        since,
+        timeout=timeout,
+        message=f"No completed request matching {url_part!r}",
+    )
+
+
+@dataclass
+class NetworkRequest:
+    """One request as seen through CDP ``Network.*`` events (times in CDP seconds)."""
+
+    request_id: str
+    seq: int
+    url: str
+    method: str
+    resource_type: str
+    started: float
+    status: int | None = None
+    mime_type: str = ""
+    finished: float | None = None
+    failed: bool = False
+    error: str = ""
+    blocked_reason: str = ""
+    from_cache: bool = False
+    encoded_bytes: int = 0
+    timing: dict = field(default_factory=dict)
+    # Epoch seconds of ``started`` and the raw headers; only read when writing a HAR
+    wall_time: float = 0.0
+    request_headers: dict = field(default_factory=dict)
+    response_headers: dict = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    @property
+    def duration_ms(self) -> float | None:
+        return None if self.finished is None else (self.finished - self.started) * 1000.0
+
+    @property
+    def backend_ms(self) -> float | None:
+        """Server wait: request fully sent -> response headers received."""
+        if "receiveHeadersEnd" not in self.timing:
+            return None
+        return self.timing["receiveHeadersEnd"] - self.timing.get("sendEnd", 0.0)
+
+
+class NetworkTracker:
+    """Tracks requests from the driver's CDP performance log (``goog:loggingPrefs``).
+
+    ``get_log("performance")`` drains the buffer, so there must be a single consumer per
+    driver: always go through ``network_tracker(browser)``.
+    """
+
+    def __init__(self, browser):
+        self._browser = browser
+        self._by_id = {}
+        self.records = []
+
+    def reset(self) -> None:
+        self.poll()
+        self._by_id.clear()
+        self.records = []
+
+    def mark(self) -> int:
+        self.poll()
+        return len(self.records)
+
+    def poll(self) -> None:
+        try:
+            entries = self._browser.get_log("performance")
+        except WebDriverException:
+            return
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            self._on_event(msg.get("method", ""), msg.get("params", {}))
+
+    def _on_event(self, method: str, params: dict) -> None:
+        if method == "Network.requestWillBeSent":
+            req = params.get("request", {})
+            previous = self._by_id.get(params["requestId"])
+            redirect = params.get("redirectResponse")
+            if previous is not None and redirect is not None and not previous.done:
+                # The earlier hop ends where the redirect starts
+                previous.status = redirect.get("status")
+                previous.mime_type = redirect.get("mimeType", "")
+                previous.timing = redirect.get("timing") or {}
+                previous.response_headers = redirect.get("headers", {})
+                previous.encoded_bytes = int(redirect.get("encodedDataLength", 0))
+                previous.finished = params.get("timestamp", previous.started)
+            rec = NetworkRequest(
+                request_id=params["requestId"],
+                seq=len(self.records) + 1,
+                url=req.get("url", ""),
+                method=req.get("method", "GET"),
+                resource_type=params.get("type", ""),
+                started=params.get("timestamp", 0.0),
+                wall_time=params.get("wallTime", 0.0),
+                request_headers=req.get("headers", {}),
+            )
+            # Redirects reuse the requestId; keep the newest hop.
+            self._by_id[rec.request_id] = rec
+            self.records.append(rec)
+            return
+        rec = self._by_id.get(params.get("requestId"))
+        if rec is None:
+            return
+        if method == "Network.responseReceived":
+            resp = params.get("response", {})
+            rec.status = resp.get("status")
+            rec.mime_type = resp.get("mimeType", "")
+            rec.from_cache = bool(resp.get("fromDiskCache") or resp.get("fromServiceWorker"))
+            rec.timing = resp.get("timing") or {}
+            rec.response_headers = resp.get("headers", {})
+        elif method == "Network.requestServedFromCache":
+            rec.from_cache = True
+        elif method == "Network.loadingFinished":
+            rec.finished = params.get("timestamp", rec.started)
+            rec.encoded_bytes = int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            rec.finished = params.get("timestamp", rec.started)
+            rec.failed = True
+            rec.error = params.get("errorText", "")
+            rec.blocked_reason = params.get("blockedReason", "")
+
+    def requests(self, url_part: str = "", since: int = 0) -> list:
+        self.poll()
+        return [r for r in self.records[since:] if url_part in r.url]
+
+    def in_flight(self, url_part: str = "") -> list:
+        return [r for r in self.requests(url_part) if not r.done]
+
+    def wait_for(self, url_part: str, since: int = 0, timeout: float | None = None) -> list:
+        """Wait until requests matching ``url_part`` issued after ``since`` have all finished."""
+        if timeout is None:
+            timeout = SELENIUM_TIMEOUT
+        end = time.monotonic() + timeout
+        version = None
+        while True:
+            hits = self.requests(url_part, since)
+            if hits and all(r.done for r in hits):
+                return hits
+            remaining_ms = int((end - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                raise TimeoutException(f"No finished request matching {url_part!r}")
+            try:
+                # Page-side XHR events wake us; the cap covers non-XHR resources.
+                version = _wait_for_change(self._browser, version, min(remaining_ms, 250))
+            except WebDriverException:
+                version = None
+
+    def timings(self, url_part: str = "/api/v1", since: int = 0) -> list:
+        """Per-request timing summary, e.g. for printing or writing to benchmark files."""
+        return [
+            {
+                "method": r.method,
+                "url": r.url,
+                "status": r.status,
+                "total_ms": r.duration_ms,
+                "backend_ms": r.backend_ms,
+                "bytes": r.encoded_bytes,
+            }
+            for r in self.requests(url_part, since)
+            if r.done
+        ]
+
+
+_TRACKERS = weakref.WeakKeyDictionary()
+
+
+def network_tracker(browser) -> NetworkTracker:
+    """The (single) CDP network tracker for this driver."""
+    tracker = _TRACKERS.get(browser)
+    if tracker is None:
+        tracker = _TRACKERS[browser] = NetworkTracker(browser)
+    return tracker
+
+
+def _unique_suffix() -> str:
+    return str(int(time.time() * 1000))
+
+
+def env_credentials() -> Credentials:
     email = os.getenv("TEST_EMAIL")
     password = os.getenv("TEST_PASSWORD")
     if not email or not password:
@@ -37,10 +641,137 @@ def login_with_env(browser, timeout: int | None = None) -> Credentials:
             "Missing TEST_EMAIL/TEST_PASSWORD. "
             "Set them in your shell env or in a .env/.env.local/selenium_tests/.env file."
         )
-    login(browser, email, password, timeout=timeout)
     return Credentials(email=email, password=password)
 
 
+def login_with_env(browser, timeout: int | None = None, use_cache: bool | None = None) -> Credentials:
+    """Log in using TEST_EMAIL/TEST_PASSWORD only.
+
+    This helper does NOT create users (no auto-signup). By default the access token is
+    cached per account and injected into later sessions (see ``login_cached``); pass
+    ``use_cache=False`` to always go through the login form.
+    """
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+
+    creds = env_credentials()
+    if use_cache is None:
+        use_cache = LOGIN_CACHE
+    if use_cache:
+        login_cached(browser, creds.email, creds.password, timeout=timeout)
+    else:
+        login(browser, creds.email, creds.password, timeout=timeout)
+    return creds
+
+
+def login_cached(browser, email: str, password: str, timeout: int | None = None) -> None:
+    """Log in by injecting a cached access token, falling back to a real login.
+
+    The first call per account obtains a token via ``POST /api/v1/auth/login`` (or the
+    login form if the API call fails). Later calls write that token into localStorage,
+    where ``src/services/api.ts`` picks it up, and open ``/app/home`` directly. Tokens
+    that are about to expire, or that the backend rejects, are dropped and replaced by
+    a fresh login.
+    """
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    creds = Credentials(email=email, password=password)
+
+    start = time.perf_counter()
+    try:
+        session = cached_session(creds, timeout=timeout)
+    except ApiError:
+        # API not reachable directly: log in through the UI and keep its token.
+        login(browser, email, password, timeout=timeout)
+        _remember_browser_session(browser, creds)
+        record_fallback("login.form_after_api_error", time.perf_counter() - start)
+        return
+
+    if _inject_session(browser, session, timeout=timeout):
+        return
+
+    # Backend rejected the token (revoked or expired early): do a real login.
+    _SESSION_CACHE.pop(creds, None)
+    login(browser, email, password, timeout=timeout)
+    _remember_browser_session(browser, creds)
+    record_fallback("login.form_after_rejected_token", time.perf_counter() - start)
+
+
+def cached_session(creds: Credentials, timeout: int | None = None) -> CachedSession:
+    """Return a fresh cached token for ``creds``, logging in over the API if needed."""
+    session = _SESSION_CACHE.get(creds)
+    if session is None or not session.is_fresh():
+        _SESSION_CACHE.pop(creds, None)
+        session = api_login(creds.email, creds.password, timeout=timeout)
+        _SESSION_CACHE[creds] = session
+    return session
+
+
+def api_login(email: str, password: str, timeout: int | None = None) -> CachedSession:
+    """Obtain an access token from ``POST /api/v1/auth/login`` (through the app's /api proxy)."""
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    data = SoundPuffApi(timeout=timeout).login(email, password)
+    return _session_from_token(data["access_token"], data.get("expires_in"))
+
+
+def api_for_env(timeout: int | None = None) -> SoundPuffApi:
+    """REST client authenticated as TEST_EMAIL, sharing the login cache with the browser."""
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    session = cached_session(env_credentials(), timeout=timeout)
+    return SoundPuffApi(token=session.access_token, timeout=timeout)
+
+
+def _session_from_token(token: str, expires_in=None) -> CachedSession:
+    expires_at = _token_expiry(token)
+    if expires_at is None:
+        expires_at = time.time() + (float(expires_in) if expires_in else DEFAULT_TOKEN_TTL)
+    return CachedSession(access_token=token, expires_at=expires_at)
+
+
+def _token_expiry(token: str) -> float | None:
+    """Read the ``exp`` claim of a JWT without verifying it (None if not a JWT)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+        return float(claims["exp"])
+    except Exception:
+        return None
+
+
+def _remember_browser_session(browser, creds: Credentials) -> None:
+    token = browser.execute_script("return window.localStorage.getItem('access_token');")
+    if token:
+        _SESSION_CACHE[creds] = _session_from_token(token)
+
+
+def _inject_session(browser, session: CachedSession, timeout: int) -> bool:
+    """Write the token into localStorage and open the app; False if the app bounced us out."""
+    browser.get(f"{BASE_URL}{ORIGIN_PRIME_PATH}")
+    browser.execute_script(
+        "window.localStorage.setItem('access_token', arguments[0]);", session.access_token
+    )
+    browser.get(f"{BASE_URL}/app/home")
+
+    # AuthContext validates the token with /users/me; ProtectedRoute shows
+    # "Authenticating..." until then and redirects to "/" if it fails.
+    def _settled(_driver):
+        return _driver.execute_script(
+            """
+            const root = document.getElementById('root');
+            if (!root || !root.childElementCount) return false;
+            if (!location.pathname.startsWith('/app/')) return true;
+            return !document.evaluate("//p[normalize-space()='Authenticating...']", document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            """
+        )
+
+    WebDriverWait(browser, timeout).until(_settled)
+    return "/app/" in browser.current_url
+
+
 def login(browser, email: str, password: str, timeout: int | None = None) -> None:
     if timeout is None:
         timeout = SELENIUM_TIMEOUT
@@ -48,19 +779,18 @@ def login(browser, email: str, password: str, timeout: int | None = None) -> Non
     wait = WebDriverWait(browser, timeout)
 
     # Wait for login form fields (page can take a few seconds to render)
-    wait.until(EC.visibility_of_element_located((By.ID, "login-email")))
-    wait.until(EC.visibility_of_element_located((By.ID, "login-password")))
+    wait.until(EC.visibility_of_element_located(Auth.EMAIL))
+    wait.until(EC.visibility_of_element_located(Auth.PASSWORD))
 
-    email_el = browser.find_element(By.ID, "login-email")
-    password_el = browser.find_element(By.ID, "login-password")
+    email_el = browser.find_element(*Auth.EMAIL)
+    password_el = browser.find_element(*Auth.PASSWORD)
     email_el.clear()
     email_el.send_keys(email)
     password_el.clear()
     password_el.send_keys(password)
 
     # Click the submit button inside the login form (avoid matching the tab button, etc.)
-    login_form = email_el.find_element(By.XPATH, "ancestor::form[1]")
-    submit_btn = login_form.find_element(By.XPATH, ".//button[@type='submit']")
+    submit_btn = browser.find_element(*Auth.SUBMIT)
     wait.until(lambda d: submit_btn.is_enabled())
 
     try:
@@ -68,23 +798,25 @@ def login(browser, email: str, password: str, timeout: int | None = None) -> Non
     except Exception:
         pass
 
+    start = time.perf_counter()
     try:
         wait.until(EC.element_to_be_clickable(submit_btn))
         submit_btn.click()
     except Exception:
         # Fallback: JS click (avoids occasional click interception)
         browser.execute_script("arguments[0].click();", submit_btn)
+        record_fallback("login.js_click", time.perf_counter() - start)
 
     # Wait for either successful navigation OR an error alert
     def _done(_driver):
         if "/app/" in _driver.current_url:
             return True
-        alerts = _driver.find_elements(By.CSS_SELECTOR, "[data-slot='alert'][role='alert']")
+        alerts = _driver.find_elements(*Auth.ERROR)
         return bool(alerts)
 
     WebDriverWait(browser, timeout).until(_done)
     if "/app/" not in browser.current_url:
-        alerts = browser.find_elements(By.CSS_SELECTOR, "[data-slot='alert'][role='alert']")
+        alerts = browser.find_elements(*Auth.ERROR)
         msg = alerts[0].text.strip() if alerts else "Login did not navigate to /app/"
         raise AssertionError(f"Login failed: {msg}")
 
@@ -104,16 +836,36 @@ def click_with_fallback(browser, element, timeout: int | None = None) -> None:
     except Exception:
         pass
 
+    start = time.perf_counter()
     try:
         WebDriverWait(browser, timeout).until(lambda _d: element.is_enabled() and element.is_displayed())
     except Exception:
-        pass
+        record_fallback("click.not_interactable_timeout", time.perf_counter() - start)
 
+    start = time.perf_counter()
     try:
         element.click()
         return
     except Exception:
         browser.execute_script("arguments[0].click();", element)
+        record_fallback("click.js_click", time.perf_counter() - start)
+
+
+def _wait_for_selected_songs(browser, timeout: float, minimum: int = 1) -> int:
+    """Wait until the create-playlist page shows "<n> ... selected" with n >= ``minimum``."""
+    counter = Probe(CreatePlaylist.SELECTED_COUNT, text=False, match=r"^(\d+)\b.*selected$")
+
+    def _enough(results):
+        n = max(results["selected"].numbers(), default=0)
+        return n if n >= minimum else None
+
+    return wait_for_probe(
+        browser,
+        {"selected": counter},
+        _enough,
+        timeout=timeout,
+        message=f"Create-playlist page never showed {minimum} selected song(s)",
+    )
 
 
 def select_first_song_on_create_playlist(browser, timeout: int = 10) -> None:
@@ -122,55 +874,32 @@ def select_first_song_on_create_playlist(browser, timeout: int = 10) -> None:
     Fails (not skips) if no songs are available, since playlist creation requires at least one song.
     """
     wait = WebDriverWait(browser, timeout)
+    start = time.perf_counter()
     # Checkboxes render only when there are songs.
     try:
-        checkbox = wait.until(EC.presence_of_element_located((By.XPATH, "//*[@data-slot='checkbox']")))
+        checkbox = wait.until(EC.presence_of_element_located(CreatePlaylist.SONG_CHECKBOX))
         click_with_fallback(browser, checkbox, timeout=timeout)
 
         # Wait until UI reflects at least 1 selected song
-        def _selected_count_ok(_driver):
-            spans = _driver.find_elements(By.XPATH, "//span[contains(normalize-space(.), 'selected')]")
-            for s in spans:
-                txt = (s.text or "").strip()
-                if txt.endswith("selected"):
-                    try:
-                        n = int(txt.split()[0])
-                        if n >= 1:
-                            return True
-                    except Exception:
-                        continue
-            return False
-
-        WebDriverWait(browser, timeout).until(_selected_count_ok)
+        _wait_for_selected_songs(browser, timeout)
         return
     except Exception:
         pass
 
     # Optional fallback: try typing a query to load songs
     query = os.getenv("TEST_SONG_QUERY", "a")
-    inputs = browser.find_elements(By.XPATH, "//input[@placeholder='Search songs...']")
+    inputs = browser.find_elements(*CreatePlaylist.SONG_SEARCH)
     if inputs:
+        mark = network_mark(browser)
         inputs[0].clear()
         inputs[0].send_keys(query)
-        # wait a bit for debounce (500ms) + request
-        time.sleep(1.2)
-        checkbox = wait.until(EC.presence_of_element_located((By.XPATH, "//*[@data-slot='checkbox']")))
+        # debounce (500ms) + request
+        wait_for_request(browser, "/songs/search", since=mark, timeout=timeout)
+        checkbox = wait.until(EC.presence_of_element_located(CreatePlaylist.SONG_CHECKBOX))
         click_with_fallback(browser, checkbox, timeout=timeout)
 
-        def _selected_count_ok(_driver):
-            spans = _driver.find_elements(By.XPATH, "//span[contains(normalize-space(.), 'selected')]")
-            for s in spans:
-                txt = (s.text or "").strip()
-                if txt.endswith("selected"):
-                    try:
-                        n = int(txt.split()[0])
-                        if n >= 1:
-                            return True
-                    except Exception:
-                        continue
-            return False
-
-        WebDriverWait(browser, timeout).until(_selected_count_ok)
+        _wait_for_selected_songs(browser, timeout)
+        record_fallback("create_playlist.song_search", time.perf_counter() - start)
         return
 
     raise AssertionError(
@@ -185,15 +914,8 @@ def submit_create_playlist_form(browser, timeout: int | None = None) -> None:
         timeout = SELENIUM_TIMEOUT
 
     wait = WebDriverWait(browser, timeout)
-    # The button is type=submit; its text is either 'Create Playlist' or 'Save Changes'
-    btn = wait.until(
-        EC.presence_of_element_located(
-            (
-                By.XPATH,
-                "//form//button[@type='submit' and (contains(normalize-space(.),'Create Playlist') or contains(normalize-space(.),'Save Changes'))]",
-            )
-        )
-    )
+    # The form's only submit button: 'Create Playlist' or 'Save Changes' (edit mode)
+    btn = wait.until(EC.presence_of_element_located(CreatePlaylist.SUBMIT))
     # Wait until enabled (it is disabled until title + song selected)
     wait.until(lambda _d: btn.is_enabled())
     click_with_fallback(browser, btn, timeout=timeout)
@@ -206,7 +928,7 @@ def open_library(browser, timeout: int | None = None) -> None:
     browser.get(f"{BASE_URL}/app/library")
     # Wait for library header and either grid container or empty state
     wait = WebDriverWait(browser, timeout)
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h1[contains(normalize-space(.),'My Playlists')]")))
+    wait.until(EC.presence_of_element_located(Library.HEADING))
 
 
 def find_playlist_title_element(browser, title: str, timeout: int | None = None):
@@ -216,36 +938,53 @@ def find_playlist_title_element(browser, title: str, timeout: int | None = None)
     """
     if timeout is None:
         timeout = SELENIUM_TIMEOUT
-    wait = WebDriverWait(browser, timeout)
 
-    # Retry a few times: library loads data async.
-    end = time.time() + timeout
-    last_err = None
-    while time.time() < end:
-        try:
-            # Prefer title attribute exact match
-            els = browser.find_elements(By.XPATH, f"//h3[@title={_xpath_literal(title)}]")
-            if not els:
-                # Fallback: normalized visible text match
-                els = browser.find_elements(By.XPATH, f"//h3[normalize-space()={_xpath_literal(title)}]")
-            if els:
-                return els[0]
-        except Exception as e:
-            last_err = e
-        time.sleep(0.4)
-    if last_err:
-        raise last_err
-    return None
-
-
-def _xpath_literal(s: str) -> str:
-    """Safely embed a Python string as an XPath string literal."""
-    if "'" not in s:
-        return f"'{s}'"
-    if '"' not in s:
-        return f'"{s}"'
-    parts = s.split("'")
-    return "concat(" + ", " .join([f"'{p}'" if i == len(parts) - 1 else f"'{p}', \"'\"" for i, p in enumerate(parts)]) + ")"
+    def _find(_driver):
+        # Prefer title attribute exact match
+        els = _driver.find_elements(*Library.playlist_title(title))
+        if not els:
+            # Fallback: normalized visible text match
+            els = _driver.find_elements(*Library.playlist_title_text(title))
+        return els[0] if els else None
+
+    # Library loads data async: re-check whenever the DOM changes.
+    try:
+        return wait_until(browser, _find, timeout=timeout)
+    except TimeoutException:
+        return None
+
+
+# Kept for existing callers; the cached implementation lives in locators
+_xpath_literal = xpath_literal
+
+
+def spa_navigate(browser, path: str, timeout: int | None = None) -> None:
+    """Navigate inside the running SPA (no document reload), like a client-side link click.
+
+    React Router listens to popstate, so pushState + a synthetic popstate event makes it
+    render ``path`` while the JS heap, player state and listeners stay alive.
+    """
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    browser.execute_script(
+        """
+        const prev = window.history.state || {};
+        // Same state shape React Router writes itself, so its history index stays consistent
+        const state = { usr: null, key: Math.random().toString(36).slice(2, 10), idx: (prev.idx || 0) + 1 };
+        window.history.pushState(state, '', arguments[0]);
+        window.dispatchEvent(new PopStateEvent('popstate', { state: state }));
+        """,
+        path,
+    )
+    wait_for_js(browser, "return location.pathname === args[0];", path, timeout=timeout)
+
+
+def open_playlist(browser, playlist_id, timeout: int | None = None) -> None:
+    """Open a playlist page directly by id and wait until its header has rendered."""
+    if timeout is None:
+        timeout = SELENIUM_TIMEOUT
+    browser.get(f"{BASE_URL}/app/playlist/{playlist_id}")
+    WebDriverWait(browser, timeout).until(EC.presence_of_element_located(Playlist.LIKES))
 
 
 def open_playlist_from_library(browser, title: str, timeout: int | None = None) -> None:
@@ -253,6 +992,7 @@ def open_playlist_from_library(browser, title: str, timeout: int | None = None)
     if timeout is None:
         timeout = SELENIUM_TIMEOUT
 
+    start = time.perf_counter()
     open_library(browser, timeout=timeout)
     title_el = find_playlist_title_element(browser, title, timeout=timeout)
     if not title_el:
@@ -260,6 +1000,7 @@ def open_playlist_from_library(browser, title: str, timeout: int | None = None)
         browser.refresh()
         open_library(browser, timeout=timeout)
         title_el = find_playlist_title_element(browser, title, timeout=timeout)
+        record_fallback("library.refresh_retry", time.perf_counter() - start)
 
     if not title_el:
         raise AssertionError(f"Playlist titled '{title}' not found in library")
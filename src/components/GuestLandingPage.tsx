@@ -56,7 +56,7 @@ export function GuestLandingPage() {
           <div className="flex items-center justify-center gap-3 mb-10 mt-20">
             <img src={logoPng} alt="SoundPuff Logo" width="600"/>
           </div>
-          <h2 className="text-white mb-4 text-4xl font-bold"
+          <h2 data-testid="landing-heading" className="text-white mb-4 text-4xl font-bold"
               style={{ 
                 color: '#d95a96', 
                 WebkitTextStroke: '0.5px #5b0425'
@@ -56,7 +56,7 @@ export function MusicPlayer() {
 
 
   return (
-    <div className="fixed bottom-0 left-0 right-0 bg-gray-900 border-t border-pink px-4 py-3 z-50">
+    <div data-testid="player-bar" className="fixed bottom-0 left-0 right-0 bg-gray-900 border-t border-pink px-4 py-3 z-50">
       <div className="max-w-screen-2xl mx-auto flex items-center justify-between gap-4">
         {/* Song Info */}
         <div className="flex items-center gap-3 min-w-[200px] flex-1">
@@ -90,6 +90,7 @@ export function MusicPlayer() {
             <Button
               variant="ghost"
               size="sm"
+              data-testid="player-previous"
               onClick={playPrevious}
               disabled={!hasPrevious}
               className="text-pink/70 hover:text-pink disabled:text-gray-600 disabled:hover:text-gray-600 disabled:cursor-not-allowed cursor-pointer"
@@ -99,6 +100,8 @@ export function MusicPlayer() {
 
             {/* PLAY/PAUSE BUTONU - ARTIK GLOBAL ÇALIŞIYOR */}
             <Button
+              data-testid="player-toggle"
+              aria-label={isPlaying ? "Pause" : "Play"}
               onClick={togglePlay} // <-- Context'teki fonksiyonu çağırıyoruz
               size="sm"
               className="bg-pink text-black hover:bg-dark-pink rounded-full w-10 h-10 p-0 transition-transform hover:scale-105 cursor-pointer"
@@ -109,6 +112,7 @@ export function MusicPlayer() {
             <Button
               variant="ghost"
               size="sm"
+              data-testid="player-next"
               onClick={playNext}
               disabled={!hasNext}
               className="text-pink/70 hover:text-pink disabled:text-gray-600 disabled:hover:text-gray-600 disabled:cursor-not-allowed cursor-pointer"
@@ -123,6 +127,7 @@ export function MusicPlayer() {
               {formatTime(Math.floor(currentTime))}
             </span>
             <Slider
+              data-testid="player-seek"
               value={[progress]}
               onValueChange={handleSeek}
               max={100}
@@ -347,7 +347,7 @@ export function CreatePlaylistPage() {
           >
             <div className="flex items-center justify-between mb-4">
               <h2>Select Songs</h2>
-              <span className="text-gray-400 text-sm">
+              <span data-testid="selected-count" className="text-gray-400 text-sm">
                 {selectedSongs.length} selected
               </span>
             </div>
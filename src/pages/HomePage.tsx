@@ -677,8 +677,8 @@ export function HomePage() {
 
         {/* FEED SECTION - UPGRADED TO CAROUSEL (Swipe + Arrows) */}
         {filteredFeedPlaylists.length > 0 && (
-          <div className="mt-12 space-y-3">
-            <h1 className="mb-5 text-xl font-bold" style={{ WebkitTextStroke: '0.75px #d95a96' }}>Your Feed</h1>
+          <div data-testid="feed" className="mt-12 space-y-3">
+            <h1 data-testid="feed-heading" className="mb-5 text-xl font-bold" style={{ WebkitTextStroke: '0.75px #d95a96' }}>Your Feed</h1>
             
             <div className="relative w-full group">
                 <div className={`grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 2xl:grid-cols-5 gap-4 transform ${getAnimationClass(feedAnimState, feedDirection)}`}>
@@ -125,7 +125,7 @@ export function LibraryPage() {
       }}>
       <div className="max-w-7xl mx-auto">
         <div className="flex items-center justify-between mb-8">
-          <h1 className="text-white mb-4 text-4xl font-bold"
+          <h1 data-testid="library-heading" className="text-white mb-4 text-4xl font-bold"
               style={{ 
                 color: '#d95a96', 
                 WebkitTextStroke: '0.5px #5b0425'
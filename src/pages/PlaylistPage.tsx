@@ -244,15 +244,15 @@ export function PlaylistPage() {
               </div>
             </div>
           </div>
-          <div className="flex items-center gap-4 mt-6">
+          <div data-testid="playlist-actions" className="flex items-center gap-4 mt-6">
             <Button size="lg" className="bg-pink hover:bg-dark-pink text-black rounded-full w-14 h-14 p-0 shadow-lg shadow-pink/20 transition-transform hover:scale-105" onClick={() => playlist.songs.length > 0 && playSong(playlist.songs[0], { queue: playlist.songs, startIndex: 0 })}><Play className="w-6 h-6 fill-black ml-0.5" /></Button>
-            <Button variant="ghost" size="lg" onClick={handleLike} className="text-gray-400 hover:text-white"><Heart className={`w-8 h-8 ${isLiked ? 'fill-pink text-pink' : ''}`} /></Button>
-            <span className="text-gray-400">{playlist.likes_count || 0} likes</span>
+            <Button data-testid="playlist-like" variant="ghost" size="lg" onClick={handleLike} className="text-gray-400 hover:text-white"><Heart className={`w-8 h-8 ${isLiked ? 'fill-pink text-pink' : ''}`} /></Button>
+            <span data-testid="playlist-likes" className="text-gray-400">{playlist.likes_count || 0} likes</span>
             {isOwner && (
               <div className="flex items-center gap-2">
                 <Button variant="ghost" onClick={handleEditPlaylist} className="text-gray-400 hover:text-white"><Edit className="w-5 h-5 mr-2" />Edit</Button>
                 <Button variant="ghost" onClick={togglePrivacy} className="text-gray-400 hover:text-white">{playlist.privacy === "public" ? <Unlock className="w-5 h-5" /> : <Lock className="w-5 h-5" />}</Button>
-                <Button variant="ghost" onClick={handleDeletePlaylist} className="text-gray-400 hover:text-red-500"><Trash2 className="w-5 h-5 mr-2" />Delete</Button>
+                <Button data-testid="playlist-delete" variant="ghost" onClick={handleDeletePlaylist} className="text-gray-400 hover:text-red-500"><Trash2 className="w-5 h-5 mr-2" />Delete</Button>
               </div>
             )}
           </div>
@@ -266,11 +266,11 @@ export function PlaylistPage() {
             {playlist.songs.map((song, index) => {
               const isCurrentSong = currentSong?.id === song.id;
               return (
-                <div key={song.id} className="relative grid grid-cols-[auto_1fr_1fr_auto] gap-4 px-4 py-3 hover:bg-white/5 rounded transition-colors group cursor-pointer" onClick={() => playSong(song, { queue: playlist.songs, startIndex: index })}>
+                <div key={song.id} data-testid="song-row" className="relative grid grid-cols-[auto_1fr_1fr_auto] gap-4 px-4 py-3 hover:bg-white/5 rounded transition-colors group cursor-pointer" onClick={() => playSong(song, { queue: playlist.songs, startIndex: index })}>
                   <div className="w-8 text-gray-400 flex items-center justify-center">{isCurrentSong && isPlaying ? <Pause className="w-4 h-4 text-pink fill-pink" /> : isCurrentSong ? <Play className="w-4 h-4 text-pink fill-pink" /> : <><span className="group-hover:hidden">{index + 1}</span><Play className="w-4 h-4 hidden group-hover:block text-white fill-white" /></>}</div>
                   <div className="flex items-center gap-3 min-w-0"><img src={song.coverArt} alt={song.album} className="w-10 h-10 rounded object-cover" /><div className="min-w-0"><div className={`truncate ${isCurrentSong ? 'text-pink font-semibold' : 'text-white'}`}>{song.title}</div><div className="text-sm text-gray-400 truncate">{song.artist}</div></div></div>
                   <div className="flex items-center text-gray-400 truncate">{song.album}</div>
-                  <div className="flex items-center justify-end gap-3 text-gray-400 relative" onClick={(e) => e.stopPropagation()}><button onClick={(e) => { e.stopPropagation(); handleLikeSong(String(song.id)); }} className={`flex items-center transition-colors ${likedSongIds.has(String(song.id)) ? 'text-pink opacity-100' : 'text-gray-400 group-hover:text-pink opacity-0 group-hover:opacity-100'}`}><Heart className={`w-4 h-4 transition-colors ${likedSongIds.has(String(song.id)) ? 'fill-pink text-pink' : ''} ${blinkingSongId === String(song.id) ? 'heart-blink' : ''}`} /></button><span className="mr-2">{song.url && song.url !== "no" ? "0:30" : "--:--"}</span><div className="relative"><button onClick={(e) => { e.stopPropagation(); setOpenSongMenuId(prev => (prev === song.id ? null : song.id)); }} className="p-1 hover:text-white"><MoreHorizontal className="w-5 h-5" /></button></div></div>
+                  <div className="flex items-center justify-end gap-3 text-gray-400 relative" onClick={(e) => e.stopPropagation()}><button onClick={(e) => { e.stopPropagation(); handleLikeSong(String(song.id)); }} className={`flex items-center transition-colors ${likedSongIds.has(String(song.id)) ? 'text-pink opacity-100' : 'text-gray-400 group-hover:text-pink opacity-0 group-hover:opacity-100'}`}><Heart className={`w-4 h-4 transition-colors ${likedSongIds.has(String(song.id)) ? 'fill-pink text-pink' : ''} ${blinkingSongId === String(song.id) ? 'heart-blink' : ''}`} /></button><span className="mr-2">{song.url && song.url !== "no" ? "0:30" : "--:--"}</span><div className="relative"><button onClick={(e) => { e.stopPropagation(); setOpenSongMenuId(prev => (prev === song.id ? null : song.id)); }} aria-label="Open song menu" className="p-1 hover:text-white"><MoreHorizontal className="w-5 h-5" /></button></div></div>
                   {openSongMenuId === song.id && (<div className="absolute right-0 top-7 w-48 bg-gray-800 rounded-md shadow-lg z-[9999] overflow-hidden" onClick={(e) => e.stopPropagation()}>{isOwner && (<button onClick={async (e) => { e.stopPropagation(); try { await playlistService.removeSongFromPlaylist(Number(playlistId), Number(song.id)); setPlaylist(prev => prev ? { ...prev, songs: prev.songs.filter(s => s.id !== song.id) } : prev); } catch (err) { console.error(err); } finally { setOpenSongMenuId(null); } }} className="w-full px-3 py-2 text-left text-sm text-red-400 hover:bg-gray-700">Remove from playlist</button>)}<button onClick={(e) => { e.stopPropagation(); setOpenSongMenuId(null); setShowAddToPlaylistForSong(Number(song.id)); }} className="w-full px-3 py-2 text-left text-sm text-gray-200 hover:bg-gray-700">Add to another playlist</button></div>)}
                 </div>
               );
@@ -290,13 +290,13 @@ export function PlaylistPage() {
                 comments.forEach(c => { if (c.parentCommentId) { if (!repliesMap[c.parentCommentId]) repliesMap[c.parentCommentId] = []; repliesMap[c.parentCommentId].push(c); } });
                 const flattenReplies = (id: number): Comment[] => { const result: Comment[] = []; const queue = repliesMap[id] ? [...repliesMap[id]] : []; while (queue.length) { const r = queue.shift()!; result.push(r); if (repliesMap[r.id]) queue.unshift(...repliesMap[r.id]); } return result; };
                 const renderComment = (c: Comment) => (
-                  <div key={c.id} className="flex gap-3">
+                  <div key={c.id} data-testid="comment" className="flex gap-3">
                     <img src={c.avatar} alt={c.username} className="w-10 h-10 rounded-full object-cover" />
                     <div className="flex-1">
                       <div className="bg-gray-900 rounded-lg p-4 relative border border-gray-700">
                         {c.userId === currentUser.id && (
                           <div className="absolute top-2 right-2">
-                            <button onClick={() => toggleMenu(c.id)} className="w-5 h-5 text-gray-400 hover:text-white transition-colors"><MoreHorizontal className="w-5 h-5" /></button>
+                            <button onClick={() => toggleMenu(c.id)} aria-label="Open comment menu" className="w-5 h-5 text-gray-400 hover:text-white transition-colors"><MoreHorizontal className="w-5 h-5" /></button>
                             {openMenuId === c.id && (
                               <div className="absolute right-0 mt-2 w-40 bg-gray-800 rounded-md shadow-lg z-30 overflow-hidden">
                                 <button onClick={() => startEditComment(c)} className="w-full flex items-center gap-2 px-3 py-2 text-sm text-gray-200 hover:bg-gray-700 transition-colors"><Edit className="w-4 h-4" /> Edit</button>
@@ -307,7 +307,7 @@ export function PlaylistPage() {
                         )}
                         <div className="flex items-center gap-2 mb-2 pr-12"><span className="text-white font-semibold">{c.username}</span>{c.parentCommentId && (<span className="text-gray-400 text-sm">• replying to @{comments.find(cc => cc.id === c.parentCommentId)?.username}</span>)}<span className="text-gray-500 text-sm">{new Date(c.createdAt).toLocaleDateString()}</span></div>
                         {editingCommentId === c.id ? (<div><textarea value={editingText} onChange={(e) => setEditingText(e.target.value)} className="w-full bg-gray-800 text-white p-2 rounded border border-gray-700" rows={3} /><div className="mt-2 flex gap-2"><button onClick={() => saveEditedComment(c.id)} className="bg-pink text-black px-3 py-1 rounded">Save</button><button onClick={cancelEdit} className="px-3 py-1 rounded border border-gray-700 text-gray-300">Cancel</button></div></div>) : (<p className="text-gray-300">{c.text}</p>)}
-                        <div className="flex items-center gap-4 mt-3"><div className="flex items-center gap-2"><button onClick={() => handleLikeComment(c.id)} className="hover:text-pink text-gray-400"><Heart className={`w-6 h-6 ${c.is_liked ? 'fill-pink text-pink' : ''}`} /></button><span className="text-gray-400 text-sm">{c.likes_count || 0}</span></div><button onClick={() => handleReplyClick(c.id)} className={`text-sm px-2 py-1 rounded ${replyingToId === c.id ? 'text-pink' : 'text-gray-400 hover:text-pink'}`}>Reply</button></div>
+                        <div className="flex items-center gap-4 mt-3"><div className="flex items-center gap-2"><button onClick={() => handleLikeComment(c.id)} aria-label="Like comment" className="hover:text-pink text-gray-400"><Heart className={`w-6 h-6 ${c.is_liked ? 'fill-pink text-pink' : ''}`} /></button><span className="text-gray-400 text-sm">{c.likes_count || 0}</span></div><button onClick={() => handleReplyClick(c.id)} className={`text-sm px-2 py-1 rounded ${replyingToId === c.id ? 'text-pink' : 'text-gray-400 hover:text-pink'}`}>Reply</button></div>
                       </div>
                       {flattenReplies(c.id).map(reply => (
                         <React.Fragment key={reply.id}>
@@ -315,10 +315,10 @@ export function PlaylistPage() {
                             <img src={reply.avatar} alt={reply.username} className="w-10 h-10 rounded-full object-cover" />
                             <div className="flex-1">
                               <div className="bg-gray-900 rounded-lg p-4 border border-gray-700 relative">
-                                {reply.userId === currentUser.id && (<div className="absolute top-2 right-2"><button onClick={() => toggleMenu(reply.id)} className="w-5 h-5 text-gray-400 hover:text-white transition-colors"><MoreHorizontal className="w-5 h-5" /></button>{openMenuId === reply.id && (<div className="absolute right-0 mt-2 w-40 bg-gray-800 rounded-md shadow-lg z-30 overflow-hidden"><button onClick={() => startEditComment(reply)} className="w-full flex items-center gap-2 px-3 py-2 text-sm text-gray-200 hover:bg-gray-700 transition-colors"><Edit className="w-4 h-4" /> Edit</button><button onClick={() => handleDeleteComment(reply.id)} className="w-full flex items-center gap-2 px-3 py-2 text-sm text-red-400 hover:bg-gray-700 transition-colors"><Trash2 className="w-4 h-4" /> Delete</button></div>)}</div>)}
+                                {reply.userId === currentUser.id && (<div className="absolute top-2 right-2"><button onClick={() => toggleMenu(reply.id)} aria-label="Open comment menu" className="w-5 h-5 text-gray-400 hover:text-white transition-colors"><MoreHorizontal className="w-5 h-5" /></button>{openMenuId === reply.id && (<div className="absolute right-0 mt-2 w-40 bg-gray-800 rounded-md shadow-lg z-30 overflow-hidden"><button onClick={() => startEditComment(reply)} className="w-full flex items-center gap-2 px-3 py-2 text-sm text-gray-200 hover:bg-gray-700 transition-colors"><Edit className="w-4 h-4" /> Edit</button><button onClick={() => handleDeleteComment(reply.id)} className="w-full flex items-center gap-2 px-3 py-2 text-sm text-red-400 hover:bg-gray-700 transition-colors"><Trash2 className="w-4 h-4" /> Delete</button></div>)}</div>)}
                                 <div className="flex items-center gap-2 mb-2 pr-12"><span className="text-white font-semibold">{reply.username}</span>{reply.parentCommentId && (<span className="text-gray-400 text-sm">• replying to @{comments.find(cc => cc.id === reply.parentCommentId)?.username}</span>)}<span className="text-gray-500 text-sm">{new Date(reply.createdAt).toLocaleDateString()}</span></div>
                                 {editingCommentId === reply.id ? (<div><textarea value={editingText} onChange={(e) => setEditingText(e.target.value)} className="w-full bg-gray-800 text-white p-2 rounded border border-gray-700" rows={3} /><div className="mt-2 flex gap-2"><button onClick={() => saveEditedComment(reply.id)} className="bg-pink text-black px-3 py-1 rounded">Save</button><button onClick={cancelEdit} className="px-3 py-1 rounded border border-gray-700 text-gray-300">Cancel</button></div></div>) : (<p className="text-gray-300">{reply.text}</p>)}
-                                <div className="flex items-center gap-4 mt-3"><div className="flex items-center gap-2"><button onClick={() => handleLikeComment(reply.id)} className="hover:text-pink text-gray-400"><Heart className={`w-6 h-6 ${reply.is_liked ? 'fill-pink text-pink' : ''}`} /></button><span className="text-gray-400 text-sm">{reply.likes_count || 0}</span></div><button onClick={() => handleReplyClick(reply.id)} className={`text-sm px-2 py-1 rounded ${replyingToId === reply.id ? 'text-pink' : 'text-gray-400 hover:text-pink'}`}>Reply</button></div>
+                                <div className="flex items-center gap-4 mt-3"><div className="flex items-center gap-2"><button onClick={() => handleLikeComment(reply.id)} aria-label="Like comment" className="hover:text-pink text-gray-400"><Heart className={`w-6 h-6 ${reply.is_liked ? 'fill-pink text-pink' : ''}`} /></button><span className="text-gray-400 text-sm">{reply.likes_count || 0}</span></div><button onClick={() => handleReplyClick(reply.id)} className={`text-sm px-2 py-1 rounded ${replyingToId === reply.id ? 'text-pink' : 'text-gray-400 hover:text-pink'}`}>Reply</button></div>
                               </div>
                             </div>
                           </div>
@@ -536,6 +536,7 @@ export function ProfilePage() {
                 </>
               ) : (
                 <Button
+                  data-testid="edit-profile"
                   onClick={() => setIsEditing(true)}
                   className="bg-pink hover:bg-dark-pink text-black"
                 >
@@ -545,6 +546,7 @@ export function ProfilePage() {
               )
             ) : isFollowing ? (
               <Button
+                data-testid="follow-button"
                 onClick={() =>
                   handleFollow(profileUser.id, profileUser.username)
                 }
@@ -563,6 +565,7 @@ export function ProfilePage() {
               </Button>
             ) : (
               <Button
+                data-testid="follow-button"
                 onClick={() =>
                   handleFollow(profileUser.id, profileUser.username)
                 }
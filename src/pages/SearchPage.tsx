@@ -450,7 +450,7 @@ export function SearchPage() {
     const isCurrentUser = searchUser.id === user?.id;
 
     return (
-      <div key={searchUser.id} className="bg-gray-900 rounded-lg p-4 hover:bg-gray-800 transition-colors">
+      <div key={searchUser.id} data-testid="user-card" className="bg-gray-900 rounded-lg p-4 hover:bg-gray-800 transition-colors">
         <div className="flex items-center gap-4">
           <img
             src={searchUser.avatar}
@@ -58,7 +58,7 @@
       open: true,
       proxy: {
         '/api': {
-          target: 'https://soundpuff-api.ozten.app', // Hedef Backend Adresi
+          target: process.env.API_PROXY_TARGET || 'https://soundpuff-api.ozten.app', // Hedef Backend Adresi
           changeOrigin: true, // Backend'i kandırmak için gerekli
           secure: false,      // SSL hatası almamak için
         },